@@ -0,0 +1,246 @@
+"""
+Benchmark de rendimiento del analizador léxico.
+
+Genera programas sintéticos de distintos tamaños con GeneradorCorpus y mide
+para cada uno los tokens por segundo, los MB por segundo y la memoria pico
+de AnalizadorLexico.analizar(). Los resultados pueden guardarse como línea
+base en JSON y compararse con una línea base anterior: el programa termina
+con error si el rendimiento baja más que el umbral indicado.
+
+Uso:
+    python benchmarks/benchmark_lexico.py [--tamanos 1K,100K,10M] [--guardar base.json]
+    python benchmarks/benchmark_lexico.py --comparar base.json [--umbral 0.1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analizador_lexico import AnalizadorLexico  # noqa: E402
+from generador_corpus import GeneradorCorpus  # noqa: E402
+
+TAMANOS_POR_DEFECTO = "1K,10K,100K,1M,10M,100M"
+
+UNIDADES = {"K": 1024, "M": 1024 * 1024}
+
+# Duración mínima de cada medición: los códigos pequeños se analizan varias
+# veces seguidas para que el resultado no dependa de la resolución del reloj
+DURACION_MINIMA = 0.05
+
+
+def leer_tamano(texto):
+    """
+    Convierte un tamaño como '100K' o '10M' a bytes.
+
+    Args:
+        texto (str): Tamaño con sufijo opcional K o M
+
+    Returns:
+        int: Tamaño en bytes
+    """
+    texto = texto.strip().upper()
+    if texto and texto[-1] in UNIDADES:
+        return int(float(texto[:-1]) * UNIDADES[texto[-1]])
+    return int(texto)
+
+
+def formatear_tamano(tamano):
+    """
+    Formatea un tamaño en bytes con la unidad más adecuada.
+
+    Args:
+        tamano (int): Tamaño en bytes
+
+    Returns:
+        str: Tamaño formateado (ej: '10M')
+    """
+    for sufijo in ("M", "K"):
+        if tamano >= UNIDADES[sufijo] and tamano % UNIDADES[sufijo] == 0:
+            return f"{tamano // UNIDADES[sufijo]}{sufijo}"
+    return str(tamano)
+
+
+def medir(analizador, codigo, repeticiones, compacto, con_memoria):
+    """
+    Mide el análisis léxico de un código.
+
+    El tiempo es el mejor de varias mediciones (cada una analiza el código
+    las veces necesarias para durar al menos DURACION_MINIMA); la memoria
+    pico se mide en una ejecución aparte con tracemalloc, que hace más lento
+    el análisis.
+
+    Args:
+        analizador (AnalizadorLexico): Analizador a medir
+        codigo (str): Código a analizar
+        repeticiones (int): Cantidad de ejecuciones cronometradas
+        compacto (bool): Si es True se analiza en modo compacto
+        con_memoria (bool): Si es True se mide la memoria pico
+
+    Returns:
+        dict: Resultado de la medición
+    """
+    inicio = time.perf_counter()
+    cantidad_tokens = len(analizador.analizar(codigo, compacto=compacto))
+    primera = time.perf_counter() - inicio
+    veces = max(1, int(DURACION_MINIMA / primera) if primera else 1)
+
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(veces):
+            analizador.analizar(codigo, compacto=compacto)
+        transcurrido = (time.perf_counter() - inicio) / veces
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+
+    memoria_pico = None
+    if con_memoria:
+        tracemalloc.start()
+        tokens = analizador.analizar(codigo, compacto=compacto)
+        memoria_pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del tokens
+
+    megabytes = len(codigo.encode("utf-8")) / (1024 * 1024)
+    return {
+        "caracteres": len(codigo),
+        "tokens": cantidad_tokens,
+        "segundos": mejor,
+        "tokens_por_segundo": cantidad_tokens / mejor if mejor else 0.0,
+        "mb_por_segundo": megabytes / mejor if mejor else 0.0,
+        "memoria_pico": memoria_pico,
+    }
+
+
+def comparar(resultados, linea_base, umbral):
+    """
+    Compara los resultados con una línea base.
+
+    Args:
+        resultados (dict): Resultados actuales
+        linea_base (dict): Resultados de la línea base
+        umbral (float): Caída relativa de tokens/s tolerada (ej: 0.1 = 10%)
+
+    Returns:
+        list: Mensajes de las regresiones encontradas
+    """
+    regresiones = []
+    if linea_base.get("configuracion") != resultados["configuracion"]:
+        print(
+            "Aviso: la línea base se generó con otra configuración; "
+            "solo se comparan los tamaños comunes"
+        )
+
+    anteriores = {r["tamano"]: r for r in linea_base.get("resultados", [])}
+    for resultado in resultados["resultados"]:
+        anterior = anteriores.get(resultado["tamano"])
+        if anterior is None or not anterior["tokens_por_segundo"]:
+            continue
+        relacion = resultado["tokens_por_segundo"] / anterior["tokens_por_segundo"]
+        if relacion < 1 - umbral:
+            regresiones.append(
+                f"{formatear_tamano(resultado['tamano'])}: "
+                f"{resultado['tokens_por_segundo']:.0f} tokens/s frente a "
+                f"{anterior['tokens_por_segundo']:.0f} de la línea base "
+                f"({(1 - relacion) * 100:.1f}% más lento)"
+            )
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", default=TAMANOS_POR_DEFECTO)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--automata", action="store_true", help="usar el motor AFD")
+    parser.add_argument("--compacto", action="store_true", help="analizar en modo compacto")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir la memoria pico")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--densidad-comentarios", type=float, default=0.1)
+    parser.add_argument("--densidad-cadenas", type=float, default=0.1)
+    parser.add_argument("--longitud-identificadores", type=int, default=8)
+    parser.add_argument("--tasa-errores", type=float, default=0.0)
+    parser.add_argument("--guardar", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="línea base JSON con la que comparar")
+    parser.add_argument(
+        "--umbral",
+        type=float,
+        default=0.1,
+        help="caída de tokens/s tolerada respecto de la línea base (0.1 = 10%%)",
+    )
+    argumentos = parser.parse_args()
+
+    generador = GeneradorCorpus(
+        semilla=argumentos.semilla,
+        densidad_comentarios=argumentos.densidad_comentarios,
+        densidad_cadenas=argumentos.densidad_cadenas,
+        longitud_identificadores=argumentos.longitud_identificadores,
+        tasa_errores=argumentos.tasa_errores,
+    )
+    analizador = AnalizadorLexico(usar_automata=argumentos.automata)
+    tamanos = [leer_tamano(t) for t in argumentos.tamanos.split(",")]
+
+    resultados = {
+        "configuracion": {
+            "motor": "automata" if argumentos.automata else "regex",
+            "compacto": argumentos.compacto,
+            "corpus": generador.parametros(),
+        },
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+        },
+        "resultados": [],
+    }
+
+    print(
+        f"{'tamaño':>8}  {'tokens':>10}  {'tiempo (s)':>10}  "
+        f"{'tokens/s':>12}  {'MB/s':>8}  {'memoria pico':>12}"
+    )
+    for tamano in tamanos:
+        codigo = generador.generar(tamano)
+        resultado = medir(
+            analizador,
+            codigo,
+            argumentos.repeticiones,
+            argumentos.compacto,
+            not argumentos.sin_memoria,
+        )
+        resultado["tamano"] = tamano
+        resultados["resultados"].append(resultado)
+
+        memoria = "-"
+        if resultado["memoria_pico"] is not None:
+            memoria = f"{resultado['memoria_pico'] / (1024 * 1024):.1f} MB"
+        print(
+            f"{formatear_tamano(tamano):>8}  {resultado['tokens']:>10}  "
+            f"{resultado['segundos']:>10.4f}  {resultado['tokens_por_segundo']:>12.0f}  "
+            f"{resultado['mb_por_segundo']:>8.2f}  {memoria:>12}"
+        )
+
+    if argumentos.guardar:
+        with open(argumentos.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {argumentos.guardar}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, "r", encoding="utf-8") as archivo:
+            linea_base = json.load(archivo)
+        regresiones = comparar(resultados, linea_base, argumentos.umbral)
+        if regresiones:
+            print("Regresiones de rendimiento:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            raise SystemExit(1)
+        print(f"Sin regresiones respecto de {argumentos.comparar}")
+
+
+if __name__ == "__main__":
+    main()
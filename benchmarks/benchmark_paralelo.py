@@ -0,0 +1,148 @@
+"""
+Benchmark del análisis léxico (o sintáctico) paralelo.
+
+Genera un código grande repitiendo tests/programa_correcto.txt y compara el
+tiempo de analizar() con el de analizar_paralelo() para distintas cantidades
+de procesos, mostrando la aceleración respecto del análisis secuencial. Con
+--sintactico se mide AnalizadorSintactico sobre los tokens del código.
+
+Uso:
+    python benchmarks/benchmark_paralelo.py [--megabytes 50] [--repeticiones 3]
+    python benchmarks/benchmark_paralelo.py --sintactico [--megabytes 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analizador_lexico import AnalizadorLexico  # noqa: E402
+from analizador_sintactico import AnalizadorSintactico  # noqa: E402
+
+
+def generar_codigo(megabytes):
+    """
+    Genera un código de prueba del tamaño indicado.
+
+    Args:
+        megabytes (float): Tamaño aproximado del código en megabytes
+
+    Returns:
+        str: Código fuente generado
+    """
+    ruta = os.path.join(RAIZ, "tests", "programa_correcto.txt")
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        base = archivo.read()
+    repeticiones = max(1, int(megabytes * 1024 * 1024 / len(base)))
+    return (base + "\n") * repeticiones
+
+
+def medir(funcion, repeticiones):
+    """
+    Mide el mejor tiempo de varias ejecuciones.
+
+    Args:
+        funcion: Función sin argumentos a medir
+        repeticiones (int): Cantidad de ejecuciones
+
+    Returns:
+        tuple: (mejor_tiempo, resultado de la última ejecución)
+    """
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor, resultado
+
+
+def recorrido(ast, errores):
+    """
+    Resume el resultado de un análisis sintáctico para compararlo: los
+    nodos del AST en preorden (sin recursión) y los errores.
+
+    Args:
+        ast (NodoAST): Raíz del AST
+        errores (list): Errores sintácticos
+
+    Returns:
+        tuple: (nodos, errores)
+    """
+    nodos = []
+    pendientes = [ast] if ast is not None else []
+    while pendientes:
+        nodo = pendientes.pop()
+        nodos.append((nodo.tipo, nodo.valor, nodo.linea, len(nodo.hijos)))
+        pendientes.extend(reversed(nodo.hijos))
+    return nodos, errores
+
+
+def cantidades_procesos():
+    """
+    Cantidades de procesos a medir: potencias de dos hasta la cantidad de
+    núcleos, más la cantidad de núcleos.
+    """
+    nucleos = os.cpu_count() or 1
+    cantidades = []
+    cantidad = 1
+    while cantidad < nucleos:
+        cantidades.append(cantidad)
+        cantidad *= 2
+    cantidades.append(nucleos)
+    return cantidades
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=50)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--automata", action="store_true", help="usar el motor AFD")
+    parser.add_argument(
+        "--sintactico", action="store_true", help="medir el análisis sintáctico paralelo"
+    )
+    argumentos = parser.parse_args()
+
+    codigo = generar_codigo(argumentos.megabytes)
+    analizador = AnalizadorLexico(usar_automata=argumentos.automata)
+    print(
+        f"Código: {len(codigo) / (1024 * 1024):.1f} MB, "
+        f"núcleos disponibles: {os.cpu_count()}"
+    )
+
+    if argumentos.sintactico:
+        tokens = analizador.analizar(codigo)
+        print(f"Tokens: {len(tokens)}")
+
+        def secuencial_fn():
+            return recorrido(*AnalizadorSintactico(tokens).analizar())
+
+        def paralelo_fn(procesos):
+            return recorrido(*AnalizadorSintactico(tokens).analizar_paralelo(procesos))
+
+    else:
+
+        def secuencial_fn():
+            return analizador.analizar(codigo)
+
+        def paralelo_fn(procesos):
+            return analizador.analizar_paralelo(codigo, procesos)
+
+    secuencial, esperado = medir(secuencial_fn, argumentos.repeticiones)
+    print(f"{'procesos':>8}  {'tiempo (s)':>10}  {'aceleración':>11}")
+    print(f"{'secuencial':>8}  {secuencial:>10.3f}  {1:>10.2f}x")
+
+    for procesos in cantidades_procesos():
+        tiempo, resultado = medir(lambda: paralelo_fn(procesos), argumentos.repeticiones)
+        if resultado != esperado:
+            raise SystemExit(f"El resultado con {procesos} procesos no coincide")
+        print(f"{procesos:>8}  {tiempo:>10.3f}  {secuencial / tiempo:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
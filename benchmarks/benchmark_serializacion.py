@@ -0,0 +1,155 @@
+"""
+Verificación y benchmark de la serialización binaria del AST.
+
+Primero codifica y decodifica el AST de cada archivo de tests/*.txt (con
+recuperación de errores, para obtener también los árboles parciales de los
+casos inválidos), en un solo bloque y por bloques pequeños a través de un
+archivo, y comprueba que el árbol reconstruido sea idéntico al original; si
+alguno difiere, el programa termina con error. Después genera un código
+grande repitiendo tests/programa_correcto.txt y compara el tiempo de
+decodificar su AST con el de volver a analizarlo, junto con el tamaño de la
+codificación frente a pickle.
+
+Uso:
+    python benchmarks/benchmark_serializacion.py [--megabytes 4] [--repeticiones 3]
+"""
+
+import argparse
+import glob
+import io
+import os
+import pickle
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analizador_lexico import AnalizadorLexico  # noqa: E402
+from analizador_sintactico import AnalizadorSintactico  # noqa: E402
+from serializacion_ast import (  # noqa: E402
+    codificar_ast,
+    decodificar_ast,
+    escribir_ast,
+    leer_ast,
+)
+
+
+def recorrido(ast):
+    """
+    Lista los nodos del AST en preorden (sin recursión) con todos sus campos.
+
+    Args:
+        ast (NodoAST): Raíz del AST
+
+    Returns:
+        list: Tuplas (tipo, valor, linea, id_nombre, cantidad de hijos)
+    """
+    nodos = []
+    pendientes = [ast]
+    while pendientes:
+        nodo = pendientes.pop()
+        nodos.append((nodo.tipo, nodo.valor, nodo.linea, nodo.id_nombre, len(nodo.hijos)))
+        pendientes.extend(reversed(nodo.hijos))
+    return nodos
+
+
+def ida_y_vuelta(ast):
+    """
+    Codifica y decodifica un AST de las dos formas disponibles.
+
+    Args:
+        ast (NodoAST): Raíz del AST
+
+    Returns:
+        list: Árboles reconstruidos (desde bytes y desde un archivo)
+    """
+    archivo = io.BytesIO()
+    escribir_ast(ast, archivo, tamano_bloque=16)
+    archivo.seek(0)
+    return [decodificar_ast(codificar_ast(ast)), leer_ast(archivo, tamano_bloque=7)]
+
+
+def verificar_casos():
+    """
+    Verifica la ida y vuelta de los AST de tests/*.txt.
+
+    Returns:
+        int: Cantidad de árboles que no coinciden
+    """
+    analizador = AnalizadorLexico()
+    fallos = 0
+    for ruta in sorted(glob.glob(os.path.join(RAIZ, "tests", "*.txt"))):
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            tokens = analizador.analizar(archivo.read())
+        ast, errores = AnalizadorSintactico(tokens, recuperar_errores=True).analizar()
+        esperado = recorrido(ast)
+        coinciden = all(recorrido(copia) == esperado for copia in ida_y_vuelta(ast))
+        fallos += not coinciden
+        print(
+            f"{os.path.basename(ruta):<24} {len(esperado):>6} nodos "
+            f"{len(errores):>4} errores  {'ok' if coinciden else 'DIFIERE'}"
+        )
+    return fallos
+
+
+def medir(funcion, repeticiones):
+    """
+    Mide el mejor tiempo de varias ejecuciones.
+
+    Args:
+        funcion: Función sin argumentos a medir
+        repeticiones (int): Cantidad de ejecuciones
+
+    Returns:
+        tuple: (mejor_tiempo, resultado de la última ejecución)
+    """
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=4)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    argumentos = parser.parse_args()
+
+    if verificar_casos():
+        raise SystemExit("La serialización no reconstruye algún AST")
+
+    ruta = os.path.join(RAIZ, "tests", "programa_correcto.txt")
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        base = archivo.read()
+    codigo = (base + "\n") * max(1, int(argumentos.megabytes * 1024 * 1024 / len(base)))
+    tokens = AnalizadorLexico().analizar(codigo)
+    ast, _ = AnalizadorSintactico(tokens).analizar()
+
+    analisis, _ = medir(lambda: AnalizadorSintactico(tokens).analizar(), argumentos.repeticiones)
+    codificacion, datos = medir(lambda: codificar_ast(ast), argumentos.repeticiones)
+    decodificacion, copia = medir(lambda: decodificar_ast(datos), argumentos.repeticiones)
+    if recorrido(copia) != recorrido(ast):
+        raise SystemExit("La serialización no reconstruye el AST grande")
+    tamano_pickle = len(pickle.dumps(ast, pickle.HIGHEST_PROTOCOL))
+
+    print(
+        f"\nCódigo: {len(codigo) / (1024 * 1024):.1f} MB, tokens: {len(tokens)}, "
+        f"nodos: {len(recorrido(ast))}"
+    )
+    print(f"Codificado: {len(datos) / (1024 * 1024):.2f} MB "
+          f"(pickle: {tamano_pickle / (1024 * 1024):.2f} MB)")
+    print(f"{'operación':<16} {'tiempo (s)':>10}")
+    print(f"{'análisis':<16} {analisis:>10.3f}")
+    print(f"{'codificación':<16} {codificacion:>10.3f}")
+    print(f"{'decodificación':<16} {decodificacion:>10.3f}  "
+          f"({analisis / decodificacion:.2f}x más rápido que analizar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Pruebas de estrés del analizador léxico con entradas adversarias.
+
+Para cada entrada (largas secuencias de barras invertidas, miles de '/*' sin
+cerrar, comillas alternadas, ...) mide el tiempo de analizar() con cada motor
+y con y sin recuperación de errores, duplicando el tamaño varias veces. El
+crecimiento debe ser lineal: si el exponente estimado del tiempo respecto del
+tamaño supera el máximo indicado, el programa termina con error.
+
+Uso:
+    python benchmarks/estres_lexico.py [--tamano-base 65536] [--duplicaciones 4]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analizador_lexico import AnalizadorLexico  # noqa: E402
+
+
+def repetir(patron, tamano, prefijo="", sufijo=""):
+    """
+    Repite un patrón hasta alcanzar aproximadamente el tamaño indicado.
+
+    Args:
+        patron (str): Texto a repetir
+        tamano (int): Tamaño aproximado del resultado
+        prefijo (str): Texto inicial
+        sufijo (str): Texto final
+
+    Returns:
+        str: Entrada generada
+    """
+    return prefijo + patron * max(1, tamano // len(patron)) + sufijo
+
+
+# Entradas adversarias: nombre -> función que genera una entrada del tamaño dado
+ENTRADAS = {
+    "barras en cadena sin cerrar": lambda n: repetir("\\", n, prefijo='"'),
+    "barras en cadena cerrada": lambda n: repetir("\\\\", n, prefijo='"', sufijo='"'),
+    "comillas escapadas sin cerrar": lambda n: repetir('\\"', n, prefijo='"'),
+    "comillas alternadas": lambda n: repetir("'\"", n),
+    "aperturas de comentario": lambda n: repetir("/*", n),
+    "aperturas de comentario por línea": lambda n: repetir("/* x\n", n),
+    "cierres de comentario": lambda n: repetir("*/", n),
+    "comentario largo sin cerrar": lambda n: repetir("a", n, prefijo="/*"),
+    "comentario de asteriscos": lambda n: repetir("*", n, prefijo="/*", sufijo="/"),
+    "cadenas sin cerrar por línea": lambda n: repetir('x = "abc\n', n),
+    "números incompletos": lambda n: repetir("1.", n),
+    "caracteres inválidos": lambda n: repetir("@", n),
+    "identificador largo": lambda n: repetir("a", n),
+}
+
+
+def medir(analizador, codigo, repeticiones):
+    """
+    Mide el mejor tiempo de analizar() sobre un código.
+
+    Args:
+        analizador (AnalizadorLexico): Analizador a medir
+        codigo (str): Código a analizar
+        repeticiones (int): Cantidad de ejecuciones
+
+    Returns:
+        float: Mejor tiempo en segundos
+    """
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        analizador.analizar(codigo)
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor
+
+
+def exponente(tamanos, tiempos):
+    """
+    Estima el exponente k de tiempo ~ tamano^k por mínimos cuadrados sobre
+    los logaritmos (k = 1 para un crecimiento lineal, k = 2 cuadrático).
+
+    Args:
+        tamanos (list): Tamaños medidos
+        tiempos (list): Tiempo de cada tamaño
+
+    Returns:
+        float: Exponente estimado
+    """
+    xs = [math.log(t) for t in tamanos]
+    ys = [math.log(max(t, 1e-9)) for t in tiempos]
+    media_x = sum(xs) / len(xs)
+    media_y = sum(ys) / len(ys)
+    numerador = sum((x - media_x) * (y - media_y) for x, y in zip(xs, ys))
+    denominador = sum((x - media_x) ** 2 for x in xs)
+    return numerador / denominador
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamano-base", type=int, default=65536)
+    parser.add_argument("--duplicaciones", type=int, default=4)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument(
+        "--exponente-maximo",
+        type=float,
+        default=1.3,
+        help="exponente de crecimiento tolerado (1 = lineal)",
+    )
+    argumentos = parser.parse_args()
+
+    tamanos = [argumentos.tamano_base * 2 ** i for i in range(argumentos.duplicaciones + 1)]
+    configuraciones = [
+        ("regex", AnalizadorLexico()),
+        ("regex+recuperación", AnalizadorLexico(recuperar_errores=True)),
+        ("afd", AnalizadorLexico(usar_automata=True)),
+        ("afd+recuperación", AnalizadorLexico(usar_automata=True, recuperar_errores=True)),
+    ]
+
+    print(f"Tamaños: {tamanos[0]} a {tamanos[-1]} caracteres")
+    print(f"{'entrada':<36}  {'motor':<20}  {'mayor (s)':>9}  {'exponente':>9}")
+    fallos = []
+    for nombre, generar in ENTRADAS.items():
+        codigos = [generar(tamano) for tamano in tamanos]
+        longitudes = [len(codigo) for codigo in codigos]
+        for motor, analizador in configuraciones:
+            tiempos = [medir(analizador, codigo, argumentos.repeticiones) for codigo in codigos]
+            k = exponente(longitudes, tiempos)
+            marca = ""
+            if k > argumentos.exponente_maximo:
+                marca = "  <-- no lineal"
+                fallos.append(f"{nombre} ({motor}): exponente {k:.2f}")
+            print(f"{nombre:<36}  {motor:<20}  {tiempos[-1]:>9.4f}  {k:>9.2f}{marca}")
+
+    if fallos:
+        print("Entradas con crecimiento no lineal:")
+        for fallo in fallos:
+            print(f"  {fallo}")
+        raise SystemExit(1)
+    print("Todas las entradas crecen de forma lineal")
+
+
+if __name__ == "__main__":
+    main()
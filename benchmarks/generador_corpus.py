@@ -0,0 +1,272 @@
+"""
+Generador de programas sintéticos del lenguaje para benchmarks.
+
+Genera código con una semilla fija (el mismo resultado en cada ejecución)
+y con parámetros para ajustar la densidad de comentarios y cadenas, la
+longitud de los identificadores y la proporción de errores léxicos.
+
+Uso:
+    python benchmarks/generador_corpus.py salida.txt [--kilobytes 1024] [--semilla 1]
+"""
+
+import argparse
+import random
+
+TIPOS = ("entero", "decimal", "booleano", "cadena")
+OPERADORES = ("+", "-", "*", "/", "%")
+COMPARADORES = ("==", "!=", "<=", ">=", "<", ">")
+RESERVADAS = frozenset(
+    TIPOS + ("si", "sino", "mientras", "hacer", "verdadero", "falso")
+)
+
+# Caracteres que el analizador léxico no reconoce
+CARACTERES_ERROR = ("@", "#", "$", "^", "ñ", "¿")
+
+PALABRAS_COMENTARIO = (
+    "calcula",
+    "el",
+    "valor",
+    "de",
+    "la",
+    "suma",
+    "total",
+    "para",
+    "cada",
+    "elemento",
+    "revisar",
+    "caso",
+)
+
+
+class GeneradorCorpus:
+    """
+    Genera programas sintéticos a partir de una semilla.
+
+    Los programas combinan declaraciones, asignaciones, estructuras de
+    control y funciones. Las cadenas y los comentarios se cierran siempre,
+    de modo que los errores generados no detienen el análisis léxico.
+    """
+
+    def __init__(
+        self,
+        semilla=1,
+        densidad_comentarios=0.1,
+        densidad_cadenas=0.1,
+        longitud_identificadores=8,
+        tasa_errores=0.0,
+        cantidad_identificadores=500,
+    ):
+        """
+        Inicializa el generador.
+
+        Args:
+            semilla (int): Semilla del generador aleatorio
+            densidad_comentarios (float): Probabilidad de que una sentencia
+                vaya precedida de un comentario
+            densidad_cadenas (float): Probabilidad de que una expresión sea
+                una cadena
+            longitud_identificadores (int): Longitud media de los identificadores
+            tasa_errores (float): Probabilidad de que una sentencia contenga un
+                carácter no reconocido
+            cantidad_identificadores (int): Identificadores distintos a usar
+        """
+        for nombre, valor in (
+            ("densidad_comentarios", densidad_comentarios),
+            ("densidad_cadenas", densidad_cadenas),
+            ("tasa_errores", tasa_errores),
+        ):
+            if not 0 <= valor <= 1:
+                raise ValueError(f"{nombre} debe estar entre 0 y 1: {valor}")
+        if longitud_identificadores < 1:
+            raise ValueError(
+                f"Longitud de identificadores inválida: {longitud_identificadores}"
+            )
+
+        self.semilla = semilla
+        self.densidad_comentarios = densidad_comentarios
+        self.densidad_cadenas = densidad_cadenas
+        self.longitud_identificadores = longitud_identificadores
+        self.tasa_errores = tasa_errores
+        self.cantidad_identificadores = cantidad_identificadores
+
+    def parametros(self):
+        """
+        Obtiene los parámetros del generador (para guardarlos con los resultados).
+
+        Returns:
+            dict: Parámetros por nombre
+        """
+        return {
+            "semilla": self.semilla,
+            "densidad_comentarios": self.densidad_comentarios,
+            "densidad_cadenas": self.densidad_cadenas,
+            "longitud_identificadores": self.longitud_identificadores,
+            "tasa_errores": self.tasa_errores,
+            "cantidad_identificadores": self.cantidad_identificadores,
+        }
+
+    def generar(self, tamano):
+        """
+        Genera un programa de aproximadamente el tamaño indicado.
+
+        Args:
+            tamano (int): Tamaño del programa, en caracteres
+
+        Returns:
+            str: Código fuente generado
+        """
+        self._azar = random.Random(self.semilla)
+        self._identificadores = self._generar_identificadores()
+
+        partes = []
+        total = 0
+        while total < tamano:
+            parte = self._elemento()
+            partes.append(parte)
+            total += len(parte)
+        return "".join(partes)
+
+    def _generar_identificadores(self):
+        azar = self._azar
+        letras = "abcdefghijklmnopqrstuvwxyz"
+        resto = letras + "0123456789_"
+        identificadores = set()
+        while len(identificadores) < self.cantidad_identificadores:
+            longitud = max(1, int(azar.gauss(self.longitud_identificadores, 2)))
+            nombre = azar.choice(letras) + "".join(
+                azar.choice(resto) for _ in range(longitud - 1)
+            )
+            # Las palabras reservadas no pueden usarse como identificador
+            if nombre not in RESERVADAS:
+                identificadores.add(nombre)
+        return sorted(identificadores)
+
+    def _elemento(self):
+        """Genera una sentencia de nivel superior o una función."""
+        azar = self._azar
+        eleccion = azar.random()
+        if eleccion < 0.1:
+            return self._funcion()
+        if eleccion < 0.25:
+            return self._control("")
+        return self._sentencia("")
+
+    def _funcion(self):
+        azar = self._azar
+        parametros = ", ".join(
+            f"{azar.choice(TIPOS)} {self._identificador()}"
+            for _ in range(azar.randint(2, 4))
+        )
+        cuerpo = "".join(self._sentencia("    ") for _ in range(azar.randint(1, 5)))
+        return (
+            f"{azar.choice(TIPOS)} {self._identificador()}({parametros}) {{\n"
+            f"{cuerpo}}}\n\n"
+        )
+
+    def _control(self, sangria):
+        azar = self._azar
+        interior = sangria + "    "
+        cuerpo = "".join(self._sentencia(interior) for _ in range(azar.randint(1, 3)))
+        condicion = self._condicion()
+        tipo = azar.random()
+        if tipo < 0.5:
+            texto = f"{sangria}si ({condicion}) {{\n{cuerpo}{sangria}}}"
+            if azar.random() < 0.5:
+                otro = "".join(self._sentencia(interior) for _ in range(azar.randint(1, 2)))
+                texto += f" sino {{\n{otro}{sangria}}}"
+            return texto + "\n"
+        if tipo < 0.8:
+            return f"{sangria}mientras ({condicion}) {{\n{cuerpo}{sangria}}}\n"
+        return f"{sangria}hacer {{\n{cuerpo}{sangria}}} mientras ({condicion})\n"
+
+    def _sentencia(self, sangria):
+        azar = self._azar
+        texto = ""
+        if azar.random() < self.densidad_comentarios:
+            texto = sangria + self._comentario()
+
+        if azar.random() < 0.5:
+            sentencia = f"{azar.choice(TIPOS)} {self._identificador()} = {self._expresion()};"
+        else:
+            sentencia = f"{self._identificador()} = {self._expresion()};"
+
+        if self.tasa_errores and azar.random() < self.tasa_errores:
+            posicion = azar.randint(0, len(sentencia))
+            sentencia = (
+                sentencia[:posicion] + azar.choice(CARACTERES_ERROR) + sentencia[posicion:]
+            )
+        return f"{texto}{sangria}{sentencia}\n"
+
+    def _comentario(self):
+        azar = self._azar
+        palabras = " ".join(
+            azar.choice(PALABRAS_COMENTARIO) for _ in range(azar.randint(3, 10))
+        )
+        if azar.random() < 0.7:
+            return f"// {palabras}\n"
+        return f"/* {palabras}\n   {palabras} */\n"
+
+    def _condicion(self):
+        return f"{self._operando()} {self._azar.choice(COMPARADORES)} {self._operando()}"
+
+    def _expresion(self):
+        azar = self._azar
+        if azar.random() < self.densidad_cadenas:
+            return self._cadena()
+        expresion = self._operando()
+        for _ in range(azar.randint(0, 3)):
+            expresion += f" {azar.choice(OPERADORES)} {self._operando()}"
+        if azar.random() < 0.1:
+            expresion = f"({expresion})"
+        return expresion
+
+    def _operando(self):
+        azar = self._azar
+        eleccion = azar.random()
+        if eleccion < 0.5:
+            return self._identificador()
+        if eleccion < 0.8:
+            return str(azar.randint(0, 10000))
+        if eleccion < 0.95:
+            return f"{azar.randint(0, 999)}.{azar.randint(0, 99)}"
+        return azar.choice(("verdadero", "falso"))
+
+    def _cadena(self):
+        azar = self._azar
+        palabras = " ".join(
+            azar.choice(PALABRAS_COMENTARIO) for _ in range(azar.randint(1, 6))
+        )
+        if azar.random() < 0.5:
+            return f'"{palabras}"'
+        return f"'{palabras}'"
+
+    def _identificador(self):
+        return self._azar.choice(self._identificadores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("salida", help="archivo donde se escribe el programa")
+    parser.add_argument("--kilobytes", type=float, default=1024)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--densidad-comentarios", type=float, default=0.1)
+    parser.add_argument("--densidad-cadenas", type=float, default=0.1)
+    parser.add_argument("--longitud-identificadores", type=int, default=8)
+    parser.add_argument("--tasa-errores", type=float, default=0.0)
+    argumentos = parser.parse_args()
+
+    generador = GeneradorCorpus(
+        semilla=argumentos.semilla,
+        densidad_comentarios=argumentos.densidad_comentarios,
+        densidad_cadenas=argumentos.densidad_cadenas,
+        longitud_identificadores=argumentos.longitud_identificadores,
+        tasa_errores=argumentos.tasa_errores,
+    )
+    codigo = generador.generar(int(argumentos.kilobytes * 1024))
+    with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+        archivo.write(codigo)
+    print(f"{len(codigo)} caracteres escritos en {argumentos.salida}")
+
+
+if __name__ == "__main__":
+    main()
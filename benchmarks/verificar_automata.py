@@ -0,0 +1,114 @@
+"""
+Verificación de equivalencia entre el motor AFD y la expresión maestra.
+
+Analiza cada archivo de tests/*.txt, corpus generados con semilla fija
+(con y sin errores léxicos) y las entradas adversarias de estres_lexico.py
+con AnalizadorLexico(usar_automata=False) y con usar_automata=True, en modo
+lista y compacto y con y sin recuperar_errores, y compara los tokens, sus
+desplazamientos y sus ids de nombre. Si algún resultado difiere, el programa
+termina con error.
+
+Uso:
+    python benchmarks/verificar_automata.py [--kilobytes 256] [--semillas 3]
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analizador_lexico import AnalizadorLexico  # noqa: E402
+from estres_lexico import ENTRADAS  # noqa: E402
+from generador_corpus import GeneradorCorpus  # noqa: E402
+
+# Tamaño de las entradas adversarias
+TAMANO_ADVERSARIAS = 4096
+
+
+def entradas(kilobytes, semillas):
+    """
+    Genera las entradas a verificar.
+
+    Args:
+        kilobytes (float): Tamaño de cada corpus generado
+        semillas (int): Cantidad de semillas de corpus
+
+    Yields:
+        tuple: (nombre, codigo)
+    """
+    for ruta in sorted(glob.glob(os.path.join(RAIZ, "tests", "*.txt"))):
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            yield os.path.basename(ruta), archivo.read()
+
+    for semilla in range(1, semillas + 1):
+        for tasa_errores in (0.0, 0.05):
+            generador = GeneradorCorpus(
+                semilla=semilla,
+                densidad_comentarios=0.2,
+                densidad_cadenas=0.2,
+                tasa_errores=tasa_errores,
+            )
+            yield (
+                f"corpus semilla {semilla} errores {tasa_errores}",
+                generador.generar(int(kilobytes * 1024)),
+            )
+
+    for nombre, generar in ENTRADAS.items():
+        yield nombre, generar(TAMANO_ADVERSARIAS)
+
+
+def resultado(usar_automata, recuperar_errores, compacto, codigo):
+    """
+    Analiza un código y resume todo lo que debe coincidir entre motores.
+
+    Args:
+        usar_automata (bool): Motor a usar
+        recuperar_errores (bool): Modo de errores
+        compacto (bool): Si se usa el modo compacto
+        codigo (str): Código a analizar
+
+    Returns:
+        tuple: Tokens, desplazamientos e ids de nombre
+    """
+    analizador = AnalizadorLexico(
+        usar_automata=usar_automata, recuperar_errores=recuperar_errores
+    )
+    tokens = analizador.analizar(codigo, compacto=compacto)
+    if compacto:
+        return list(tokens), tokens.inicios, tokens.fines, tokens.ids_nombres
+    return tokens, analizador.posiciones, analizador.ids_nombres
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kilobytes", type=float, default=256)
+    parser.add_argument("--semillas", type=int, default=3)
+    argumentos = parser.parse_args()
+
+    fallos = 0
+    for nombre, codigo in entradas(argumentos.kilobytes, argumentos.semillas):
+        diferencias = []
+        for recuperar_errores in (False, True):
+            for compacto in (False, True):
+                esperado = resultado(False, recuperar_errores, compacto, codigo)
+                obtenido = resultado(True, recuperar_errores, compacto, codigo)
+                if obtenido != esperado:
+                    diferencias.append(
+                        f"{'compacto' if compacto else 'lista'}"
+                        f"{', recuperando' if recuperar_errores else ''}"
+                    )
+        fallos += bool(diferencias)
+        estado = "DIFIERE (" + "; ".join(diferencias) + ")" if diferencias else "ok"
+        print(f"{nombre:<40} {len(codigo):>8} caracteres  {estado}")
+
+    if fallos:
+        raise SystemExit(f"Los motores difieren en {fallos} entradas")
+    print("Ambos motores producen los mismos tokens")
+
+
+if __name__ == "__main__":
+    main()
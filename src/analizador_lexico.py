@@ -1,4 +1,154 @@
+import hashlib
+import mmap
+import os
 import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from automata_lexico import AutomataLexico
+from cache_tokens import CacheTokens
+
+
+class IndiceLineas:
+    """
+    Índice con el desplazamiento donde inicia cada línea del código fuente.
+    Se construye una sola vez y permite resolver la línea y la columna de
+    cualquier posición mediante búsqueda binaria (O(log n)).
+    """
+
+    def __init__(self, codigo):
+        """
+        Construye el índice de inicios de línea.
+
+        Args:
+            codigo (str o bytes): El código fuente completo
+        """
+        salto = b"\n" if isinstance(codigo, (bytes, bytearray)) else "\n"
+        self.inicios = [0]
+        self.inicios.extend(m.end() for m in re.finditer(salto, codigo))
+
+    def linea(self, posicion):
+        """
+        Obtiene el número de línea (base 1) de una posición.
+
+        Args:
+            posicion (int): Desplazamiento dentro del código fuente
+
+        Returns:
+            int: Número de línea
+        """
+        return bisect_right(self.inicios, posicion)
+
+    def ubicar(self, posicion):
+        """
+        Obtiene la línea y la columna (ambas base 1) de una posición.
+
+        Args:
+            posicion (int): Desplazamiento dentro del código fuente
+
+        Returns:
+            tuple: (linea, columna)
+        """
+        linea = bisect_right(self.inicios, posicion)
+        return (linea, posicion - self.inicios[linea - 1] + 1)
+
+    def reemplazar(self, inicio, fin, texto):
+        """
+        Actualiza el índice tras reemplazar codigo[inicio:fin] por texto, sin
+        volver a recorrer el resto del código.
+
+        Args:
+            inicio (int): Inicio del tramo reemplazado
+            fin (int): Fin del tramo reemplazado
+            texto (str): Texto nuevo
+        """
+        desplazamiento = len(texto) - (fin - inicio)
+        inicios = self.inicios
+        nuevos = inicios[: bisect_right(inicios, inicio)]
+        nuevos.extend(inicio + m.end() for m in re.finditer("\n", texto))
+        nuevos.extend(
+            posicion + desplazamiento for posicion in inicios[bisect_right(inicios, fin) :]
+        )
+        self.inicios = nuevos
+
+
+class TokenPerezoso:
+    """
+    Token reconocido sobre un buffer de bytes cuyo valor solo se decodifica
+    cuando se solicita. Se comporta como la tupla (tipo, valor, linea) que
+    devuelve analizar(): admite indexado, desempaquetado y comparación.
+    """
+
+    __slots__ = ("_datos", "_codificacion", "_valor", "tipo", "inicio", "fin", "linea")
+
+    def __init__(self, datos, codificacion, tipo, inicio, fin, linea):
+        """
+        Inicializa el token.
+
+        Args:
+            datos: Buffer de bytes donde se reconoció el token (bytes o mmap)
+            codificacion (str): Codificación usada para decodificar el valor
+            tipo (str): Tipo de token
+            inicio (int): Desplazamiento del primer byte del token
+            fin (int): Desplazamiento siguiente al último byte del token
+            linea (int): Número de línea
+        """
+        self._datos = datos
+        self._codificacion = codificacion
+        self._valor = None
+        self.tipo = tipo
+        self.inicio = inicio
+        self.fin = fin
+        self.linea = linea
+
+    @property
+    def valor(self):
+        """
+        Decodifica (una sola vez) el valor del token.
+
+        Returns:
+            str: Valor del token, o el mensaje de error si es un token ERROR
+        """
+        if self._valor is None:
+            texto = self._datos[self.inicio : self.fin].decode(
+                self._codificacion, "replace"
+            )
+            if self.tipo == "ERROR":
+                texto = f"Token inesperado '{texto}'"
+            self._valor = texto
+        return self._valor
+
+    def __getitem__(self, indice):
+        if indice == 0:
+            return self.tipo
+        if indice == 1:
+            return self.valor
+        if indice == 2:
+            return self.linea
+        return (self.tipo, self.valor, self.linea)[indice]
+
+    def __len__(self):
+        return 3
+
+    def __iter__(self):
+        yield self.tipo
+        yield self.valor
+        yield self.linea
+
+    def __eq__(self, otro):
+        return tuple(self) == tuple(otro)
+
+    def __ne__(self, otro):
+        return not self == otro
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
 
 
 class AnalizadorLexico:
@@ -11,13 +161,17 @@ class AnalizadorLexico:
         # Comentarios (deben ir primero para tener prioridad)
         ("COMENTARIO_LINEA", r"//.*"),
         ("COMENTARIO_BLOQUE", r"/\*[\s\S]*?\*/"),
+        # Comentario de bloque sin '*/': se extiende hasta el final del código
+        ("COMENTARIO_SIN_CERRAR", r"/\*[\s\S]*"),
         # Números decimales
         ("NUMERO_DECIMAL", r"\d+\.\d+"),
         # Números enteros
         ("NUMERO_ENTERO", r"\d+"),
-        # Literales de cadena
-        ("CADENA_SIMPLE", r"'[^'\\]*(?:\\.[^'\\]*)*'"),
-        ("CADENA_DOBLE", r'"[^"\\]*(?:\\.[^"\\]*)*"'),
+        # Literales de cadena (no pueden atravesar un salto de línea)
+        ("CADENA_SIMPLE", r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'"),
+        ("CADENA_DOBLE", r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'),
+        # Cadena sin comilla de cierre antes del fin de línea
+        ("CADENA_SIN_CERRAR", r"['\"][^\n]*"),
         # Identificadores (soporta mayúsculas, minúsculas y guiones bajos)
         ("IDENTIFICADOR", r"[a-zA-Z_][a-zA-Z0-9_]*"),
         # Operadores y símbolos (comparadores ANTES de asignación para prioridad)
@@ -41,6 +195,66 @@ class AnalizadorLexico:
         ("ERROR", r"."),
     ]
 
+    # Tokens que se reconocen pero no se entregan al analizador sintáctico
+    TOKENS_IGNORADOS = frozenset(
+        ["NUEVALINEA", "ESPACIO", "COMENTARIO_LINEA", "COMENTARIO_BLOQUE"]
+    )
+
+    # Tokens que el recorrido descarta por completo; los comentarios de bloque
+    # se entregan a analizar() para registrar los puntos de control de reanalizar()
+    _IGNORADOS_RECORRIDO = TOKENS_IGNORADOS - {"COMENTARIO_BLOQUE"}
+
+    # Errores que detienen el análisis léxico (salvo en modo recuperación)
+    _TOKENS_SIN_CERRAR = ("COMENTARIO_SIN_CERRAR", "CADENA_SIN_CERRAR")
+
+    # En modo recuperación, tras el primer comentario sin cerrar ya no queda
+    # ningún '*/' en el código: el resto se recorre con una especificación en
+    # la que todo comentario de bloque termina al final de su línea
+    _COMENTARIO_SIN_CIERRE = r"/\*[^\n]*"
+
+    # Con re, cada escape de una cadena deja un punto de retroceso en la pila
+    # del motor, que crece con la cadena; la repetición posesiva (Python 3.11+)
+    # los descarta y mantiene lineal el reconocimiento de cadenas con miles de
+    # escapes. El autómata usa siempre TOKEN_ESPECIFICACION (sin retroceso).
+    _PATRONES_POSESIVOS = {}
+    if sys.version_info >= (3, 11):
+        _PATRONES_POSESIVOS = {
+            "CADENA_SIMPLE": r"'[^'\\\n]*+(?:\\.[^'\\\n]*+)*+'",
+            "CADENA_DOBLE": r'"[^"\\\n]*+(?:\\.[^"\\\n]*+)*+"',
+        }
+
+    # Mensajes de los errores que detienen el análisis léxico
+    MENSAJE_COMENTARIO_SIN_CERRAR = (
+        "Comentario de bloque sin cerrar: se esperaba '*/' para cerrar el comentario"
+    )
+    MENSAJE_CADENA_SIN_CERRAR = "Cadena sin cerrar: se esperaba {} para cerrar la cadena"
+    MENSAJE_CODIFICACION_INVALIDA = "Codificación inválida: se esperaba texto {} en {}"
+
+    # En bytes, el token de error abarca un carácter UTF-8 completo
+    # (byte inicial seguido de sus bytes de continuación)
+    _ERROR_BYTES = rb"[\xc0-\xff][\x80-\xbf]{0,3}|."
+
+    # Caracteres que deben quedar por delante de un token para darlo por
+    # terminado al leer por bloques (ej: '1.' puede ser el inicio de '1.5')
+    _MARGEN_STREAM = 2
+
+    # Tokens que pueden contener saltos de línea o caracteres de otros tokens;
+    # el análisis paralelo los localiza antes de dividir el código
+    _TOKENS_DIVISION = (
+        "COMENTARIO_LINEA",
+        "COMENTARIO_BLOQUE",
+        "COMENTARIO_SIN_CERRAR",
+        "CADENA_SIMPLE",
+        "CADENA_DOBLE",
+        "CADENA_SIN_CERRAR",
+    )
+
+    # Tamaño mínimo del código (en caracteres) para repartirlo entre procesos
+    _TAMANO_MINIMO_PARALELO = 1 << 20
+
+    # Fragmentos por proceso (permite equilibrar la carga entre procesos)
+    _FRAGMENTOS_POR_PROCESO = 4
+
     # Palabras reservadas
     PALABRAS_RESERVADAS = {
         "entero",
@@ -54,237 +268,1883 @@ class AnalizadorLexico:
         "verdadero",
         "falso",
     }
+    _PALABRAS_RESERVADAS_BYTES = frozenset(p.encode("ascii") for p in PALABRAS_RESERVADAS)
 
-    def __init__(self):
+    # Cabecera de las entradas de la caché: marca, cantidad de tokens, de
+    # comentarios de bloque y bytes de los nombres
+    _CABECERA_CACHE = struct.Struct("<4sIII")
+    _MARCA_CACHE = b"TOK1"
+
+    def __init__(self, usar_automata=False, cache=None, recuperar_errores=False):
         """
         Inicializa el analizador léxico.
+
+        Args:
+            usar_automata (bool): Si es True, analizar() reconoce los tokens con
+                un autómata finito determinista generado a partir de
+                TOKEN_ESPECIFICACION en lugar de la expresión regular maestra.
+                Ambos motores producen exactamente los mismos tokens.
+            cache (CacheTokens o str): Caché en disco (o su directorio) que
+                consulta analizar() antes de analizar un código. Las entradas
+                se identifican por el hash del código y de la especificación
+                de tokens, por lo que un cambio en TOKEN_ESPECIFICACION o en
+                PALABRAS_RESERVADAS invalida las anteriores.
+            recuperar_errores (bool): Si es True, analizar() no se detiene en
+                una cadena o un comentario sin cerrar: los reporta como un
+                token ERROR más y continúa en la línea siguiente (la cadena ya
+                termina al final de su línea y el comentario se da por
+                terminado allí), de modo que todos los errores léxicos se
+                obtienen en un único recorrido.
         """
         # Compilar la expresión regular maestra una sola vez para mejor rendimiento
         self.regex_maestra = "|".join(
-            "(?P<%s>%s)" % par for par in self.TOKEN_ESPECIFICACION
+            "(?P<%s>%s)" % par for par in self._especificacion_re()
+        )
+        self.patron_maestro = re.compile(self.regex_maestra)
+
+        # Versión en bytes de la expresión maestra (modo mmap)
+        self.patron_maestro_bytes = re.compile(
+            b"|".join(
+                b"(?P<%s>%s)" % (nombre.encode("ascii"), patron)
+                for nombre, patron in self._especificacion_bytes()
+            )
+        )
+
+        # Comentarios y cadenas, para elegir los puntos de división en paralelo
+        especificacion = dict(self._especificacion_re())
+        self.patron_division = re.compile(
+            "|".join(
+                "(?P<%s>%s)" % (nombre, especificacion[nombre])
+                for nombre in self._TOKENS_DIVISION
+            )
         )
 
-    def analizar(self, codigo):
+        # Motor alternativo: tabla de transiciones generada de la especificación
+        self.automata = None
+        if usar_automata:
+            self.automata = AutomataLexico(
+                self.TOKEN_ESPECIFICACION, self._IGNORADOS_RECORRIDO
+            )
+
+        # Motores del modo recuperación tras un comentario sin cerrar (se
+        # compilan la primera vez que hacen falta)
+        self.patron_sin_cierre = None
+        self.automata_sin_cierre = None
+
+        self.recuperar_errores = recuperar_errores
+
+        # Caché en disco y hash de todo lo que determina los tokens de un código
+        if isinstance(cache, str):
+            cache = CacheTokens(cache)
+        self.cache = cache
+        self._hash_especificacion = self._calcular_hash_especificacion()
+
+        # Resultados auxiliares del último análisis
+        self.indice_lineas = None
+        self.posiciones = []
+
+        # Estado conservado para reanalizar(): código y tokens del último
+        # análisis y desplazamientos (inicio, fin) de sus comentarios de bloque
+        self.codigo = None
+        self.tokens = None
+        self.comentarios = []
+
+        # Nombres del último análisis: tabla de identificadores y palabras
+        # reservadas, y el id de nombre de cada token (-1 si no es un nombre)
+        self.tabla_nombres = None
+        self.ids_nombres = None
+
+    def analizar(self, codigo, compacto=False, resumen=None):
         """
         Analizador Léxico.
         Toma un string de código y lo divide en una lista de tokens.
 
+        El código se recorre una sola vez: los comentarios de bloque y las
+        cadenas sin cerrar se detectan durante el mismo recorrido que genera
+        los tokens. Un comentario sin cerrar tiene prioridad sobre una cadena
+        sin cerrar y cualquiera de los dos se reporta como único token.
+
         Args:
             codigo (str): El código fuente a analizar
+            compacto (bool): Si es True devuelve un TokenBuffer en lugar de la
+                lista de tuplas (ocupa una fracción de la memoria)
+            resumen (ResumenTokens): Si se indica, se le suman los tokens
+                devueltos, contados durante el mismo recorrido (equivale a
+                generar_resumen_tokens() sin recorrer otra vez la lista)
 
         Returns:
-            list: Lista de tuplas (tipo_token, valor, numero_linea)
+            ListaTokens: Lista de tuplas (tipo_token, valor, numero_linea), que
+                además lleva el código TipoToken y el id de nombre de cada token
+
+        Además deja en self.posiciones los desplazamientos (inicio, fin) de cada
+        token devuelto y en self.indice_lineas el índice de líneas del código,
+        útil para obtener la columna de un token con ubicar(). En modo compacto
+        los desplazamientos quedan en el propio TokenBuffer.
+
+        Los identificadores y palabras reservadas se registran en una
+        TablaNombres (self.tabla_nombres): los nombres repetidos comparten una
+        única cadena y self.ids_nombres guarda el id entero de cada token (-1
+        si no es un nombre).
+
+        Si el analizador tiene una caché y el código ya se analizó con la misma
+        especificación, los tokens se leen de la caché sin volver a analizarlo.
         """
-        tokens = []
+        self.codigo = codigo
+        self.tokens = None
+        if self.cache is None:
+            if compacto:
+                return self._analizar_compacto(codigo, resumen)
+            return self._analizar_tuplas(codigo, resumen)
 
-        # PASO 1: Detectar comentarios de bloque sin cerrar
-        error_comentario = self._detectar_comentario_sin_cerrar(codigo)
-        if error_comentario:
-            return [error_comentario]
+        clave = self._clave_cache(codigo)
+        datos = self.cache.obtener(clave)
+        if datos is not None:
+            resultado = self._desde_cache(codigo, datos, compacto)
+            if resultado is not None:
+                if resumen is not None:
+                    resumen.agregar_tokens(resultado)
+                return resultado
 
-        # PASO 2: Detectar cadenas sin cerrar
-        error_cadena = self._detectar_cadena_sin_cerrar(codigo)
-        if error_cadena:
-            return [error_cadena]
+        if compacto:
+            resultado = self._analizar_compacto(codigo, resumen)
+            buffer = resultado
+        else:
+            resultado = self._analizar_tuplas(codigo, resumen)
+            buffer = self._buffer_de_tuplas(codigo, resultado)
+        self.cache.guardar(clave, self._serializar_cache(buffer))
+        return resultado
 
-        # PASO 3: Análisis léxico normal
-        for mo in re.finditer(self.regex_maestra, codigo):
-            tipo_token = mo.lastgroup
-            valor = mo.group()
+    def _analizar_tuplas(self, codigo, resumen=None):
+        """
+        Variante de analizar() que devuelve la lista de tuplas.
+
+        Args:
+            codigo (str): El código fuente a analizar
+            resumen (ResumenTokens): Resumen al que se suman los tokens
+
+        Returns:
+            ListaTokens: Lista de tuplas (tipo_token, valor, numero_linea)
+        """
+        tokens = ListaTokens()
+        posiciones = []
+        comentarios = []
+        self.posiciones = posiciones
+        self.comentarios = comentarios
 
-            # Calcular número de línea basado en la posición del match
-            linea_num = codigo[: mo.start()].count("\n") + 1
+        # Código TipoToken de cada token, para el analizador sintáctico
+        codigos = TipoToken.CODIGOS
+        codigos_reservadas = TipoToken.PALABRAS
+        agregar_tipo = tokens.tipos.append
 
-            if tipo_token == "NUEVALINEA":
-                continue
-            elif tipo_token == "ESPACIO":
-                continue
-            elif tipo_token in ["COMENTARIO_LINEA", "COMENTARIO_BLOQUE"]:
-                # Los comentarios se ignoran
+        tabla = TablaNombres()
+        ids = array("i")
+        self.tabla_nombres = tokens.tabla_nombres = tabla
+        self.ids_nombres = tokens.ids_nombres = ids
+        nombres = tabla.nombres
+        ids_por_nombre = tabla.ids
+        cantidad_reservadas = tabla.CANTIDAD_RESERVADAS
+        agregar_id = ids.append
+
+        # Índice de inicios de línea, calculado una sola vez
+        indice = IndiceLineas(codigo)
+        self.indice_lineas = indice
+        linea_de = indice.linea
+
+        # Espacios, saltos de línea y comentarios ya vienen descartados
+        recuperar = self.recuperar_errores
+        iterador = self._recorrer(codigo, recuperar)
+        error_cadena = None
+        hubo_sin_cerrar = False
+        # Conteo del resumen: {tipo_token: {texto: cantidad}}
+        crudos = {} if resumen is not None else None
+        for tipo_token, inicio, fin in iterador:
+            if tipo_token == "COMENTARIO_BLOQUE":
+                comentarios.append((inicio, fin))
                 continue
+
+            # Calcular número de línea con el índice (búsqueda binaria)
+            linea_num = linea_de(inicio)
+            valor = codigo[inicio:fin]
+
+            if crudos is not None:
+                por_texto = crudos.get(tipo_token)
+                if por_texto is None:
+                    por_texto = crudos[tipo_token] = {}
+                por_texto[valor] = por_texto.get(valor, 0) + 1
+
+            if tipo_token == "IDENTIFICADOR":
+                # Registrar el nombre: los repetidos comparten la misma cadena y
+                # las palabras reservadas ocupan los primeros ids de la tabla
+                id_nombre = ids_por_nombre.get(valor)
+                if id_nombre is None:
+                    id_nombre = tabla.agregar(valor)
+                else:
+                    valor = nombres[id_nombre]
+                if id_nombre < cantidad_reservadas:
+                    tokens.append(("PALABRA_RESERVADA", valor, linea_num))
+                    agregar_tipo(codigos_reservadas[valor])
+                else:
+                    tokens.append((tipo_token, valor, linea_num))
+                    agregar_tipo(codigos[tipo_token])
+                agregar_id(id_nombre)
             elif tipo_token == "ERROR":
                 tokens.append(("ERROR", f"Token inesperado '{valor}'", linea_num))
+                agregar_tipo(codigos[tipo_token])
+                agregar_id(-1)
+            elif recuperar and tipo_token in self._TOKENS_SIN_CERRAR:
+                # Modo recuperación: se reporta el error y el análisis sigue
+                if tipo_token == "COMENTARIO_SIN_CERRAR":
+                    tokens.append(self._error_comentario_sin_cerrar(linea_num))
+                else:
+                    tokens.append(self._error_cadena_sin_cerrar(valor[0], linea_num))
+                agregar_tipo(codigos[tipo_token])
+                agregar_id(-1)
+                hubo_sin_cerrar = True
+            elif tipo_token == "COMENTARIO_SIN_CERRAR":
+                self.posiciones = [(inicio, fin)]
+                self.ids_nombres = array("i", [-1])
+                error = self._error_comentario_sin_cerrar(linea_num)
+                if resumen is not None:
+                    resumen.agregar(*error[:2])
+                return [error]
+            elif tipo_token == "CADENA_SIN_CERRAR":
+                error_cadena = (
+                    self._error_cadena_sin_cerrar(valor[0], linea_num),
+                    (inicio, fin),
+                )
+                break
             else:
-                # Es un identificador? Verificar si es una palabra reservada
-                if tipo_token == "IDENTIFICADOR" and valor in self.PALABRAS_RESERVADAS:
-                    tipo_token = "PALABRA_RESERVADA"
-
                 tokens.append((tipo_token, valor, linea_num))
+                agregar_tipo(codigos[tipo_token])
+                agregar_id(-1)
+            posiciones.append((inicio, fin))
 
-        return tokens
+        if error_cadena is None:
+            # Tras recuperar un error sin cerrar, reanalizar() analiza todo
+            if not hubo_sin_cerrar:
+                self.tokens = tokens
+            if resumen is not None:
+                resumen.agregar_crudos(crudos)
+            return tokens
+
+        self.ids_nombres = array("i", [-1])
+
+        # Hubo una cadena sin cerrar: solo resta comprobar si más adelante hay
+        # un comentario sin cerrar, que tiene prioridad sobre la cadena
+        error = error_cadena[0]
+        self.posiciones = [error_cadena[1]]
+        for tipo_token, inicio, fin in iterador:
+            if tipo_token == "COMENTARIO_SIN_CERRAR":
+                error = self._error_comentario_sin_cerrar(linea_de(inicio))
+                self.posiciones = [(inicio, fin)]
+                break
+
+        if resumen is not None:
+            resumen.agregar(*error[:2])
+        return [error]
 
-    def _detectar_comentario_sin_cerrar(self, codigo):
+    def _analizar_compacto(self, codigo, resumen=None):
         """
-        Detecta si hay un comentario de bloque sin cerrar.
+        Variante de analizar() que guarda los tokens en un TokenBuffer.
 
         Args:
             codigo (str): El código fuente a analizar
+            resumen (ResumenTokens): Resumen al que se suman los tokens
 
         Returns:
-            tuple o None: Token de error si se detecta comentario sin cerrar, None en caso contrario
+            TokenBuffer: Tokens reconocidos
         """
-        # Buscar todos los comentarios de bloque abiertos y cerrados
-        patron_apertura = r"/\*"
-        patron_cierre = r"\*/"
+        buffer = TokenBuffer(codigo)
+        self.posiciones = []
+        comentarios = []
+        self.comentarios = comentarios
+
+        indice = IndiceLineas(codigo)
+        self.indice_lineas = indice
+        linea_de = indice.linea
+
+        tabla = TablaNombres()
+        buffer.tabla_nombres = tabla
+        self.tabla_nombres = tabla
+        self.ids_nombres = buffer.ids_nombres
+        ids_por_nombre = tabla.ids
+        cantidad_reservadas = tabla.CANTIDAD_RESERVADAS
+        agregar_id = buffer.ids_nombres.append
+
+        codigos = TipoToken.CODIGOS
+        codigo_identificador = TipoToken.IDENTIFICADOR
+        # Código de la primera palabra reservada: el de cada una es este más su id
+        base_reservadas = TipoToken.PALABRAS[tabla.RESERVADAS[0]]
+        agregar_tipo = buffer.tipos.append
+        agregar_inicio = buffer.inicios.append
+        agregar_fin = buffer.fines.append
+        agregar_linea = buffer.lineas.append
+
+        # En modo recuperación los errores sin cerrar se guardan como un token más
+        recuperar = self.recuperar_errores
+        iterador = self._recorrer(codigo, recuperar)
+        error = None
+        # Conteo del resumen: {tipo_token: {texto: cantidad}}
+        crudos = {} if resumen is not None else None
+        for tipo_token, inicio, fin in iterador:
+            if tipo_token == "COMENTARIO_BLOQUE":
+                comentarios.append((inicio, fin))
+                continue
+
+            if crudos is not None:
+                por_texto = crudos.get(tipo_token)
+                if por_texto is None:
+                    por_texto = crudos[tipo_token] = {}
+                texto = codigo[inicio:fin]
+                por_texto[texto] = por_texto.get(texto, 0) + 1
 
-        aperturas = [(m.start(), m.end()) for m in re.finditer(patron_apertura, codigo)]
-        cierres = [(m.start(), m.end()) for m in re.finditer(patron_cierre, codigo)]
+            if not recuperar and tipo_token in self._TOKENS_SIN_CERRAR:
+                error = (codigos[tipo_token], inicio, fin, linea_de(inicio))
+                break
+            elif tipo_token == "IDENTIFICADOR":
+                # Cada palabra reservada tiene su propio código de tipo
+                valor = codigo[inicio:fin]
+                id_nombre = ids_por_nombre.get(valor)
+                if id_nombre is None:
+                    id_nombre = tabla.agregar(valor)
+                if id_nombre < cantidad_reservadas:
+                    agregar_tipo(base_reservadas + id_nombre)
+                else:
+                    agregar_tipo(codigo_identificador)
+                agregar_id(id_nombre)
+            else:
+                agregar_tipo(codigos[tipo_token])
+                agregar_id(-1)
+            agregar_inicio(inicio)
+            agregar_fin(fin)
+            agregar_linea(linea_de(inicio))
 
-        if not aperturas:
-            return None  # No hay comentarios de bloque
+        if error is None:
+            if resumen is not None:
+                resumen.agregar_crudos(crudos)
+            return buffer
 
-        # Emparejar aperturas con cierres
-        i_cierre = 0
-        for apertura_inicio, apertura_fin in aperturas:
-            # Buscar el primer cierre después de esta apertura
-            encontrado_cierre = False
-            while i_cierre < len(cierres):
-                cierre_inicio, _ = cierres[i_cierre]
-                if cierre_inicio > apertura_inicio:
-                    # Encontramos el cierre correspondiente
-                    encontrado_cierre = True
-                    i_cierre += 1
+        # Un comentario sin cerrar posterior tiene prioridad sobre la cadena
+        if error[0] == codigos["CADENA_SIN_CERRAR"]:
+            for tipo_token, inicio, fin in iterador:
+                if tipo_token == "COMENTARIO_SIN_CERRAR":
+                    error = (codigos[tipo_token], inicio, fin, linea_de(inicio))
                     break
-                i_cierre += 1
-
-            # Si esta apertura no tiene cierre, es un error
-            if not encontrado_cierre:
-                linea_num = codigo[:apertura_inicio].count("\n") + 1
-                return (
-                    "ERROR",
-                    "Comentario de bloque sin cerrar: se esperaba '*/' para cerrar el comentario",
-                    linea_num,
-                )
 
-        return None
+        buffer = TokenBuffer.con_token(codigo, *error)
+        self.ids_nombres = buffer.ids_nombres
+        if resumen is not None:
+            resumen.agregar_tokens(buffer)
+        return buffer
+
+    def _calcular_hash_especificacion(self):
+        """
+        Calcula el hash de todo lo que, además del código, determina el
+        resultado guardado en la caché: la especificación de tokens, las
+        palabras reservadas, el modo de recuperación de errores, el formato de
+        las entradas y el orden de bytes de la máquina (los arreglos se guardan
+        en formato nativo).
+
+        Returns:
+            bytes: Hash SHA-256
+        """
+        datos = repr(
+            (
+                self._MARCA_CACHE,
+                self.recuperar_errores,
+                self.TOKEN_ESPECIFICACION,
+                sorted(self.PALABRAS_RESERVADAS),
+                sys.byteorder,
+                array("I").itemsize,
+            )
+        )
+        return hashlib.sha256(datos.encode("utf-8")).digest()
 
-    def _detectar_cadena_sin_cerrar(self, codigo):
+    def _clave_cache(self, codigo):
         """
-        Detecta si hay una cadena sin cerrar.
+        Calcula la clave de caché de un código.
 
         Args:
-            codigo (str): El código fuente a analizar
+            codigo (str): El código fuente
 
         Returns:
-            tuple o None: Token de error si se detecta cadena sin cerrar, None en caso contrario
-        """
-        # Eliminar comentarios primero para no detectar comillas dentro de comentarios
-        codigo_sin_comentarios = re.sub(r"//.*", "", codigo)  # Comentarios de línea
-        codigo_sin_comentarios = re.sub(
-            r"/\*[\s\S]*?\*/", "", codigo_sin_comentarios
-        )  # Comentarios de bloque
-
-        # Buscar cadenas con comillas simples o dobles
-        i = 0
-        while i < len(codigo_sin_comentarios):
-            char = codigo_sin_comentarios[i]
-
-            # Encontramos el inicio de una cadena
-            if char in ('"', "'"):
-                comilla_tipo = char
-                i += 1
-                cadena_cerrada = False
-
-                # Buscar el cierre de la cadena
-                while i < len(codigo_sin_comentarios):
-                    char_actual = codigo_sin_comentarios[i]
-
-                    # Si encontramos la comilla de cierre (y no está escapada)
-                    if char_actual == comilla_tipo:
-                        # Verificar si está escapada
-                        if i > 0 and codigo_sin_comentarios[i - 1] == "\\":
-                            # Está escapada, continuar
-                            i += 1
-                            continue
-                        else:
-                            # Cadena cerrada correctamente
-                            cadena_cerrada = True
-                            break
-
-                    # Si encontramos un salto de línea antes de cerrar, es un error
-                    if char_actual == "\n":
-                        linea_num = codigo_sin_comentarios[:i].count("\n") + 1
-                        return (
-                            "ERROR",
-                            f"Cadena sin cerrar: se esperaba {comilla_tipo} para cerrar la cadena",
-                            linea_num,
-                        )
-
-                    i += 1
-
-                # Si llegamos al final sin cerrar la cadena
-                if not cadena_cerrada:
-                    linea_num = codigo_sin_comentarios[:i].count("\n") + 1
-                    return (
-                        "ERROR",
-                        f"Cadena sin cerrar: se esperaba {comilla_tipo} para cerrar la cadena",
-                        linea_num,
-                    )
+            str: Clave hexadecimal
+        """
+        resumen = hashlib.sha256(self._hash_especificacion)
+        resumen.update(codigo.encode("utf-8", "surrogatepass"))
+        return resumen.hexdigest()
 
-            i += 1
+    def _buffer_de_tuplas(self, codigo, tokens):
+        """
+        Convierte el resultado de _analizar_tuplas() en un TokenBuffer para
+        guardarlo en la caché.
 
-        return None
+        Args:
+            codigo (str): El código fuente analizado
+            tokens (list): Tokens devueltos por _analizar_tuplas()
 
-    def obtener_errores(self, tokens):
+        Returns:
+            TokenBuffer: Los mismos tokens en forma compacta
         """
-        Filtra solo los tokens de error de la lista de tokens.
+        # Los errores de cadena o comentario sin cerrar recuperan su tipo
+        # original a partir del mensaje
+        sin_cerrar = {
+            self.MENSAJE_COMENTARIO_SIN_CERRAR: TipoToken.COMENTARIO_SIN_CERRAR,
+            self.MENSAJE_CADENA_SIN_CERRAR.format("'"): TipoToken.CADENA_SIN_CERRAR,
+            self.MENSAJE_CADENA_SIN_CERRAR.format('"'): TipoToken.CADENA_SIN_CERRAR,
+        }
+        codigo_error = TipoToken.ERROR
+
+        buffer = TokenBuffer(codigo)
+        if isinstance(tokens, ListaTokens):
+            buffer.tipos = tokens.tipos
+        else:
+            buffer.tipos = array(
+                "B",
+                [
+                    sin_cerrar.get(token[1], codigo_error)
+                    if token[0] == "ERROR"
+                    else TipoToken.codigo(token)
+                    for token in tokens
+                ],
+            )
+        buffer.inicios = array("I", [inicio for inicio, _ in self.posiciones])
+        buffer.fines = array("I", [fin for _, fin in self.posiciones])
+        buffer.lineas = array("I", [linea for _, _, linea in tokens])
+        buffer.ids_nombres = self.ids_nombres
+        buffer.tabla_nombres = self.tabla_nombres
+        return buffer
+
+    def _serializar_cache(self, buffer):
+        """
+        Codifica un resultado en el formato binario de la caché: la cabecera,
+        los arreglos del TokenBuffer tal cual están en memoria, los
+        comentarios de bloque y los nombres que no son palabras reservadas.
 
         Args:
-            tokens (list): Lista de tokens
+            buffer (TokenBuffer): Tokens del último análisis
 
         Returns:
-            list: Lista de tokens de error
+            bytes: Contenido de la entrada
         """
-        return [t for t in tokens if t[0] == "ERROR"]
+        comentarios = array("I")
+        for inicio, fin in self.comentarios:
+            comentarios.append(inicio)
+            comentarios.append(fin)
 
-    def generar_resumen_tokens(self, tokens):
+        nombres = b""
+        if buffer.tabla_nombres is not None:
+            nombres = "\n".join(
+                buffer.tabla_nombres.nombres[TablaNombres.CANTIDAD_RESERVADAS :]
+            ).encode("utf-8", "surrogatepass")
+
+        return b"".join(
+            [
+                self._CABECERA_CACHE.pack(
+                    self._MARCA_CACHE, len(buffer), len(self.comentarios), len(nombres)
+                ),
+                buffer.tipos.tobytes(),
+                buffer.inicios.tobytes(),
+                buffer.fines.tobytes(),
+                buffer.lineas.tobytes(),
+                buffer.ids_nombres.tobytes(),
+                comentarios.tobytes(),
+                nombres,
+            ]
+        )
+
+    def _desde_cache(self, codigo, datos, compacto):
         """
-        Genera un resumen de los tokens agrupados por tipo.
+        Reconstruye el resultado de analizar() a partir de una entrada de la
+        caché y restaura el estado del último análisis (posiciones, índice de
+        líneas, comentarios y tabla de nombres), de modo que reanalizar()
+        funciona igual que tras un análisis normal.
 
         Args:
-            tokens (list): Lista de tokens
+            codigo (str): El código fuente
+            datos (bytes): Contenido de la entrada
+            compacto (bool): Si es True devuelve un TokenBuffer
 
         Returns:
-            dict: Diccionario con el conteo de tokens por tipo y valor
+            list o TokenBuffer: Tokens, o None si la entrada no es válida
         """
-        conteo_tokens = {}
-        for tipo, valor, _ in tokens:
-            # Agrupar todos los operadores en una sola categoría para el resumen
-            if tipo in [
-                "ASIGNACION",
-                "OPERADOR",
-                "COMPARACION",
-                "MENORQUE",
-                "MAYORQUE",
-            ]:
-                tipo_resumen = "Operador"
-            elif tipo in [
-                "PARENTESIS_IZQ",
-                "PARENTESIS_DER",
-                "LLAVE_IZQ",
-                "LLAVE_DER",
-                "PUNTOYCOMA",
-                "COMA",
-                "PUNTO",
-            ]:
-                tipo_resumen = "Signo"
-            elif tipo == "PALABRA_RESERVADA":
-                tipo_resumen = "Palabra Reservada"
-            elif tipo == "IDENTIFICADOR":
-                tipo_resumen = "Identificador"
-            elif tipo == "NUMERO_ENTERO":
-                tipo_resumen = "Numero Entero"
-            elif tipo == "NUMERO_DECIMAL":
-                tipo_resumen = "Numero Decimal"
-            elif tipo in ["CADENA_SIMPLE", "CADENA_DOBLE"]:
-                tipo_resumen = "Cadena"
+        cabecera = self._CABECERA_CACHE
+        if len(datos) < cabecera.size:
+            return None
+        marca, cantidad, cantidad_comentarios, tamano_nombres = cabecera.unpack_from(datos)
+
+        buffer = TokenBuffer(codigo)
+        comentarios = array("I")
+        arreglos = (
+            (buffer.tipos, cantidad),
+            (buffer.inicios, cantidad),
+            (buffer.fines, cantidad),
+            (buffer.lineas, cantidad),
+            (buffer.ids_nombres, cantidad),
+            (comentarios, 2 * cantidad_comentarios),
+        )
+        posicion = cabecera.size
+        for arreglo, elementos in arreglos:
+            posicion += elementos * arreglo.itemsize
+        if marca != self._MARCA_CACHE or posicion + tamano_nombres != len(datos):
+            return None
+
+        posicion = cabecera.size
+        for arreglo, elementos in arreglos:
+            fin = posicion + elementos * arreglo.itemsize
+            arreglo.frombytes(datos[posicion:fin])
+            posicion = fin
+
+        tabla = TablaNombres()
+        if tamano_nombres:
+            nuevos = datos[posicion:].decode("utf-8", "surrogatepass").split("\n")
+            primero = len(tabla.nombres)
+            tabla.ids.update(zip(nuevos, range(primero, primero + len(nuevos))))
+            tabla.nombres.extend(nuevos)
+        buffer.tabla_nombres = tabla
+
+        self.indice_lineas = IndiceLineas(codigo)
+        self.comentarios = list(zip(comentarios[::2], comentarios[1::2]))
+        self.tabla_nombres = tabla
+        self.ids_nombres = buffer.ids_nombres
+
+        if compacto:
+            self.posiciones = []
+            return buffer
+
+        self.posiciones = list(zip(buffer.inicios, buffer.fines))
+        visibles = TipoToken.VISIBLES
+        nombres = tabla.nombres
+        codigo_error = TipoToken.ERROR
+        codigo_comentario = TipoToken.COMENTARIO_SIN_CERRAR
+        codigo_cadena = TipoToken.CADENA_SIN_CERRAR
+        hubo_sin_cerrar = False
+        tokens = ListaTokens(
+            tipos=buffer.tipos, tabla_nombres=tabla, ids_nombres=buffer.ids_nombres
+        )
+        agregar = tokens.append
+        for tipo, inicio, fin, linea, id_nombre in zip(
+            buffer.tipos, buffer.inicios, buffer.fines, buffer.lineas, buffer.ids_nombres
+        ):
+            if id_nombre >= 0:
+                agregar((visibles[tipo], nombres[id_nombre], linea))
+            elif tipo == codigo_error:
+                agregar(("ERROR", f"Token inesperado '{codigo[inicio:fin]}'", linea))
+            elif tipo == codigo_comentario:
+                agregar(self._error_comentario_sin_cerrar(linea))
+                hubo_sin_cerrar = True
+            elif tipo == codigo_cadena:
+                agregar(self._error_cadena_sin_cerrar(codigo[inicio], linea))
+                hubo_sin_cerrar = True
             else:
-                tipo_resumen = tipo
+                agregar((visibles[tipo], codigo[inicio:fin], linea))
+        if not hubo_sin_cerrar:
+            self.tokens = tokens
+        return tokens
+
+    def _recorrer(self, codigo, recuperar=False):
+        """
+        Recorre el código con el motor configurado (expresión maestra o
+        autómata) y entrega los tokens que no se ignoran, además de los
+        comentarios de bloque.
+
+        Args:
+            codigo (str): El código fuente a analizar
+            recuperar (bool): Si es True, un comentario sin cerrar termina al
+                final de su línea y el recorrido continúa (modo recuperación)
+
+        Returns:
+            iterator: Tuplas (tipo_token, inicio, fin)
+        """
+        if recuperar:
+            return self._recorrer_recuperando(codigo)
+        if self.automata is not None:
+            return self.automata.recorrer(codigo)
+        ignorados = self._IGNORADOS_RECORRIDO
+        return (
+            (mo.lastgroup, mo.start(), mo.end())
+            for mo in self.patron_maestro.finditer(codigo)
+            if mo.lastgroup not in ignorados
+        )
+
+    def _recorrer_recuperando(self, codigo):
+        """
+        Variante de _recorrer() para el modo recuperación.
+
+        Un comentario sin cerrar se corta al final de su línea. Como eso
+        implica que no hay ningún '*/' después de él, el resto del código se
+        recorre con la especificación sin cierre de comentarios: cada
+        comentario posterior termina al final de su línea sin buscar un cierre
+        hasta el final del código. Así el recorrido sigue siendo lineal aunque
+        haya muchos comentarios sin cerrar.
+
+        Args:
+            codigo (str): El código fuente a analizar
+
+        Yields:
+            tuple: (tipo_token, inicio, fin)
+        """
+        for tipo_token, inicio, fin in self._recorrer(codigo):
+            if tipo_token == "COMENTARIO_SIN_CERRAR":
+                salto = codigo.find("\n", inicio, fin)
+                if salto < 0:
+                    salto = fin
+                yield (tipo_token, inicio, salto)
+                yield from self._recorrer_sin_cierre(codigo, salto)
+                return
+            yield (tipo_token, inicio, fin)
+
+    def _recorrer_sin_cierre(self, codigo, inicio):
+        """
+        Recorre el código desde una posición con la especificación sin cierre
+        de comentarios (ver _recorrer_recuperando()).
+
+        Args:
+            codigo (str): El código fuente a analizar
+            inicio (int): Posición desde la que se recorre
+
+        Returns:
+            iterator: Tuplas (tipo_token, inicio, fin)
+        """
+        if self.patron_sin_cierre is None:
+            especificacion = self._especificacion_sin_cierre()
+            self.patron_sin_cierre = re.compile(
+                "|".join(
+                    "(?P<%s>%s)" % par for par in self._especificacion_re(especificacion)
+                )
+            )
+            if self.automata is not None:
+                self.automata_sin_cierre = AutomataLexico(
+                    especificacion, self._IGNORADOS_RECORRIDO
+                )
+
+        if self.automata_sin_cierre is not None:
+            return self.automata_sin_cierre.recorrer(codigo, inicio)
+        ignorados = self._IGNORADOS_RECORRIDO
+        return (
+            (mo.lastgroup, mo.start(), mo.end())
+            for mo in self.patron_sin_cierre.finditer(codigo, inicio)
+            if mo.lastgroup not in ignorados
+        )
+
+    @classmethod
+    def _especificacion_re(cls, especificacion=None):
+        """
+        Adapta una especificación para compilarla con re, reemplazando los
+        patrones que tienen una versión posesiva (ver _PATRONES_POSESIVOS).
+
+        Args:
+            especificacion (list): Lista de tuplas (nombre, patron); por
+                defecto TOKEN_ESPECIFICACION
+
+        Returns:
+            list: Lista de tuplas (nombre, patron)
+        """
+        if especificacion is None:
+            especificacion = cls.TOKEN_ESPECIFICACION
+        return [
+            (nombre, cls._PATRONES_POSESIVOS.get(nombre, patron))
+            for nombre, patron in especificacion
+        ]
+
+    @classmethod
+    def _especificacion_sin_cierre(cls):
+        """
+        Genera la especificación usada cuando ya no queda ningún '*/' en el
+        código: sin COMENTARIO_BLOQUE y con COMENTARIO_SIN_CERRAR limitado a
+        su línea.
+
+        Returns:
+            list: Lista de tuplas (nombre, patron)
+        """
+        especificacion = []
+        for nombre, patron in cls.TOKEN_ESPECIFICACION:
+            if nombre == "COMENTARIO_BLOQUE":
+                continue
+            if nombre == "COMENTARIO_SIN_CERRAR":
+                patron = cls._COMENTARIO_SIN_CIERRE
+            especificacion.append((nombre, patron))
+        return especificacion
+
+    def reanalizar(self, inicio_edicion, fin_edicion, texto_nuevo):
+        """
+        Actualiza los tokens del último análisis tras reemplazar
+        codigo[inicio_edicion:fin_edicion] por texto_nuevo.
+
+        Solo se vuelve a analizar desde el punto de control seguro más cercano
+        anterior a la edición hasta que la secuencia de tokens se
+        resincroniza; los tokens previos se conservan y los posteriores se
+        reutilizan desplazando su línea y su posición.
+
+        Los puntos de control son los inicios de línea que no quedan dentro de
+        un comentario de bloque: ningún otro token atraviesa un salto de línea
+        (las cadenas no pueden hacerlo), por lo que en esos puntos el análisis
+        no depende del texto anterior.
+
+        Si el último análisis terminó en un error de cadena o comentario sin
+        cerrar (o lo produce la edición), o se hizo en modo compacto, se
+        analiza el código completo.
+
+        Args:
+            inicio_edicion (int): Inicio del tramo reemplazado
+            fin_edicion (int): Fin del tramo reemplazado
+            texto_nuevo (str): Texto que reemplaza al tramo
+
+        Returns:
+            tuple: (tokens, (desde, hasta)) con la lista completa de tokens del
+                código editado y el rango tokens[desde:hasta] de tokens que se
+                volvieron a generar
+        """
+        if self.codigo is None:
+            raise ValueError("No hay un análisis previo para reanalizar")
+        if not 0 <= inicio_edicion <= fin_edicion <= len(self.codigo):
+            raise ValueError(
+                f"Rango de edición inválido: {inicio_edicion}-{fin_edicion}"
+            )
+
+        codigo_anterior = self.codigo
+        codigo = (
+            codigo_anterior[:inicio_edicion] + texto_nuevo + codigo_anterior[fin_edicion:]
+        )
+        if self.tokens is None:
+            tokens = self.analizar(codigo)
+            return tokens, (0, len(tokens))
+
+        desplazamiento = len(texto_nuevo) - (fin_edicion - inicio_edicion)
+        fin_edicion_nuevo = inicio_edicion + len(texto_nuevo)
+        indice = self.indice_lineas
+        comentarios = self.comentarios
+
+        # Retroceder hasta un inicio de línea que no esté dentro de un comentario
+        inicio = indice.inicios[indice.linea(inicio_edicion) - 1]
+        comentario = self._comentario_en(inicio)
+        while comentario is not None:
+            inicio = indice.inicios[indice.linea(comentario[0]) - 1]
+            comentario = self._comentario_en(inicio)
+
+        # Volver a analizar desde el punto de control hasta resincronizar
+        linea = indice.linea(inicio)
+        tabla = self.tabla_nombres
+        nuevos = []
+        nuevas_posiciones = []
+        nuevos_ids = array("i")
+        nuevos_comentarios = []
+        resincronizacion = None
+        for mo in self.patron_maestro.finditer(codigo, inicio):
+            tipo_token = mo.lastgroup
+            inicio_token, fin_token = mo.span()
+
+            if tipo_token == "NUEVALINEA":
+                linea += 1
+                # Pasada la edición, un inicio de línea que también era punto
+                # de control en el código anterior resincroniza el análisis
+                if inicio_token >= fin_edicion_nuevo and (
+                    self._comentario_en(fin_token - desplazamiento) is None
+                ):
+                    resincronizacion = fin_token
+                    break
+                continue
+            if tipo_token in ("ESPACIO", "COMENTARIO_LINEA"):
+                continue
+            if tipo_token == "COMENTARIO_BLOQUE":
+                nuevos_comentarios.append((inicio_token, fin_token))
+                linea += codigo.count("\n", inicio_token, fin_token)
+                continue
+            if tipo_token in ("COMENTARIO_SIN_CERRAR", "CADENA_SIN_CERRAR"):
+                # El error es global: se resuelve con el análisis completo
+                tokens = self.analizar(codigo)
+                return tokens, (0, len(tokens))
+
+            valor = mo.group()
+            id_nombre = -1
+            if tipo_token == "ERROR":
+                valor = f"Token inesperado '{valor}'"
+            elif tipo_token == "IDENTIFICADOR":
+                if tabla is not None:
+                    id_nombre = tabla.agregar(valor)
+                    valor = tabla.nombres[id_nombre]
+                if valor in self.PALABRAS_RESERVADAS:
+                    tipo_token = "PALABRA_RESERVADA"
+            nuevos.append((tipo_token, valor, linea))
+            nuevas_posiciones.append((inicio_token, fin_token))
+            nuevos_ids.append(id_nombre)
 
-            # Contar por valor de token
-            if (valor, tipo_resumen) in conteo_tokens:
-                conteo_tokens[(valor, tipo_resumen)] += 1
+        # Tokens anteriores al punto de control (sin cambios)
+        desde = bisect_left(self.posiciones, (inicio,))
+        tokens = self.tokens[:desde]
+        posiciones = self.posiciones[:desde]
+        ids = self.ids_nombres[:desde] if tabla is not None else None
+        comentarios_actualizados = comentarios[: bisect_left(comentarios, (inicio,))]
+        tokens.extend(nuevos)
+        posiciones.extend(nuevas_posiciones)
+        if ids is not None:
+            ids.extend(nuevos_ids)
+        comentarios_actualizados.extend(nuevos_comentarios)
+        hasta = len(tokens)
+
+        # Tokens posteriores a la resincronización (desplazados)
+        if resincronizacion is not None:
+            anterior = resincronizacion - desplazamiento
+            diferencia_lineas = linea - indice.linea(anterior)
+            reutilizados = bisect_left(self.posiciones, (anterior,))
+            if ids is not None:
+                ids.extend(self.ids_nombres[reutilizados:])
+            if diferencia_lineas:
+                tokens.extend(
+                    (tipo, valor, linea_token + diferencia_lineas)
+                    for tipo, valor, linea_token in self.tokens[reutilizados:]
+                )
+            else:
+                tokens.extend(self.tokens[reutilizados:])
+            if desplazamiento:
+                posiciones.extend(
+                    (inicio_token + desplazamiento, fin_token + desplazamiento)
+                    for inicio_token, fin_token in self.posiciones[reutilizados:]
+                )
+                comentarios_actualizados.extend(
+                    (inicio_token + desplazamiento, fin_token + desplazamiento)
+                    for inicio_token, fin_token in comentarios[
+                        bisect_left(comentarios, (anterior,)) :
+                    ]
+                )
             else:
-                conteo_tokens[(valor, tipo_resumen)] = 1
+                posiciones.extend(self.posiciones[reutilizados:])
+                comentarios_actualizados.extend(
+                    comentarios[bisect_left(comentarios, (anterior,)) :]
+                )
+
+        indice.reemplazar(inicio_edicion, fin_edicion, texto_nuevo)
+        self.codigo = codigo
+        self.tokens = tokens
+        self.posiciones = posiciones
+        self.ids_nombres = ids
+        self.comentarios = comentarios_actualizados
+        return tokens, (desde, hasta)
+
+    def _comentario_en(self, posicion):
+        """
+        Busca el comentario de bloque del último análisis que contiene una
+        posición (sin contar sus extremos).
+
+        Args:
+            posicion (int): Desplazamiento dentro del código
+
+        Returns:
+            tuple: (inicio, fin) del comentario, o None si no hay ninguno
+        """
+        indice = bisect_left(self.comentarios, (posicion,)) - 1
+        if indice >= 0:
+            inicio, fin = self.comentarios[indice]
+            if inicio < posicion < fin:
+                return self.comentarios[indice]
+        return None
+
+    def analizar_paralelo(self, codigo, procesos=None, resumen=None):
+        """
+        Analiza un código grande repartiéndolo entre varios procesos.
+
+        Primero se localizan los comentarios y las cadenas del código y se
+        divide en inicios de línea que no quedan dentro de un comentario de
+        bloque (ningún otro token atraviesa un salto de línea). Cada fragmento
+        se analiza en un ProcessPoolExecutor y los resultados se unen con sus
+        números de línea y posiciones corregidos, por lo que el resultado es
+        idéntico al de analizar().
+
+        Si el código es pequeño, se pide un solo proceso o contiene una cadena
+        o un comentario sin cerrar (cuyo error es global), se analiza de forma
+        secuencial.
+
+        Args:
+            codigo (str): El código fuente a analizar
+            procesos (int): Cantidad de procesos (por defecto, uno por núcleo)
+            resumen (ResumenTokens): Si se indica, se le suman los tokens; cada
+                proceso resume sus fragmentos y los resúmenes se combinan
+
+        Returns:
+            list: Lista de tuplas (tipo_token, valor, numero_linea)
+        """
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        if procesos <= 1 or len(codigo) < self._TAMANO_MINIMO_PARALELO:
+            return self.analizar(codigo, resumen=resumen)
+
+        puntos = self._puntos_division(codigo, procesos * self._FRAGMENTOS_POR_PROCESO)
+        if puntos is None:
+            return self.analizar(codigo, resumen=resumen)
+
+        # Línea inicial de cada fragmento
+        fragmentos = []
+        linea = 1
+        anterior = 0
+        for inicio, fin in zip(puntos, puntos[1:]):
+            linea += codigo.count("\n", anterior, inicio)
+            anterior = inicio
+            fragmentos.append((codigo[inicio:fin], inicio, linea))
+
+        tokens = []
+        posiciones = []
+        comentarios = []
+        opciones = [(self.automata is not None, resumen is not None)] * len(fragmentos)
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            for resultado in ejecutor.map(_analizar_fragmento, fragmentos, opciones):
+                tokens.extend(resultado[0])
+                posiciones.extend(resultado[1])
+                comentarios.extend(resultado[2])
+                if resumen is not None:
+                    resumen.combinar(resultado[3])
+
+        self.codigo = codigo
+        self.tokens = tokens
+        self.posiciones = posiciones
+        self.comentarios = comentarios
+        self.indice_lineas = IndiceLineas(codigo)
+        # Cada proceso usa su propia tabla de nombres: no se unifican
+        self.tabla_nombres = None
+        self.ids_nombres = None
+        return tokens
 
-        return conteo_tokens
+    def _puntos_division(self, codigo, cantidad):
+        """
+        Elige los puntos donde dividir el código para el análisis paralelo:
+        inicios de línea que no quedan dentro de un comentario de bloque.
+
+        Args:
+            codigo (str): El código fuente
+            cantidad (int): Cantidad aproximada de fragmentos deseada
+
+        Returns:
+            list: Puntos de división crecientes (el primero es 0 y el último
+                len(codigo)), o None si hay una cadena o un comentario sin cerrar
+        """
+        comentarios = []
+        for mo in self.patron_division.finditer(codigo):
+            tipo_token = mo.lastgroup
+            if tipo_token == "COMENTARIO_BLOQUE":
+                comentarios.append(mo.span())
+            elif tipo_token in ("COMENTARIO_SIN_CERRAR", "CADENA_SIN_CERRAR"):
+                return None
+
+        puntos = [0]
+        tamano = len(codigo) // cantidad
+        for numero in range(1, cantidad):
+            punto = codigo.find("\n", max(numero * tamano, puntos[-1])) + 1
+            while punto:
+                # Si el salto de línea está dentro de un comentario, seguir
+                # después del comentario
+                indice = bisect_left(comentarios, (punto,)) - 1
+                if indice < 0 or comentarios[indice][1] <= punto:
+                    break
+                punto = codigo.find("\n", comentarios[indice][1]) + 1
+            if not punto:
+                break
+            if punto > puntos[-1]:
+                puntos.append(punto)
+        if puntos[-1] != len(codigo):
+            puntos.append(len(codigo))
+        return puntos
+
+    def analizar_stream(self, fuente, tamano_bloque=65536):
+        """
+        Analiza el código leyendo un objeto archivo por bloques de tamaño fijo.
+        Los tokens se entregan a medida que se reconocen, por lo que la memoria
+        usada depende del tamaño del bloque (y del token o comentario más largo)
+        y no del tamaño total del archivo.
+
+        Los tokens, comentarios y cadenas que quedan partidos entre dos bloques
+        se completan leyendo el siguiente bloque antes de decidir el token.
+
+        Si aparece una cadena o un comentario sin cerrar, se entrega el mismo
+        token ERROR que devolvería analizar() y el recorrido termina.
+
+        Args:
+            fuente: Objeto con método read(n) que devuelve str (archivo de texto)
+            tamano_bloque (int): Cantidad de caracteres a leer en cada bloque
+
+        Yields:
+            tuple: Tokens (tipo_token, valor, numero_linea)
+        """
+        patron = self.patron_maestro
+        ignorados = self.TOKENS_IGNORADOS
+        reservadas = self.PALABRAS_RESERVADAS
+
+        buffer = ""
+        pos = 0  # Posición de análisis dentro del buffer
+        linea = 1  # Línea correspondiente a pos_linea
+        pos_linea = 0  # Posición hasta donde se contaron los saltos de línea
+        fin_archivo = False
+        error_cadena = None
+
+        while True:
+            # Leer otro bloque si lo pendiente no alcanza para decidir el token
+            if not fin_archivo and len(buffer) - pos < self._MARGEN_STREAM:
+                linea += buffer.count("\n", pos_linea, pos)
+                buffer, fin_archivo = self._leer_bloque(
+                    fuente, buffer[pos:], tamano_bloque
+                )
+                pos = pos_linea = 0
+
+            mo = patron.match(buffer, pos)
+            if mo is None:
+                break
+
+            fin = mo.end()
+            tipo_token = mo.lastgroup
+            if not fin_archivo and (
+                fin + self._MARGEN_STREAM > len(buffer)
+                or tipo_token == "COMENTARIO_SIN_CERRAR"
+            ):
+                # El token podría continuar en el siguiente bloque
+                linea += buffer.count("\n", pos_linea, pos)
+                buffer, fin_archivo = self._leer_bloque(
+                    fuente, buffer[pos:], tamano_bloque
+                )
+                pos = pos_linea = 0
+                continue
+
+            pos = fin
+            if tipo_token in ignorados:
+                continue
+
+            inicio = mo.start()
+            linea += buffer.count("\n", pos_linea, inicio)
+            pos_linea = inicio
+
+            if tipo_token == "COMENTARIO_SIN_CERRAR":
+                yield self._error_comentario_sin_cerrar(linea)
+                return
+            if error_cadena is not None:
+                # Tras una cadena sin cerrar solo interesa un comentario sin cerrar
+                continue
+
+            valor = mo.group()
+            if tipo_token == "ERROR":
+                yield ("ERROR", f"Token inesperado '{valor}'", linea)
+            elif tipo_token == "CADENA_SIN_CERRAR":
+                error_cadena = self._error_cadena_sin_cerrar(valor[0], linea)
+            else:
+                if tipo_token == "IDENTIFICADOR" and valor in reservadas:
+                    tipo_token = "PALABRA_RESERVADA"
+                yield (tipo_token, valor, linea)
+
+        if error_cadena is not None:
+            yield error_cadena
+
+    def analizar_bytes(self, datos, codificacion="utf-8"):
+        """
+        Analiza código en bytes sin decodificarlo completo. Los tokens se
+        reconocen con la versión en bytes de TOKEN_ESPECIFICACION: fuera de
+        las cadenas el lenguaje es ASCII, así que solo se decodifican los
+        literales de cadena (y los caracteres no reconocidos, para el mensaje
+        de error). Permite analizar un archivo leído una sola vez en modo
+        binario, sin probar distintas codificaciones sobre el archivo completo.
+
+        Una cadena o un carácter que no es texto válido en la codificación se
+        reporta como token ERROR y el análisis continúa. Para código válido el
+        resultado es el mismo que el de analizar() sobre el texto decodificado
+        (solo se reconocen dígitos ASCII, igual que en analizar_mmap()).
+
+        Args:
+            datos (bytes): El código fuente a analizar
+            codificacion (str): Codificación de las cadenas
+
+        Returns:
+            list: Lista de tuplas (tipo_token, valor, numero_linea)
+
+        Como analizar(), deja en self.posiciones los desplazamientos (en bytes)
+        de cada token, en self.indice_lineas el índice de líneas de los datos y
+        en self.tabla_nombres/self.ids_nombres los nombres reconocidos.
+        reanalizar() requiere un análisis previo sobre str.
+        """
+        self.codigo = None
+        self.tokens = None
+        self.comentarios = []
+
+        tokens = []
+        posiciones = []
+        self.posiciones = posiciones
+
+        tabla = TablaNombres()
+        ids = array("i")
+        self.tabla_nombres = tabla
+        self.ids_nombres = ids
+        cantidad_reservadas = tabla.CANTIDAD_RESERVADAS
+
+        indice = IndiceLineas(datos)
+        self.indice_lineas = indice
+        linea_de = indice.linea
+
+        ignorados = self.TOKENS_IGNORADOS
+        cadenas = ("CADENA_SIMPLE", "CADENA_DOBLE")
+        iterador = self.patron_maestro_bytes.finditer(datos)
+        error_cadena = None
+        for mo in iterador:
+            tipo_token = mo.lastgroup
+            if tipo_token in ignorados:
+                continue
+
+            inicio, fin = mo.span()
+            linea_num = linea_de(inicio)
+            if tipo_token == "COMENTARIO_SIN_CERRAR":
+                self.posiciones = [(inicio, fin)]
+                self.ids_nombres = array("i", [-1])
+                return [self._error_comentario_sin_cerrar(linea_num)]
+            elif tipo_token == "CADENA_SIN_CERRAR":
+                error_cadena = (
+                    self._error_cadena_sin_cerrar(chr(datos[inicio]), linea_num),
+                    (inicio, fin),
+                )
+                break
+
+            id_nombre = -1
+            fragmento = datos[inicio:fin]
+            if tipo_token == "IDENTIFICADOR":
+                id_nombre = tabla.agregar(fragmento.decode("ascii"))
+                if id_nombre < cantidad_reservadas:
+                    tipo_token = "PALABRA_RESERVADA"
+                token = (tipo_token, tabla.nombres[id_nombre], linea_num)
+            elif tipo_token in cadenas or tipo_token == "ERROR":
+                try:
+                    valor = fragmento.decode(codificacion)
+                except UnicodeDecodeError:
+                    texto = fragmento.decode(codificacion, "backslashreplace")
+                    if tipo_token == "ERROR":
+                        texto = f"'{texto}'"
+                    token = (
+                        "ERROR",
+                        self.MENSAJE_CODIFICACION_INVALIDA.format(codificacion, texto),
+                        linea_num,
+                    )
+                else:
+                    if tipo_token == "ERROR":
+                        valor = f"Token inesperado '{valor}'"
+                    token = (tipo_token, valor, linea_num)
+            else:
+                token = (tipo_token, fragmento.decode("ascii"), linea_num)
+            tokens.append(token)
+            ids.append(id_nombre)
+            posiciones.append((inicio, fin))
+
+        if error_cadena is None:
+            return tokens
+
+        self.ids_nombres = array("i", [-1])
+
+        # Un comentario sin cerrar posterior tiene prioridad sobre la cadena
+        for mo in iterador:
+            if mo.lastgroup == "COMENTARIO_SIN_CERRAR":
+                self.posiciones = [mo.span()]
+                return [self._error_comentario_sin_cerrar(linea_de(mo.start()))]
+
+        self.posiciones = [error_cadena[1]]
+        return [error_cadena[0]]
+
+    def analizar_mmap(self, ruta, codificacion="utf-8"):
+        """
+        Analiza un archivo mapeándolo en memoria (mmap), sin leerlo a un str.
+        El reconocimiento se hace directamente sobre los bytes del archivo y
+        los tokens se entregan de forma perezosa como TokenPerezoso, cuyo valor
+        solo se decodifica al consultarlo. Así, las páginas del archivo que se
+        cargan y la memoria usada dependen de los tokens que se consumen.
+
+        Solo se reconocen dígitos ASCII, igual que el resto del lenguaje.
+
+        Args:
+            ruta (str): Ruta del archivo a analizar
+            codificacion (str): Codificación para decodificar los valores
+
+        Yields:
+            TokenPerezoso: Tokens equivalentes a (tipo_token, valor, numero_linea)
+        """
+        with open(ruta, "rb") as archivo:
+            try:
+                datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Un archivo vacío no se puede mapear y no tiene tokens
+                return
+
+        yield from self._analizar_buffer(datos, codificacion)
+
+    def _analizar_buffer(self, datos, codificacion):
+        """
+        Reconoce tokens sobre un buffer de bytes con la versión en bytes de
+        TOKEN_ESPECIFICACION. Sigue las mismas reglas que analizar_stream().
+
+        Args:
+            datos: Buffer de bytes (bytes o mmap)
+            codificacion (str): Codificación de los valores
+
+        Yields:
+            TokenPerezoso: Tokens reconocidos
+        """
+        reservadas = self._PALABRAS_RESERVADAS_BYTES
+        linea = 1
+        error_cadena = None
+
+        for mo in self.patron_maestro_bytes.finditer(datos):
+            tipo_token = mo.lastgroup
+
+            if tipo_token == "NUEVALINEA":
+                linea += 1
+                continue
+            elif tipo_token == "ESPACIO" or tipo_token == "COMENTARIO_LINEA":
+                continue
+            elif tipo_token == "COMENTARIO_BLOQUE":
+                # Único token (junto con el espacio) que puede contener saltos
+                linea += datos[mo.start() : mo.end()].count(b"\n")
+                continue
+            elif tipo_token == "COMENTARIO_SIN_CERRAR":
+                yield self._token_error(self._error_comentario_sin_cerrar(linea))
+                return
+            elif error_cadena is not None:
+                # Tras una cadena sin cerrar solo interesa un comentario sin cerrar
+                continue
+            elif tipo_token == "CADENA_SIN_CERRAR":
+                comilla = chr(datos[mo.start()])
+                error_cadena = self._error_cadena_sin_cerrar(comilla, linea)
+                continue
+
+            inicio, fin = mo.span()
+            if tipo_token == "IDENTIFICADOR" and datos[inicio:fin] in reservadas:
+                tipo_token = "PALABRA_RESERVADA"
+            yield TokenPerezoso(datos, codificacion, tipo_token, inicio, fin, linea)
+
+        if error_cadena is not None:
+            yield self._token_error(error_cadena)
+
+    def _token_error(self, error):
+        """
+        Convierte una tupla de error en un TokenPerezoso con el valor ya resuelto.
+
+        Args:
+            error (tuple): Token de error (tipo, mensaje, linea)
+
+        Returns:
+            TokenPerezoso: Token equivalente
+        """
+        token = TokenPerezoso(b"", "ascii", error[0], 0, 0, error[2])
+        token._valor = error[1]
+        return token
+
+    @classmethod
+    def _especificacion_bytes(cls):
+        """
+        Genera la versión en bytes de TOKEN_ESPECIFICACION.
+
+        Returns:
+            list: Lista de tuplas (nombre, patron_en_bytes)
+        """
+        especificacion = []
+        for nombre, patron in cls._especificacion_re():
+            if nombre == "ERROR":
+                especificacion.append((nombre, cls._ERROR_BYTES))
+            else:
+                especificacion.append((nombre, patron.encode("ascii")))
+        return especificacion
+
+    def _leer_bloque(self, fuente, pendiente, tamano_bloque):
+        """
+        Agrega el siguiente bloque de la fuente al texto pendiente de analizar.
+        Si el token pendiente es más largo que un bloque, la lectura crece en
+        proporción a él para que el costo total siga siendo lineal.
+
+        Args:
+            fuente: Objeto con método read(n)
+            pendiente (str): Texto aún no analizado
+            tamano_bloque (int): Tamaño mínimo de lectura
+
+        Returns:
+            tuple: (buffer, fin_archivo)
+        """
+        bloque = fuente.read(max(tamano_bloque, len(pendiente)))
+        return (pendiente + bloque, not bloque)
+
+    def _error_comentario_sin_cerrar(self, linea_num):
+        """
+        Construye el token de error para un comentario de bloque sin cerrar.
+
+        Args:
+            linea_num (int): Línea donde se abrió el comentario
+
+        Returns:
+            tuple: Token de error (tipo, mensaje, linea)
+        """
+        return ("ERROR", self.MENSAJE_COMENTARIO_SIN_CERRAR, linea_num)
+
+    def _error_cadena_sin_cerrar(self, comilla_tipo, linea_num):
+        """
+        Construye el token de error para una cadena sin cerrar.
+
+        Args:
+            comilla_tipo (str): Comilla con la que se abrió la cadena
+            linea_num (int): Línea donde se abrió la cadena
+
+        Returns:
+            tuple: Token de error (tipo, mensaje, linea)
+        """
+        return ("ERROR", self.MENSAJE_CADENA_SIN_CERRAR.format(comilla_tipo), linea_num)
+
+    def obtener_errores(self, tokens):
+        """
+        Filtra solo los tokens de error de la lista de tokens.
+
+        Args:
+            tokens (list): Lista de tokens
+
+        Returns:
+            list: Lista de tokens de error
+        """
+        return [t for t in tokens if t[0] == "ERROR"]
+
+    def generar_resumen_tokens(self, tokens):
+        """
+        Genera un resumen de los tokens agrupados por tipo.
+
+        Args:
+            tokens (list): Lista de tokens
+
+        Returns:
+            dict: Diccionario con el conteo de tokens por tipo y valor
+        """
+        resumen = ResumenTokens()
+        resumen.agregar_tokens(tokens)
+        return resumen.como_diccionario()
+
+
+class TipoToken:
+    """
+    Registro de los tipos de token como enteros pequeños, compartido por el
+    analizador léxico, el sintáctico y la interfaz. Se genera a partir de
+    AnalizadorLexico.TOKEN_ESPECIFICACION y agrega un tipo propio para cada
+    palabra reservada, de modo que el parser compara enteros en lugar de
+    cadenas. Cada tipo queda accesible como atributo: TipoToken.IDENTIFICADOR,
+    TipoToken.LLAVE_IZQ, TipoToken.SI, TipoToken.ENTERO, etc.
+    """
+
+    # Código -> nombre interno del tipo
+    NOMBRES = [nombre for nombre, _ in AnalizadorLexico.TOKEN_ESPECIFICACION] + [
+        palabra.upper() for palabra in sorted(AnalizadorLexico.PALABRAS_RESERVADAS)
+    ]
+
+    # Nombre interno -> código
+    CODIGOS = dict(zip(NOMBRES, range(len(NOMBRES))))
+
+    # Palabra reservada -> código de su tipo (van después de los de la especificación)
+    PALABRAS = dict(
+        zip(
+            sorted(AnalizadorLexico.PALABRAS_RESERVADAS),
+            range(len(AnalizadorLexico.TOKEN_ESPECIFICACION), len(NOMBRES)),
+        )
+    )
+
+    # Códigos de todas las palabras reservadas
+    RESERVADAS = frozenset(PALABRAS.values())
+
+    # Código -> tipo visible en las tuplas (tipo, valor, linea): las palabras
+    # reservadas se muestran como PALABRA_RESERVADA y los errores de cadena o
+    # comentario sin cerrar como ERROR
+    VISIBLES = [
+        "PALABRA_RESERVADA"
+        if nombre.lower() in AnalizadorLexico.PALABRAS_RESERVADAS
+        else "ERROR"
+        if nombre.endswith("_SIN_CERRAR")
+        else nombre
+        for nombre in NOMBRES
+    ]
+
+    @classmethod
+    def codigo(cls, token):
+        """
+        Obtiene el código de tipo de un token en forma de tupla.
+
+        Args:
+            token (tuple): Token (tipo_token, valor, numero_linea)
+
+        Returns:
+            int: Código del tipo de token
+        """
+        if token[0] == "PALABRA_RESERVADA":
+            return cls.PALABRAS[token[1]]
+        return cls.CODIGOS.get(token[0], cls.CODIGOS["ERROR"])
+
+
+for _codigo, _nombre in enumerate(TipoToken.NOMBRES):
+    setattr(TipoToken, _nombre, _codigo)
+
+
+class TablaNombres:
+    """
+    Tabla de nombres de un análisis: asigna un id entero a cada identificador
+    o palabra reservada distinto y conserva una única copia de su texto, de
+    modo que las comparaciones y búsquedas de nombres se hacen con enteros.
+
+    Las palabras reservadas ocupan los primeros ids, en el mismo orden que sus
+    códigos en TipoToken.
+    """
+
+    RESERVADAS = sorted(AnalizadorLexico.PALABRAS_RESERVADAS)
+    CANTIDAD_RESERVADAS = len(RESERVADAS)
+
+    def __init__(self):
+        """
+        Inicializa la tabla con las palabras reservadas.
+        """
+        self.nombres = list(self.RESERVADAS)  # id -> nombre
+        self.ids = {nombre: i for i, nombre in enumerate(self.nombres)}  # nombre -> id
+
+    def agregar(self, nombre):
+        """
+        Obtiene el id de un nombre, registrándolo si es nuevo.
+
+        Args:
+            nombre (str): Identificador o palabra reservada
+
+        Returns:
+            int: Id del nombre
+        """
+        id_nombre = self.ids.get(nombre)
+        if id_nombre is None:
+            id_nombre = len(self.nombres)
+            self.nombres.append(nombre)
+            self.ids[nombre] = id_nombre
+        return id_nombre
+
+    def nombre(self, id_nombre):
+        """
+        Obtiene el texto de un nombre a partir de su id.
+
+        Args:
+            id_nombre (int): Id del nombre
+
+        Returns:
+            str: Nombre
+        """
+        return self.nombres[id_nombre]
+
+    def es_reservada(self, id_nombre):
+        """
+        Indica si un id corresponde a una palabra reservada.
+
+        Args:
+            id_nombre (int): Id del nombre
+
+        Returns:
+            bool: True si es una palabra reservada
+        """
+        return 0 <= id_nombre < self.CANTIDAD_RESERVADAS
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return nombre in self.ids
+
+
+class ListaTokens(list):
+    """
+    Lista de tuplas (tipo, valor, linea) que devuelve AnalizadorLexico.analizar()
+    en modo lista. Es una lista común y además lleva lo que el analizador
+    léxico ya conoce de cada token al generarlo: su código TipoToken (tipos)
+    y, como un TokenBuffer, la tabla de nombres del análisis y el id de
+    nombre de cada token (tabla_nombres e ids_nombres). Así el analizador
+    sintáctico no tiene que volver a calcularlos.
+    """
+
+    __slots__ = ("tipos", "tabla_nombres", "ids_nombres")
+
+    def __init__(self, tokens=(), tipos=None, tabla_nombres=None, ids_nombres=None):
+        """
+        Inicializa la lista.
+
+        Args:
+            tokens: Tuplas (tipo, valor, linea)
+            tipos (array): Código TipoToken de cada token
+            tabla_nombres (TablaNombres): Tabla de nombres del análisis
+            ids_nombres (array): Id de nombre de cada token, -1 si no es un nombre
+        """
+        super().__init__(tokens)
+        self.tipos = tipos if tipos is not None else array("B")
+        self.tabla_nombres = tabla_nombres
+        self.ids_nombres = ids_nombres
+
+
+class TokenBuffer:
+    """
+    Almacén compacto de tokens organizado como estructura de arreglos.
+    Cada token ocupa un código de tipo en array('B') y su inicio, fin y línea
+    en arreglos array('I'); el valor no se copia, se obtiene al consultarlo
+    como una porción del código fuente.
+
+    Se comporta como una secuencia de tuplas (tipo, valor, linea), por lo que
+    puede usarse en lugar de la lista que devuelve AnalizadorLexico.analizar().
+
+    Si se asigna una TablaNombres, ids_nombres guarda el id de nombre de cada
+    token (-1 si no es un nombre) y el valor de los nombres se toma de la tabla.
+    """
+
+    def __init__(self, fuente):
+        """
+        Inicializa un buffer vacío.
+
+        Args:
+            fuente: Código fuente sobre el que se tomaron los desplazamientos
+                (str, bytes o mmap)
+        """
+        self.fuente = fuente
+        self.tipos = array("B")
+        self.inicios = array("I")
+        self.fines = array("I")
+        self.lineas = array("I")
+        self.ids_nombres = array("i")
+        self.tabla_nombres = None
+
+    @classmethod
+    def con_token(cls, fuente, tipo, inicio, fin, linea):
+        """
+        Crea un buffer con un único token (usado para los errores que detienen
+        el análisis léxico).
+
+        Args:
+            fuente: Código fuente
+            tipo (int): Código del tipo de token
+            inicio (int): Desplazamiento inicial
+            fin (int): Desplazamiento final
+            linea (int): Número de línea
+
+        Returns:
+            TokenBuffer: Buffer con el token
+        """
+        buffer = cls(fuente)
+        buffer.agregar(tipo, inicio, fin, linea)
+        return buffer
+
+    def agregar(self, tipo, inicio, fin, linea):
+        """
+        Agrega un token al final del buffer.
+
+        Args:
+            tipo (int): Código del tipo de token (TipoToken)
+            inicio (int): Desplazamiento inicial
+            fin (int): Desplazamiento final
+            linea (int): Número de línea
+        """
+        self.tipos.append(tipo)
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+        self.lineas.append(linea)
+        self.ids_nombres.append(-1)
+
+    def tipo(self, indice):
+        """
+        Obtiene el nombre del tipo de un token.
+
+        Args:
+            indice (int): Posición del token
+
+        Returns:
+            str: Tipo de token
+        """
+        return TipoToken.VISIBLES[self.tipos[indice]]
+
+    def valor(self, indice):
+        """
+        Obtiene el valor de un token a partir del código fuente.
+
+        Args:
+            indice (int): Posición del token
+
+        Returns:
+            str: Valor del token (o mensaje, si es un token de error)
+        """
+        if self.tabla_nombres is not None and self.ids_nombres[indice] >= 0:
+            return self.tabla_nombres.nombres[self.ids_nombres[indice]]
+
+        texto = self.fuente[self.inicios[indice] : self.fines[indice]]
+        if not isinstance(texto, str):
+            texto = texto.decode("utf-8", "replace")
+
+        nombre = TipoToken.NOMBRES[self.tipos[indice]]
+        if nombre == "ERROR":
+            return f"Token inesperado '{texto}'"
+        elif nombre == "COMENTARIO_SIN_CERRAR":
+            return AnalizadorLexico.MENSAJE_COMENTARIO_SIN_CERRAR
+        elif nombre == "CADENA_SIN_CERRAR":
+            return AnalizadorLexico.MENSAJE_CADENA_SIN_CERRAR.format(texto[0])
+        return texto
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self.tipos)))]
+        return (TipoToken.VISIBLES[self.tipos[indice]], self.valor(indice), self.lineas[indice])
+
+    def __iter__(self):
+        nombres = TipoToken.VISIBLES
+        for i, (tipo, linea) in enumerate(zip(self.tipos, self.lineas)):
+            yield (nombres[tipo], self.valor(i), linea)
+
+    def __repr__(self):
+        return f"TokenBuffer({len(self.tipos)} tokens)"
+
+
+class VentanaTokens:
+    """
+    Vista indexable de un iterador de tokens que solo conserva los últimos
+    tokens leídos, en un buffer circular. Permite que el analizador
+    sintáctico consuma los tokens a medida que se generan (por ejemplo, los
+    de AnalizadorLexico.analizar_stream()) sin guardar la lista completa.
+
+    El índice es la posición del token en el flujo. Se puede consultar
+    cualquiera de los últimos `capacidad` tokens leídos; los siguientes se
+    leen del iterador al pedirlos y, pasado el final del flujo, se obtiene
+    None. tipos ofrece de la misma forma el código TipoToken de cada token.
+    """
+
+    # Tokens que se conservan: alcanza para el token actual, el anterior y
+    # los dos siguientes que consulta el analizador sintáctico
+    CAPACIDAD = 8
+
+    def __init__(self, tokens, capacidad=CAPACIDAD):
+        """
+        Inicializa la ventana sobre un iterador de tokens.
+
+        Args:
+            tokens: Iterable de tuplas (tipo, valor, linea)
+            capacidad (int): Cantidad de tokens que se conservan
+        """
+        self._iterador = iter(tokens)
+        self.capacidad = capacidad
+        self._tokens = [None] * capacidad
+        self._tipos = [None] * capacidad
+        self.leidos = 0  # Tokens leídos del iterador
+        self.terminado = False
+        self.tipos = _TiposVentana(self)
+
+    def _posicion(self, indice):
+        """
+        Ubica un token en el buffer circular, leyéndolo si hace falta.
+
+        Args:
+            indice (int): Posición del token en el flujo
+
+        Returns:
+            int: Posición en el buffer, o -1 si el flujo terminó antes
+        """
+        if indice >= self.leidos:
+            while self.leidos <= indice and not self.terminado:
+                try:
+                    token = next(self._iterador)
+                except StopIteration:
+                    self.terminado = True
+                    break
+                posicion = self.leidos % self.capacidad
+                self._tokens[posicion] = token
+                self._tipos[posicion] = TipoToken.codigo(token)
+                self.leidos += 1
+            if indice >= self.leidos:
+                return -1
+        elif indice < 0 or indice < self.leidos - self.capacidad:
+            raise IndexError(f"El token {indice} ya no está en la ventana")
+        return indice % self.capacidad
+
+    def __getitem__(self, indice):
+        posicion = self._posicion(indice)
+        return self._tokens[posicion] if posicion >= 0 else None
+
+    def tipo(self, indice):
+        """
+        Obtiene el código de tipo (TipoToken) de un token.
+
+        Args:
+            indice (int): Posición del token en el flujo
+
+        Returns:
+            int: Código del tipo, o None pasado el final del flujo
+        """
+        posicion = self._posicion(indice)
+        return self._tipos[posicion] if posicion >= 0 else None
+
+    def __repr__(self):
+        return f"VentanaTokens({self.leidos} tokens leídos)"
+
+
+class _TiposVentana:
+    """
+    Códigos de tipo de los tokens de una VentanaTokens, indexables como el
+    arreglo tipos de un TokenBuffer.
+    """
+
+    __slots__ = ("ventana",)
+
+    def __init__(self, ventana):
+        self.ventana = ventana
+
+    def __getitem__(self, indice):
+        return self.ventana.tipo(indice)
+
+
+class ResumenTokens:
+    """
+    Resumen de tokens agrupados por categoría (Operador, Signo, Palabra
+    Reservada, ...) y valor, con el mismo formato que devuelve
+    AnalizadorLexico.generar_resumen_tokens().
+
+    El analizador léxico puede completarlo mientras reconoce los tokens (ver
+    el parámetro resumen de analizar()) y varios resúmenes se pueden combinar,
+    de modo que se obtiene el resumen de fragmentos, archivos o corpus
+    completos sin recorrer otra vez las listas de tokens.
+    """
+
+    # Tipo de token visible -> categoría del resumen (los demás usan su tipo)
+    CATEGORIAS = {
+        "ASIGNACION": "Operador",
+        "OPERADOR": "Operador",
+        "COMPARACION": "Operador",
+        "MENORQUE": "Operador",
+        "MAYORQUE": "Operador",
+        "PARENTESIS_IZQ": "Signo",
+        "PARENTESIS_DER": "Signo",
+        "LLAVE_IZQ": "Signo",
+        "LLAVE_DER": "Signo",
+        "PUNTOYCOMA": "Signo",
+        "COMA": "Signo",
+        "PUNTO": "Signo",
+        "PALABRA_RESERVADA": "Palabra Reservada",
+        "IDENTIFICADOR": "Identificador",
+        "NUMERO_ENTERO": "Numero Entero",
+        "NUMERO_DECIMAL": "Numero Decimal",
+        "CADENA_SIMPLE": "Cadena",
+        "CADENA_DOBLE": "Cadena",
+    }
+
+    def __init__(self):
+        """
+        Inicializa un resumen vacío.
+        """
+        self.conteo = {}  # {(valor, categoria): cantidad}
+
+    def agregar(self, tipo, valor, cantidad=1):
+        """
+        Cuenta un token.
+
+        Args:
+            tipo (str): Tipo visible del token
+            valor (str): Valor del token
+            cantidad (int): Veces que se cuenta
+        """
+        clave = (valor, self.CATEGORIAS.get(tipo, tipo))
+        self.conteo[clave] = self.conteo.get(clave, 0) + cantidad
+
+    def agregar_tokens(self, tokens):
+        """
+        Cuenta una secuencia de tokens ya generada.
+
+        Args:
+            tokens: Lista de tuplas (tipo, valor, linea) o TokenBuffer
+        """
+        categorias = self.CATEGORIAS
+        conteo = self.conteo
+        for tipo, valor, _ in tokens:
+            clave = (valor, categorias.get(tipo, tipo))
+            conteo[clave] = conteo.get(clave, 0) + 1
+
+    def agregar_crudos(self, crudos):
+        """
+        Cuenta los tokens registrados por el analizador léxico durante el
+        recorrido: el tipo y el valor visibles se obtienen una sola vez por
+        cada texto distinto, no por cada token.
+
+        Args:
+            crudos (dict): {tipo_token: {texto: cantidad}} con los tipos de
+                TOKEN_ESPECIFICACION y el texto reconocido
+        """
+        reservadas = AnalizadorLexico.PALABRAS_RESERVADAS
+        for tipo, por_texto in crudos.items():
+            for texto, cantidad in por_texto.items():
+                valor = texto
+                if tipo == "IDENTIFICADOR":
+                    tipo_visible = "PALABRA_RESERVADA" if texto in reservadas else tipo
+                elif tipo == "ERROR":
+                    tipo_visible = tipo
+                    valor = f"Token inesperado '{texto}'"
+                elif tipo == "COMENTARIO_SIN_CERRAR":
+                    tipo_visible = "ERROR"
+                    valor = AnalizadorLexico.MENSAJE_COMENTARIO_SIN_CERRAR
+                elif tipo == "CADENA_SIN_CERRAR":
+                    tipo_visible = "ERROR"
+                    valor = AnalizadorLexico.MENSAJE_CADENA_SIN_CERRAR.format(texto[0])
+                else:
+                    tipo_visible = tipo
+                self.agregar(tipo_visible, valor, cantidad)
+
+    def combinar(self, otro):
+        """
+        Suma a este resumen los conteos de otro.
+
+        Args:
+            otro (ResumenTokens): Resumen a combinar
+
+        Returns:
+            ResumenTokens: Este mismo resumen
+        """
+        conteo = self.conteo
+        for clave, cantidad in otro.conteo.items():
+            conteo[clave] = conteo.get(clave, 0) + cantidad
+        return self
+
+    def como_diccionario(self):
+        """
+        Obtiene el resumen con el formato de generar_resumen_tokens().
+
+        Returns:
+            dict: {(valor, categoria): cantidad}
+        """
+        return dict(self.conteo)
+
+    def __len__(self):
+        return len(self.conteo)
+
+    def __repr__(self):
+        return f"ResumenTokens({len(self.conteo)} entradas)"
+
+
+# Analizadores reutilizados por cada proceso del análisis paralelo
+_ANALIZADORES_PROCESO = {}
+
+
+def _analizar_fragmento(fragmento, opciones):
+    """
+    Analiza un fragmento del código en un proceso del análisis paralelo.
+
+    Args:
+        fragmento (tuple): (codigo, desplazamiento, linea_inicial) del fragmento
+        opciones (tuple): (usar_automata, con_resumen): motor del analizador
+            léxico a usar y si se resumen los tokens del fragmento
+
+    Returns:
+        tuple: (tokens, posiciones, comentarios, resumen) con líneas y
+            posiciones relativas al código completo (resumen es None si no
+            se pidió)
+    """
+    codigo, desplazamiento, linea_inicial = fragmento
+    usar_automata, con_resumen = opciones
+    analizador = _ANALIZADORES_PROCESO.get(usar_automata)
+    if analizador is None:
+        analizador = AnalizadorLexico(usar_automata=usar_automata)
+        _ANALIZADORES_PROCESO[usar_automata] = analizador
+
+    resumen = ResumenTokens() if con_resumen else None
+    tokens = analizador.analizar(codigo, resumen=resumen)
+    diferencia = linea_inicial - 1
+    if diferencia:
+        tokens = [(tipo, valor, linea + diferencia) for tipo, valor, linea in tokens]
+    posiciones = [
+        (inicio + desplazamiento, fin + desplazamiento)
+        for inicio, fin in analizador.posiciones
+    ]
+    comentarios = [
+        (inicio + desplazamiento, fin + desplazamiento)
+        for inicio, fin in analizador.comentarios
+    ]
+    return tokens, posiciones, comentarios, resumen
@@ -3,6 +3,8 @@ Analizador Semántico para el lenguaje de programación simple.
 Verifica la coherencia semántica del código: tipos, declaraciones, uso de variables, etc.
 """
 
+from analizador_lexico import TablaNombres
+
 
 class AnalizadorSemantico:
     """
@@ -44,12 +46,19 @@ class AnalizadorSemantico:
     # Tipos de datos válidos
     TIPOS_VALIDOS = {"entero", "decimal", "booleano", "cadena"}
 
-    def __init__(self, ast):
+    # Id del ámbito global (ningún id de nombre es negativo)
+    _ID_AMBITO_GLOBAL = -1
+
+    def __init__(self, ast, tabla_nombres=None):
         """
         Inicializa el analizador semántico.
 
         Args:
             ast: Árbol de sintaxis abstracta del parser sintáctico
+            tabla_nombres (TablaNombres): Tabla de nombres con la que se
+                generaron los id_nombre de los nodos (opcional; sin ella los
+                ids se obtienen del valor de cada nodo). Solo se consulta: es
+                la del analizador léxico y sintáctico, y sus ids no cambian
         """
         self.ast = ast
         self.tabla_simbolos = {}  # {ambito:nombre: {tipo, categoria, ambito, linea}}
@@ -58,6 +67,17 @@ class AnalizadorSemantico:
         self.pila_ambitos = ["global"]  # Pila para manejar ámbitos anidados
         self.funciones = {}  # {nombre: {tipo_retorno, parametros}}
 
+        # Búsquedas por id entero: {id_ambito: {id_nombre: símbolo}}. Los
+        # símbolos son los mismos diccionarios de tabla_simbolos. Un ámbito de
+        # función usa el id del nombre de la función.
+        self._usar_ids_nodos = tabla_nombres is not None
+        self.tabla_nombres = tabla_nombres if tabla_nombres is not None else TablaNombres()
+        # Ids negativos de los nombres que no están en tabla_nombres
+        self._ids_locales = {}
+        self._simbolos = {}
+        self._id_ambito_actual = self._ID_AMBITO_GLOBAL
+        self._pila_ids_ambitos = [self._id_ambito_actual]
+
     def analizar(self):
         """
         Realiza el análisis semántico completo del AST.
@@ -138,6 +158,7 @@ class AnalizadorSemantico:
 
         tipo = tipo_nodo.valor
         nombre = nombre_nodo.valor
+        id_nombre = self._id_nombre(nombre_nodo)
         linea = nodo.linea
 
         # Verificar que el tipo sea válido
@@ -150,12 +171,12 @@ class AnalizadorSemantico:
             return
 
         # Verificar que no esté declarada en el ámbito actual
-        clave = f"{self.ambito_actual}:{nombre}"
-        if clave in self.tabla_simbolos:
+        simbolo = self._simbolos.get(self._id_ambito_actual, {}).get(id_nombre)
+        if simbolo is not None:
             self._agregar_error(
                 f"La variable '{nombre}' ya fue declarada en este ámbito",
                 linea,
-                f"Primera declaración en línea {self.tabla_simbolos[clave]['linea']}",
+                f"Primera declaración en línea {simbolo['linea']}",
             )
             return
 
@@ -172,7 +193,7 @@ class AnalizadorSemantico:
             return
 
         # Agregar a la tabla de símbolos
-        self._agregar_simbolo(nombre, tipo, "variable", linea)
+        self._agregar_simbolo(nombre, tipo, "variable", linea, id_nombre)
 
     def _verificar_asignacion(self, nodo):
         """
@@ -189,7 +210,7 @@ class AnalizadorSemantico:
         linea = nodo.linea
 
         # Verificar que la variable exista
-        simbolo = self._buscar_simbolo(nombre)
+        simbolo = self._buscar_simbolo(self._id_nombre(nodo))
         if simbolo is None:
             self._agregar_error(
                 f"Variable '{nombre}' no ha sido declarada",
@@ -232,6 +253,7 @@ class AnalizadorSemantico:
             nodo: Nodo DECLARACION_FUNCION del AST
         """
         nombre = nodo.valor
+        id_nombre = self._id_nombre(nodo)
         linea = nodo.linea
 
         if len(nodo.hijos) < 2:
@@ -267,17 +289,18 @@ class AnalizadorSemantico:
                 if parametro.tipo == "PARAMETRO" and len(parametro.hijos) >= 2:
                     tipo_param = parametro.hijos[0].valor
                     nombre_param = parametro.hijos[1].valor
+                    id_param = self._id_nombre(parametro.hijos[1])
 
                     # Verificar nombres duplicados
-                    if nombre_param in nombres_parametros:
+                    if id_param in nombres_parametros:
                         self._agregar_error(
                             f"Parámetro duplicado en función '{nombre}': '{nombre_param}'",
                             linea,
                         )
                     else:
-                        nombres_parametros.add(nombre_param)
+                        nombres_parametros.add(id_param)
                         parametros_lista.append(
-                            {"tipo": tipo_param, "nombre": nombre_param}
+                            {"tipo": tipo_param, "nombre": nombre_param, "id": id_param}
                         )
 
         # REQUISITO: Verificar que tenga mínimo 2 parámetros
@@ -297,15 +320,15 @@ class AnalizadorSemantico:
         }
 
         # Agregar función a tabla de símbolos (en ámbito global)
-        self._agregar_simbolo(nombre, tipo_retorno, "funcion", linea)
+        self._agregar_simbolo(nombre, tipo_retorno, "funcion", linea, id_nombre)
 
         # Entrar en el ámbito de la función
-        self._entrar_ambito(nombre)
+        self._entrar_ambito(nombre, id_nombre)
 
         # Agregar parámetros a la tabla de símbolos (en ámbito local de la función)
         for parametro in parametros_lista:
             self._agregar_simbolo(
-                parametro["nombre"], parametro["tipo"], "parametro", linea
+                parametro["nombre"], parametro["tipo"], "parametro", linea, parametro["id"]
             )
 
         # Procesar el cuerpo de la función (bloque)
@@ -333,7 +356,7 @@ class AnalizadorSemantico:
         linea = nodo.linea
 
         # Buscar en tabla de símbolos
-        simbolo = self._buscar_simbolo(nombre)
+        simbolo = self._buscar_simbolo(self._id_nombre(nodo))
 
         if simbolo is None:
             self._agregar_error(
@@ -463,7 +486,7 @@ class AnalizadorSemantico:
 
         # Identificador (variable)
         elif nodo.tipo == "IDENTIFICADOR":
-            simbolo = self._buscar_simbolo(nodo.valor)
+            simbolo = self._buscar_simbolo(self._id_nombre(nodo))
             if simbolo:
                 return simbolo["tipo"]
             return None
@@ -509,7 +532,42 @@ class AnalizadorSemantico:
 
         return False
 
-    def _agregar_simbolo(self, nombre, tipo, categoria, linea):
+    def _id_nombre(self, nodo):
+        """
+        Obtiene el id entero del nombre de un nodo.
+
+        Args:
+            nodo: Nodo cuyo valor es un identificador
+
+        Returns:
+            int: Id del nombre
+        """
+        if self._usar_ids_nodos and nodo.id_nombre is not None:
+            return nodo.id_nombre
+        return self._id_de_nombre(nodo.valor)
+
+    def _id_de_nombre(self, nombre):
+        """
+        Obtiene el id entero de un nombre sin modificar self.tabla_nombres:
+        un nombre que no está en ella recibe un id negativo propio de este
+        análisis.
+
+        Args:
+            nombre (str): Nombre a buscar
+
+        Returns:
+            int: Id del nombre
+        """
+        id_nombre = self.tabla_nombres.ids.get(nombre)
+        if id_nombre is None:
+            id_nombre = self._ids_locales.get(nombre)
+            if id_nombre is None:
+                # -1 queda para el ámbito global
+                id_nombre = -2 - len(self._ids_locales)
+                self._ids_locales[nombre] = id_nombre
+        return id_nombre
+
+    def _agregar_simbolo(self, nombre, tipo, categoria, linea, id_nombre=None):
         """
         Agrega un símbolo a la tabla de símbolos.
 
@@ -518,48 +576,60 @@ class AnalizadorSemantico:
             tipo (str): Tipo del símbolo
             categoria (str): Categoría: 'variable', 'funcion', 'parametro'
             linea (int): Línea donde se declaró
+            id_nombre (int): Id del nombre (se obtiene del nombre si falta)
         """
-        clave = f"{self.ambito_actual}:{nombre}"
+        if id_nombre is None:
+            id_nombre = self._id_de_nombre(nombre)
+        simbolos = self._simbolos.setdefault(self._id_ambito_actual, {})
 
-        if clave in self.tabla_simbolos:
+        if id_nombre in simbolos:
             # Ya existe, no agregar (el error ya se reportó)
             return
 
-        self.tabla_simbolos[clave] = {
+        simbolo = {
             "tipo": tipo,
             "categoria": categoria,
             "ambito": self.ambito_actual,
             "linea": linea,
         }
+        simbolos[id_nombre] = simbolo
+        self.tabla_simbolos[f"{self.ambito_actual}:{nombre}"] = simbolo
 
-    def _buscar_simbolo(self, nombre):
+    def _buscar_simbolo(self, id_nombre):
         """
         Busca un símbolo en la tabla de símbolos.
         Busca en la pila de ámbitos desde el más reciente al más antiguo.
 
         Args:
-            nombre (str): Nombre del símbolo a buscar
+            id_nombre (int): Id del nombre del símbolo a buscar
 
         Returns:
             dict: Información del símbolo o None si no existe
         """
         # Buscar en la pila de ámbitos desde el más reciente
-        for ambito in reversed(self.pila_ambitos):
-            clave = f"{ambito}:{nombre}"
-            if clave in self.tabla_simbolos:
-                return self.tabla_simbolos[clave]
+        for id_ambito in reversed(self._pila_ids_ambitos):
+            simbolos = self._simbolos.get(id_ambito)
+            if simbolos is not None:
+                simbolo = simbolos.get(id_nombre)
+                if simbolo is not None:
+                    return simbolo
 
         return None
 
-    def _entrar_ambito(self, nombre_ambito):
+    def _entrar_ambito(self, nombre_ambito, id_ambito=None):
         """
         Entra en un nuevo ámbito (por ejemplo, una función).
 
         Args:
             nombre_ambito (str): Nombre del nuevo ámbito
+            id_ambito (int): Id del nombre del ámbito (se obtiene del nombre si falta)
         """
+        if id_ambito is None:
+            id_ambito = self._id_de_nombre(nombre_ambito)
         self.ambito_actual = nombre_ambito
         self.pila_ambitos.append(nombre_ambito)
+        self._id_ambito_actual = id_ambito
+        self._pila_ids_ambitos.append(id_ambito)
 
     def _salir_ambito(self):
         """
@@ -568,6 +638,8 @@ class AnalizadorSemantico:
         if len(self.pila_ambitos) > 1:
             self.pila_ambitos.pop()
             self.ambito_actual = self.pila_ambitos[-1]
+            self._pila_ids_ambitos.pop()
+            self._id_ambito_actual = self._pila_ids_ambitos[-1]
 
     def _agregar_error(self, mensaje, linea, detalle=""):
         """
@@ -1,15 +1,38 @@
 """
 Analizador Sintáctico (Parser) para el lenguaje de programación simple.
-Implementa un parser descendente recursivo que construye un Árbol de Sintaxis Abstracta (AST).
+Implementa un parser descendente que construye un Árbol de Sintaxis Abstracta (AST).
+El parser no usa la recursión de Python: las reglas que se anidan se ejecutan
+sobre una pila explícita, por lo que la profundidad del código fuente solo está
+limitada por la memoria.
 """
 
+import gc
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from types import GeneratorType
+
+from analizador_lexico import ListaTokens, TablaNombres, TipoToken, TokenBuffer, VentanaTokens
+
+
+# Hijos de los nodos hoja: una única tupla vacía compartida, que se
+# reemplaza por una lista propia al agregar el primer hijo
+_SIN_HIJOS = ()
+
 
 class NodoAST:
     """
     Representa un nodo en el Árbol de Sintaxis Abstracta (AST).
+
+    Usa __slots__ (sin __dict__ por instancia) y los nodos hoja, como
+    NUMERO_ENTERO o IDENTIFICADOR, comparten la tupla vacía _SIN_HIJOS en
+    lugar de tener cada uno su propia lista.
     """
 
-    def __init__(self, tipo, valor=None, hijos=None, linea=None):
+    __slots__ = ("tipo", "valor", "hijos", "linea", "id_nombre")
+
+    def __init__(self, tipo, valor=None, hijos=None, linea=None, id_nombre=None):
         """
         Inicializa un nodo del AST.
 
@@ -18,11 +41,14 @@ class NodoAST:
             valor: Valor asociado al nodo (nombre de variable, operador, literal, etc.)
             hijos (list): Lista de nodos hijos
             linea (int): Número de línea en el código fuente
+            id_nombre (int): Id del nombre en la TablaNombres del análisis, si
+                el valor del nodo es un identificador
         """
         self.tipo = tipo
         self.valor = valor
-        self.hijos = hijos if hijos is not None else []
+        self.hijos = hijos if hijos is not None else _SIN_HIJOS
         self.linea = linea
+        self.id_nombre = id_nombre
 
     def agregar_hijo(self, nodo):
         """
@@ -32,7 +58,11 @@ class NodoAST:
             nodo (NodoAST): Nodo hijo a agregar
         """
         if nodo is not None:
-            self.hijos.append(nodo)
+            if isinstance(self.hijos, list):
+                self.hijos.append(nodo)
+            else:
+                self.hijos = list(self.hijos)
+                self.hijos.append(nodo)
 
     def __repr__(self):
         """
@@ -46,10 +76,421 @@ class NodoAST:
         return f"NodoAST(tipo={self.tipo}, linea={self.linea})"
 
 
+class ArenaAST:
+    """
+    AST almacenado en arreglos paralelos, con un índice entero por nodo.
+
+    Cada nodo ocupa una posición de los arreglos tipos (código del tipo de
+    nodo), valores (id del valor en tabla_valores, -1 si no tiene), lineas,
+    ids_nombres, primer_hijo y siguiente_hermano (índices, -1 si no hay). En
+    lugar de un objeto por nodo con su lista de hijos, un nodo ocupa unos
+    pocos bytes en cada arreglo y los textos repetidos se guardan una sola vez.
+
+    Los nodos se manejan con NodoArena, un adaptador que ofrece los mismos
+    atributos que NodoAST (tipo, valor, hijos, linea, id_nombre). El parser
+    construye el AST directamente en la arena con
+    AnalizadorSintactico(tokens, usar_arena=True).
+    """
+
+    # Línea de los nodos creados sin línea (-1 ya se usa para el fin de archivo)
+    _SIN_LINEA = -(2 ** 31)
+
+    def __init__(self):
+        """
+        Inicializa una arena vacía.
+        """
+        # Tipos de nodo: código -> nombre y nombre -> código
+        self.nombres_tipos = []
+        self._codigos_tipos = {}
+        # Textos de los valores (literales, operadores, nombres, tipos)
+        self.tabla_valores = TablaNombres()
+
+        self.tipos = array("B")
+        self.valores = array("i")
+        self.lineas = array("i")
+        self.ids_nombres = array("i")
+        self.primer_hijo = array("i")
+        self.siguiente_hermano = array("i")
+        # Último hijo de cada nodo, para agregar hijos en orden sin recorrerlos
+        self._ultimo_hijo = array("i")
+
+    def nodo(self, tipo, valor=None, hijos=None, linea=None, id_nombre=None):
+        """
+        Crea un nodo en la arena. Recibe los mismos argumentos que NodoAST.
+
+        Args:
+            tipo (str): Tipo de nodo
+            valor (str): Valor asociado al nodo
+            hijos (list): Nodos hijos (NodoArena de esta arena)
+            linea (int): Número de línea en el código fuente
+            id_nombre (int): Id del nombre en la TablaNombres del análisis
+
+        Returns:
+            NodoArena: Adaptador del nodo creado
+        """
+        indice = len(self.tipos)
+        self.tipos.append(self._codigo_tipo(tipo))
+        self.valores.append(-1 if valor is None else self.tabla_valores.agregar(valor))
+        self.lineas.append(self._SIN_LINEA if linea is None else linea)
+        self.ids_nombres.append(-1 if id_nombre is None else id_nombre)
+        self.primer_hijo.append(-1)
+        self.siguiente_hermano.append(-1)
+        self._ultimo_hijo.append(-1)
+        if hijos:
+            for hijo in hijos:
+                self.enlazar(indice, hijo.indice)
+        return NodoArena(self, indice)
+
+    def _codigo_tipo(self, tipo):
+        codigo = self._codigos_tipos.get(tipo)
+        if codigo is None:
+            codigo = len(self.nombres_tipos)
+            self.nombres_tipos.append(tipo)
+            self._codigos_tipos[tipo] = codigo
+        return codigo
+
+    def enlazar(self, padre, hijo):
+        """
+        Agrega un nodo como último hijo de otro.
+
+        Args:
+            padre (int): Índice del nodo padre
+            hijo (int): Índice del nodo hijo (no debe tener padre)
+        """
+        ultimo = self._ultimo_hijo[padre]
+        if ultimo < 0:
+            self.primer_hijo[padre] = hijo
+        else:
+            self.siguiente_hermano[ultimo] = hijo
+        self._ultimo_hijo[padre] = hijo
+
+    def indices_hijos(self, indice):
+        """
+        Obtiene los índices de los hijos de un nodo, en orden.
+
+        Args:
+            indice (int): Índice del nodo
+
+        Returns:
+            list: Índices de los hijos
+        """
+        hijos = []
+        hijo = self.primer_hijo[indice]
+        siguiente = self.siguiente_hermano
+        while hijo >= 0:
+            hijos.append(hijo)
+            hijo = siguiente[hijo]
+        return hijos
+
+    @classmethod
+    def desde_ast(cls, raiz):
+        """
+        Copia un AST de NodoAST (o de cualquier nodo con los mismos
+        atributos) a una arena nueva, sin recursión.
+
+        Args:
+            raiz (NodoAST): Raíz del AST
+
+        Returns:
+            NodoArena: Raíz del AST en la arena (su arena está en .arena)
+        """
+        arena = cls()
+        pendientes = [(raiz, -1)]
+        while pendientes:
+            nodo, padre = pendientes.pop()
+            copia = arena.nodo(
+                nodo.tipo, valor=nodo.valor, linea=nodo.linea, id_nombre=nodo.id_nombre
+            )
+            if padre >= 0:
+                arena.enlazar(padre, copia.indice)
+            # Se apilan en orden inverso para enlazar los hijos en su orden
+            for hijo in reversed(nodo.hijos):
+                pendientes.append((hijo, copia.indice))
+        return NodoArena(arena, 0)
+
+    def a_ast(self, indice=0):
+        """
+        Copia un subárbol de la arena a nodos NodoAST, sin recursión (la
+        operación inversa de desde_ast()).
+
+        Args:
+            indice (int): Índice de la raíz del subárbol
+
+        Returns:
+            NodoAST: Raíz del subárbol copiado
+        """
+        nombres_tipos = self.nombres_tipos
+        textos = self.tabla_valores.nombres
+        tipos = self.tipos
+        valores = self.valores
+        lineas = self.lineas
+        ids_nombres = self.ids_nombres
+        primer_hijo = self.primer_hijo
+        siguiente_hermano = self.siguiente_hermano
+        sin_linea = self._SIN_LINEA
+
+        raiz = []
+        pendientes = [(indice, raiz)]
+        while pendientes:
+            indice, hermanos = pendientes.pop()
+            valor = valores[indice]
+            linea = lineas[indice]
+            id_nombre = ids_nombres[indice]
+            hijo = primer_hijo[indice]
+            hijos = None
+            if hijo >= 0:
+                hijos = []
+                # Se apilan en orden inverso para copiarlos en su orden
+                indices_hijos = []
+                while hijo >= 0:
+                    indices_hijos.append(hijo)
+                    hijo = siguiente_hermano[hijo]
+                for hijo in reversed(indices_hijos):
+                    pendientes.append((hijo, hijos))
+            hermanos.append(
+                NodoAST(
+                    nombres_tipos[tipos[indice]],
+                    None if valor < 0 else textos[valor],
+                    hijos,
+                    None if linea == sin_linea else linea,
+                    None if id_nombre < 0 else id_nombre,
+                )
+            )
+        return raiz[0]
+
+    def __len__(self):
+        return len(self.tipos)
+
+
+class NodoArena:
+    """
+    Adaptador de un nodo de ArenaAST con la interfaz de NodoAST.
+
+    Solo guarda la arena y el índice del nodo: los atributos se leen (y se
+    escriben) en los arreglos de la arena, y hijos devuelve una lista nueva
+    de adaptadores en cada acceso.
+    """
+
+    __slots__ = ("arena", "indice")
+
+    def __init__(self, arena, indice):
+        """
+        Inicializa el adaptador.
+
+        Args:
+            arena (ArenaAST): Arena que contiene el nodo
+            indice (int): Índice del nodo en la arena
+        """
+        self.arena = arena
+        self.indice = indice
+
+    @property
+    def tipo(self):
+        return self.arena.nombres_tipos[self.arena.tipos[self.indice]]
+
+    @tipo.setter
+    def tipo(self, tipo):
+        self.arena.tipos[self.indice] = self.arena._codigo_tipo(tipo)
+
+    @property
+    def valor(self):
+        id_valor = self.arena.valores[self.indice]
+        return None if id_valor < 0 else self.arena.tabla_valores.nombre(id_valor)
+
+    @property
+    def linea(self):
+        linea = self.arena.lineas[self.indice]
+        return None if linea == ArenaAST._SIN_LINEA else linea
+
+    @property
+    def id_nombre(self):
+        id_nombre = self.arena.ids_nombres[self.indice]
+        return None if id_nombre < 0 else id_nombre
+
+    @property
+    def hijos(self):
+        arena = self.arena
+        return [NodoArena(arena, hijo) for hijo in arena.indices_hijos(self.indice)]
+
+    def agregar_hijo(self, nodo):
+        """
+        Agrega un nodo hijo (de la misma arena).
+
+        Args:
+            nodo (NodoArena): Nodo hijo a agregar
+        """
+        if nodo is not None:
+            self.arena.enlazar(self.indice, nodo.indice)
+
+    def __eq__(self, otro):
+        return (
+            isinstance(otro, NodoArena)
+            and otro.arena is self.arena
+            and otro.indice == self.indice
+        )
+
+    def __hash__(self):
+        return hash((id(self.arena), self.indice))
+
+    def __repr__(self):
+        valor = self.valor
+        if valor:
+            return f"NodoArena(tipo={self.tipo}, valor={valor}, linea={self.linea})"
+        return f"NodoArena(tipo={self.tipo}, linea={self.linea})"
+
+
+class _NodoReconocido:
+    """
+    Nodo que entrega el parser en modo reconocedor (construir_ast=False): un
+    único objeto compartido que ocupa el lugar de cada nodo e ignora sus
+    hijos, de modo que las reglas siguen igual sin crear nodos.
+    """
+
+    __slots__ = ("tipo",)
+
+    def agregar_hijo(self, nodo):
+        pass
+
+
+_NODO_RECONOCIDO = _NodoReconocido()
+
+
+def _reconocer(tipo, valor=None, hijos=None, linea=None, id_nombre=None):
+    """
+    Reemplazo de NodoAST en modo reconocedor: no crea ningún nodo.
+
+    Returns:
+        _NodoReconocido: El nodo compartido
+    """
+    return _NODO_RECONOCIDO
+
+
+class _TiposEnTuplas(dict):
+    """
+    Códigos de tipo de una lista de tuplas que no los trae (una lista armada
+    fuera de AnalizadorLexico.analizar()), calculados la primera vez que se
+    consulta cada posición: el análisis no recorre antes todos los tokens y
+    solo calcula los que alcanza.
+    """
+
+    __slots__ = ("tokens",)
+
+    def __init__(self, tokens):
+        super().__init__()
+        self.tokens = tokens
+
+    def __missing__(self, indice):
+        codigo = self[indice] = TipoToken.codigo(self.tokens[indice])
+        return codigo
+
+
+class _TuplasDeBuffer(list):
+    """
+    Tuplas (tipo, valor, linea) de un TokenBuffer, armadas por bloques. Las
+    posiciones que todavía no se armaron valen None: armar() arma de una vez
+    el bloque de la posición pedida, directamente desde los arreglos del
+    buffer (el valor de los nombres sale de la tabla de nombres, el de los
+    demás tokens del código fuente), y las consultas siguientes son un
+    acceso a la lista. Así el análisis arma cada tupla una sola vez.
+    """
+
+    __slots__ = ("buffer",)
+
+    # Tokens que se arman de una vez
+    TAMANO_BLOQUE = 512
+
+    # Tipos cuyo valor no es el texto del token sino un mensaje de error
+    _CODIGOS_MENSAJE = frozenset(
+        (TipoToken.ERROR, TipoToken.COMENTARIO_SIN_CERRAR, TipoToken.CADENA_SIN_CERRAR)
+    )
+
+    def __init__(self, buffer):
+        super().__init__([None] * len(buffer))
+        self.buffer = buffer
+
+    def armar(self, indice):
+        """
+        Arma las tuplas del bloque de una posición.
+
+        Args:
+            indice (int): Posición del token
+
+        Returns:
+            tuple: Token de esa posición
+        """
+        buffer = self.buffer
+        inicio = indice - indice % self.TAMANO_BLOQUE
+        fin = min(inicio + self.TAMANO_BLOQUE, len(self))
+
+        tipos = buffer.tipos[inicio:fin]
+        fuente = buffer.fuente
+        if isinstance(fuente, str) and buffer.tabla_nombres is not None:
+            nombres = buffer.tabla_nombres.nombres
+            valores = [
+                nombres[id_nombre] if id_nombre >= 0 else fuente[desde:hasta]
+                for id_nombre, desde, hasta in zip(
+                    buffer.ids_nombres[inicio:fin],
+                    buffer.inicios[inicio:fin],
+                    buffer.fines[inicio:fin],
+                )
+            ]
+            if not self._CODIGOS_MENSAJE.isdisjoint(tipos):
+                for i, tipo in enumerate(tipos):
+                    if tipo in self._CODIGOS_MENSAJE:
+                        valores[i] = buffer.valor(inicio + i)
+        else:
+            valores = [buffer.valor(i) for i in range(inicio, fin)]
+
+        self[inicio:fin] = zip(
+            map(TipoToken.VISIBLES.__getitem__, tipos), valores, buffer.lineas[inicio:fin]
+        )
+        return self[indice]
+
+
+def _sin_tupla(posicion):
+    """
+    Tupla de una posición que no tiene token (pasado el final de un flujo).
+
+    Args:
+        posicion (int): Índice del token
+
+    Returns:
+        None: No hay token
+    """
+    return None
+
+
+class _IdsEnTabla:
+    """
+    Ids de nombre de los tokens calculados al pedirlos, con una tabla de
+    nombres dada. El parser solo los pide para tokens IDENTIFICADOR, de modo
+    que un reanálisis no recorre todos los tokens y un flujo de tokens no
+    necesita conocerlos de antemano.
+    """
+
+    __slots__ = ("tokens", "tabla")
+
+    def __init__(self, tokens, tabla):
+        self.tokens = tokens
+        self.tabla = tabla
+
+    def __getitem__(self, indice):
+        return self.tabla.agregar(self.tokens[indice][1])
+
+
 class AnalizadorSintactico:
     """
-    Analizador sintáctico que implementa un parser descendente recursivo.
+    Analizador sintáctico que implementa un parser descendente.
     Verifica la estructura gramatical del código y construye un AST.
+
+    Las reglas que pueden anidarse (bloques, estructuras de control y
+    funciones) son generadores: entregan con yield la subregla que necesitan
+    y _ejecutar() las apila en lugar de llamarlas. Las reglas que solo eligen
+    entre alternativas (_declaracion() y las que llama) son funciones comunes
+    que devuelven el nodo, o el generador de la regla anidada para que quien
+    las llamó lo entregue: una declaración simple no pasa por la pila. Las
+    expresiones se analizan en un único ciclo con su propia pila de
+    paréntesis.
     """
 
     # Tipos de datos válidos del lenguaje
@@ -58,21 +499,178 @@ class AnalizadorSintactico:
     # Palabras reservadas que representan estructuras de control
     ESTRUCTURAS_CONTROL = {"si", "mientras", "hacer"}
 
-    def __init__(self, tokens):
+    # Los mismos conjuntos como códigos de tipo de token (comparación entera)
+    _CODIGOS_TIPOS_VALIDOS = frozenset(TipoToken.PALABRAS[p] for p in TIPOS_VALIDOS)
+    _CODIGOS_ESTRUCTURAS_CONTROL = frozenset(
+        TipoToken.PALABRAS[p] for p in ESTRUCTURAS_CONTROL
+    )
+    _CODIGOS_BOOLEANOS = frozenset([TipoToken.VERDADERO, TipoToken.FALSO])
+
+    # Tipo de nodo de cada literal que puede aparecer como factor
+    _NODOS_LITERALES = {
+        TipoToken.NUMERO_ENTERO: "NUMERO_ENTERO",
+        TipoToken.NUMERO_DECIMAL: "NUMERO_DECIMAL",
+        TipoToken.CADENA_SIMPLE: "CADENA",
+        TipoToken.CADENA_DOBLE: "CADENA",
+        TipoToken.VERDADERO: "BOOLEANO",
+        TipoToken.FALSO: "BOOLEANO",
+    }
+
+    # Asociatividad de los operadores binarios
+    IZQUIERDA = "izquierda"
+    DERECHA = "derecha"
+    NINGUNA = "ninguna"
+
+    # Precedencia de las comparaciones: solo aparecen en una CONDICION
+    # (EXPRESION COMPARADOR EXPRESION), por lo que una expresión acepta
+    # únicamente los operadores de precedencia mayor
+    PRECEDENCIA_COMPARACION = 1
+
+    # Operadores binarios: valor -> (precedencia, asociatividad). Un número
+    # mayor liga más fuerte y todas las precedencias son mayores que cero.
+    # Agregar un operador que el analizador léxico ya reconoce es agregar
+    # una entrada a esta tabla.
+    OPERADORES_BINARIOS = {
+        "==": (PRECEDENCIA_COMPARACION, NINGUNA),
+        "!=": (PRECEDENCIA_COMPARACION, NINGUNA),
+        "<": (PRECEDENCIA_COMPARACION, NINGUNA),
+        ">": (PRECEDENCIA_COMPARACION, NINGUNA),
+        "<=": (PRECEDENCIA_COMPARACION, NINGUNA),
+        ">=": (PRECEDENCIA_COMPARACION, NINGUNA),
+        "+": (2, IZQUIERDA),
+        "-": (2, IZQUIERDA),
+        "*": (3, IZQUIERDA),
+        "/": (3, IZQUIERDA),
+        "%": (3, IZQUIERDA),
+    }
+
+    # Tipos de token que pueden ser un operador binario
+    _CODIGOS_OPERADORES = frozenset(
+        [TipoToken.OPERADOR, TipoToken.COMPARACION, TipoToken.MENORQUE, TipoToken.MAYORQUE]
+    )
+
+    # Cantidad mínima de tokens para repartir el análisis entre procesos
+    _TOKENS_MINIMOS_PARALELO = 1 << 17
+
+    # Fragmentos por proceso (permite equilibrar la carga entre procesos)
+    _FRAGMENTOS_POR_PROCESO = 4
+
+    def __init__(
+        self,
+        tokens,
+        tabla_nombres=None,
+        ids_nombres=None,
+        usar_arena=False,
+        recuperar_errores=False,
+        construir_ast=True,
+    ):
         """
         Inicializa el analizador sintáctico.
 
         Args:
-            tokens (list): Lista de tuplas (tipo_token, valor, linea) del analizador léxico
+            tokens (list): Lista de tuplas (tipo_token, valor, linea) del analizador léxico,
+                o cualquier iterable de tokens (ej: el generador de
+                analizar_stream()), que se consume a medida que avanza el
+                análisis conservando solo unos pocos tokens (VentanaTokens)
+            tabla_nombres (TablaNombres): Tabla de nombres del análisis léxico
+                (opcional; un TokenBuffer o la ListaTokens del analizador léxico
+                ya la traen)
+            ids_nombres: Id de nombre de cada token, -1 si no es un nombre
+                (opcional, junto con tabla_nombres)
+            usar_arena (bool): Si es True, el AST se construye en una ArenaAST
+                (self.arena) y analizar() devuelve su raíz como NodoArena;
+                ocupa mucho menos memoria que un NodoAST por nodo
+            recuperar_errores (bool): Si es True, el análisis no se detiene en
+                el primer error: tras cada error descarta tokens hasta un ';',
+                un '}' o el inicio de otra declaración (modo pánico) y sigue,
+                de modo que analizar() devuelve todos los errores y el AST
+                parcial. Por defecto se conserva el comportamiento de la
+                interfaz: solo se informa el primer error.
+            construir_ast (bool): Si es False, el parser solo reconoce el
+                programa: recorre la misma gramática e informa los mismos
+                errores, pero no crea ningún nodo y analizar() devuelve None
+                como árbol (usar_arena no tiene efecto)
         """
+        # Un iterador de tokens se consume a través de una ventana que solo
+        # conserva los últimos tokens leídos
+        if not hasattr(tokens, "__getitem__"):
+            tokens = VentanaTokens(tokens)
         self.tokens = tokens
+        # Tuplas que recorre el análisis. Las de un TokenBuffer se arman por
+        # bloques a medida que se consultan (las que faltan valen None):
+        # se obtienen con self._tuplas[i] or self._armar_tupla(i)
+        self._usar_tuplas(tokens)
         self.posicion = 0
         self.token_actual = None
+        self.tipo_actual = None
         self.errores = []
 
+        # Modo recuperación: mientras _panico es True (desde un error hasta
+        # resincronizar) no se registran errores nuevos, que suelen ser
+        # consecuencia del primero
+        self.recuperar_errores = recuperar_errores
+        self._panico = False
+
+        # Resultado del último análisis, para reanalizar(): el AST y el rango
+        # de tokens [inicio, fin) y la línea inicial de cada declaración del
+        # PROGRAMA (None si la declaración tuvo errores y no se puede reutilizar)
+        self.ast = None
+        self.rangos_declaraciones = []
+        self._reutilizables = None
+
+        # Códigos enteros de tipo de cada token (TipoToken). Un TokenBuffer y
+        # la ListaTokens del analizador léxico ya los traen y una ventana los
+        # calcula al leer cada token; para otra lista de tuplas se calculan a
+        # medida que el análisis llega a cada token.
+        if isinstance(tokens, (TokenBuffer, VentanaTokens, ListaTokens)):
+            self.tipos = tokens.tipos
+            if getattr(tokens, "tabla_nombres", None) is not None:
+                tabla_nombres = tokens.tabla_nombres
+                ids_nombres = tokens.ids_nombres
+        else:
+            self.tipos = _TiposEnTuplas(tokens)
+
+        # Cantidad de tokens. La de un flujo no se conoce: se puede indexar
+        # cualquier posición siguiente y pasado el final se obtiene None.
+        if isinstance(tokens, VentanaTokens):
+            self._limite = sys.maxsize
+        else:
+            self._limite = len(tokens)
+
+        # Ids enteros de los nombres: los nodos del AST los llevan hasta el
+        # analizador semántico. Un TokenBuffer y la ListaTokens del analizador
+        # léxico traen su tabla; si no, se arma una con los nombres a medida
+        # que el análisis los encuentra (sin recorrer antes los tokens).
+        if tabla_nombres is None or ids_nombres is None or isinstance(tokens, VentanaTokens):
+            if tabla_nombres is None:
+                tabla_nombres = TablaNombres()
+            ids_nombres = _IdsEnTabla(tokens, tabla_nombres)
+        self.tabla_nombres = tabla_nombres
+        self.ids_nombres = ids_nombres
+
+        # Representación del AST: un NodoAST por nodo, una arena de arreglos o
+        # ninguna (modo reconocedor)
+        self.construir_ast = construir_ast
+        self.arena = ArenaAST() if usar_arena and construir_ast else None
+        if not construir_ast:
+            self._nodo = _reconocer
+        elif usar_arena:
+            self._nodo = self.arena.nodo
+        else:
+            self._nodo = NodoAST
+
+        # Operadores que puede contener una expresión (las comparaciones
+        # quedan para _condicion()): valor -> (precedencia, si reduce los
+        # operadores pendientes de igual precedencia, es decir, si no es
+        # asociativo por la derecha)
+        self._operadores_expresion = {
+            operador: (precedencia, asociatividad != self.DERECHA)
+            for operador, (precedencia, asociatividad) in self.OPERADORES_BINARIOS.items()
+            if precedencia > self.PRECEDENCIA_COMPARACION
+        }
+
         # Inicializar el primer token
-        if self.tokens:
-            self.token_actual = self.tokens[0]
+        self._mover(0)
 
     def analizar(self):
         """
@@ -80,63 +678,372 @@ class AnalizadorSintactico:
 
         Returns:
             tuple: (arbol_sintactico, errores)
-                - arbol_sintactico: NodoAST raíz del programa o None si hay errores
+                - arbol_sintactico: NodoAST raíz del programa (None si hubo un
+                  error inesperado o en modo reconocedor)
                 - errores: Lista de errores sintácticos encontrados
         """
+        # Sin recolector de ciclos mientras se arma el AST: los nodos siguen
+        # vivos al terminar, y el recolector los recorrería una y otra vez
+        # sin encontrar basura
+        recolector_activo = gc.isenabled()
+        gc.disable()
         try:
-            ast = self._programa()
-            return (ast, self.errores)
+            ast = self._ejecutar(self._programa())
         except Exception as e:
             self._agregar_error(
                 f"Error inesperado durante el análisis sintáctico: {str(e)}",
                 self._linea_actual(),
             )
-            return (None, self.errores)
+            ast = None
+            self.rangos_declaraciones = []
+        finally:
+            self._reutilizables = None
+            if recolector_activo:
+                gc.enable()
+        if not self.construir_ast:
+            ast = None
+        self.ast = ast
+        return (ast, self.errores)
+
+    def reanalizar(self, tokens, tramo, tabla_nombres=None, ids_nombres=None):
+        """
+        Analiza los tokens de un código editado reutilizando el AST del último
+        análisis de este analizador.
+
+        tramo es el rango tokens[desde:hasta] de tokens que cambiaron, tal como
+        lo devuelve AnalizadorLexico.reanalizar(): los anteriores son los
+        mismos del análisis previo y los posteriores son los mismos desplazados
+        (en posición y quizás en línea). Las declaraciones del PROGRAMA que
+        terminan antes del tramo, y las que empiezan después, se reutilizan tal
+        cual (el mismo objeto NodoAST); solo se vuelven a analizar las que
+        tocan el tramo, hasta que el análisis llega al inicio de una
+        declaración anterior ya fuera del tramo. Si la edición cambió la
+        cantidad de líneas, se corrige la línea de los nodos reutilizados que
+        quedan después.
+
+        Los id_nombre de los nodos reutilizados siguen siendo válidos si la
+        tabla de nombres es la misma del análisis previo: la del analizador
+        léxico, que reanalizar() conserva, o la que armó este analizador.
+
+        Args:
+            tokens (list): Lista completa de tokens del código editado
+            tramo (tuple): (desde, hasta) de los tokens que cambiaron
+            tabla_nombres (TablaNombres): Tabla de nombres del análisis léxico
+                (opcional; por defecto se sigue usando la del análisis previo)
+            ids_nombres: Id de nombre de cada token (opcional, junto con
+                tabla_nombres)
+
+        Returns:
+            tuple: (arbol_sintactico, errores), como analizar(). Los errores
+                son los de las declaraciones que se volvieron a analizar: las
+                reutilizadas no tenían errores.
+        """
+        if self.ast is None:
+            raise ValueError("No hay un análisis previo para reanalizar")
+        if isinstance(self.tokens, VentanaTokens):
+            raise ValueError("El reanálisis incremental necesita la lista de tokens")
+        if self.arena is not None:
+            raise ValueError("El reanálisis incremental no admite el AST en arena")
+        desde, hasta = tramo
+        desplazamiento = len(tokens) - len(self.tokens)
+        if not 0 <= desde <= hasta <= len(tokens) or hasta - desplazamiento < desde:
+            raise ValueError(f"Rango de tokens inválido: {desde}-{hasta}")
+
+        # Declaraciones sin errores que no tocan el tramo, por su posición en
+        # los tokens nuevos. Una declaración depende de sus tokens y del
+        # siguiente (ej: un 'sino' después del bloque de un 'si'), por eso las
+        # anteriores deben terminar antes del tramo.
+        reutilizables = {}
+        for nodo, rango in zip(self.ast.hijos, self.rangos_declaraciones):
+            if rango is None:
+                continue
+            inicio, fin, linea = rango
+            if fin < desde:
+                reutilizables[inicio] = (nodo, fin, linea)
+            elif inicio + desplazamiento >= hasta:
+                reutilizables[inicio + desplazamiento] = (
+                    nodo,
+                    fin + desplazamiento,
+                    linea,
+                )
+
+        # Códigos de tipo: los trae el TokenBuffer o la ListaTokens; si no, se
+        # calculan solo los de los tokens que el análisis vuelve a recorrer
+        if isinstance(tokens, (TokenBuffer, ListaTokens)):
+            tipos = tokens.tipos
+            if getattr(tokens, "tabla_nombres", None) is not None:
+                tabla_nombres = tokens.tabla_nombres
+                ids_nombres = tokens.ids_nombres
+        else:
+            tipos = _TiposEnTuplas(tokens)
+        if tabla_nombres is None or ids_nombres is None:
+            tabla_nombres = self.tabla_nombres
+            ids_nombres = _IdsEnTabla(tokens, tabla_nombres)
+
+        self.tokens = tokens
+        self._usar_tuplas(tokens)
+        self.tipos = tipos
+        self._limite = len(tokens)
+        self.tabla_nombres = tabla_nombres
+        self.ids_nombres = ids_nombres
+        self.errores = []
+        self._panico = False
+        self._mover(0)
+        self._reutilizables = reutilizables
+        return self.analizar()
+
+    def analizar_paralelo(self, procesos=None):
+        """
+        Analiza un programa grande repartiendo sus declaraciones entre varios
+        procesos.
+
+        El nivel superior de la gramática es una secuencia DECLARACION*, así
+        que los tokens se dividen después de un ';' o un '}' con las llaves
+        balanceadas (sin separar un 'sino' de su 'si' ni el 'mientras' de un
+        'hacer'). Cada fragmento se analiza con un AnalizadorSintactico en un
+        ProcessPoolExecutor, sobre una ArenaAST que se envía entre procesos
+        mucho más rápido que un NodoAST por nodo. El PROGRAMA se arma en orden
+        con las declaraciones sin errores de cada fragmento, copiadas a
+        NodoAST, del mismo modo que reanalizar() reutiliza las de un análisis
+        previo. Los tramos con
+        errores se vuelven a analizar aquí sobre los tokens completos, por lo
+        que el AST y los errores (en orden) son idénticos a los de analizar().
+
+        Si el programa es pequeño o se pide un solo proceso, se analiza de
+        forma secuencial.
+
+        Args:
+            procesos (int): Cantidad de procesos (por defecto, uno por núcleo)
+
+        Returns:
+            tuple: (arbol_sintactico, errores), como analizar()
+        """
+        if self.arena is not None:
+            raise ValueError("El análisis paralelo no admite el AST en arena")
+        if not self.construir_ast:
+            raise ValueError("El análisis paralelo necesita construir el AST")
+        if isinstance(self.tokens, VentanaTokens):
+            raise ValueError("El análisis paralelo necesita la lista de tokens")
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        if procesos <= 1 or len(self.tokens) < self._TOKENS_MINIMOS_PARALELO:
+            return self.analizar()
+
+        puntos = self._puntos_division(procesos * self._FRAGMENTOS_POR_PROCESO)
+        if len(puntos) <= 2:
+            return self.analizar()
+
+        ids_nombres = self.ids_nombres
+        if isinstance(ids_nombres, _IdsEnTabla):
+            # Solo se leen los ids de los IDENTIFICADOR
+            tipos = self.tipos
+            ids_nombres = [
+                ids_nombres[i] if tipos[i] == TipoToken.IDENTIFICADOR else -1
+                for i in range(self._limite)
+            ]
+
+        # Los nodos copiados de las arenas forman el AST resultante: mientras
+        # se copian y se arma el PROGRAMA, el recolector de ciclos no
+        # encontraría basura y recorrería el heap una y otra vez (triplica el
+        # tiempo de la copia)
+        recolector_activo = gc.isenabled()
+        gc.disable()
+        try:
+            reutilizables = self._analizar_fragmentos(puntos, ids_nombres, procesos)
+            self.errores = []
+            self._panico = False
+            self._mover(0)
+            self._reutilizables = reutilizables
+            return self.analizar()
+        finally:
+            if recolector_activo:
+                gc.enable()
+
+    def _analizar_fragmentos(self, puntos, ids_nombres, procesos):
+        """
+        Analiza los fragmentos del análisis paralelo en un ProcessPoolExecutor.
+
+        Args:
+            puntos (list): Puntos de división de los tokens
+            ids_nombres: Id de nombre de cada token
+            procesos (int): Cantidad de procesos
+
+        Returns:
+            dict: Declaraciones reutilizables, por posición de inicio:
+                {inicio: (nodo, fin, linea)}
+        """
+        reutilizables = {}
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [
+                (
+                    inicio,
+                    ejecutor.submit(
+                        _analizar_fragmento,
+                        self.tokens[inicio:fin],
+                        self.tabla_nombres,
+                        ids_nombres[inicio:fin],
+                        self.recuperar_errores,
+                    ),
+                )
+                for inicio, fin in zip(puntos, puntos[1:])
+            ]
+            for desplazamiento, futuro in futuros:
+                try:
+                    resultado = futuro.result()
+                except Exception:
+                    # Si el proceso falla, el fragmento se analiza aquí
+                    continue
+                arena, declaraciones = resultado
+                for indice, inicio, fin, linea in declaraciones:
+                    reutilizables[inicio + desplazamiento] = (
+                        arena.a_ast(indice),
+                        fin + desplazamiento,
+                        linea,
+                    )
+        return reutilizables
+
+    def _puntos_division(self, cantidad):
+        """
+        Elige los puntos donde dividir los tokens para el análisis paralelo:
+        posiciones de nivel superior (llaves balanceadas) justo después de un
+        ';' o un '}'.
+
+        Args:
+            cantidad (int): Cantidad aproximada de fragmentos deseada
+
+        Returns:
+            list: Puntos de división crecientes (el primero es 0 y el último
+                len(self.tokens))
+        """
+        tipos = self.tipos
+        total = self._limite
+        tamano = max(1, total // cantidad)
+        puntos = [0]
+        siguiente = tamano
+        profundidad = 0
+        for posicion in range(total - 1):
+            tipo = tipos[posicion]
+            if tipo == TipoToken.LLAVE_IZQ:
+                profundidad += 1
+                continue
+            if tipo == TipoToken.LLAVE_DER:
+                profundidad -= 1
+                if profundidad < 0:
+                    profundidad = 0
+            elif tipo != TipoToken.PUNTOYCOMA:
+                continue
+            if profundidad or posicion + 1 < siguiente:
+                continue
+            tipo_siguiente = tipos[posicion + 1]
+            if tipo_siguiente == TipoToken.SINO or (
+                tipo == TipoToken.LLAVE_DER and tipo_siguiente == TipoToken.MIENTRAS
+            ):
+                continue
+            puntos.append(posicion + 1)
+            siguiente = posicion + 1 + tamano
+        puntos.append(total)
+        return puntos
+
+    def _ejecutar(self, regla):
+        """
+        Ejecuta una regla de la gramática sobre una pila explícita.
+
+        Cuando la regla en curso entrega una subregla con yield, la subregla
+        se apila; cuando termina, se desapila y su valor de retorno se envía
+        a la regla que la pidió. No se usa 'yield from' porque cada reanudación
+        recorrería en C toda la cadena de generadores.
+
+        Args:
+            regla (generator): Regla inicial
+
+        Returns:
+            El valor de retorno de la regla inicial
+        """
+        pila = [regla]
+        resultado = None
+        while pila:
+            try:
+                subregla = pila[-1].send(resultado)
+            except StopIteration as fin:
+                pila.pop()
+                resultado = fin.value
+            else:
+                pila.append(subregla)
+                resultado = None
+        return resultado
 
     def _avanzar(self):
         """
         Avanza al siguiente token en la lista.
         """
         self.posicion += 1
-        if self.posicion < len(self.tokens):
-            self.token_actual = self.tokens[self.posicion]
+        if self.posicion < self._limite:
+            self.token_actual = self._tuplas[self.posicion] or self._armar_tupla(self.posicion)
+            self.tipo_actual = self.tipos[self.posicion]
         else:
             self.token_actual = None
+            self.tipo_actual = None
 
-    def _token_actual_es(self, tipo_esperado):
+    def _mover(self, posicion):
         """
-        Verifica si el token actual es del tipo esperado.
+        Ubica el análisis en un token de la lista.
 
         Args:
-            tipo_esperado (str): Tipo de token esperado
+            posicion (int): Índice del token (puede ser el final de la lista)
+        """
+        self.posicion = posicion
+        if posicion < self._limite:
+            self.token_actual = self._tuplas[posicion] or self._armar_tupla(posicion)
+            self.tipo_actual = self.tipos[posicion]
+        else:
+            self.token_actual = None
+            self.tipo_actual = None
+
+    def _usar_tuplas(self, tokens):
+        """
+        Prepara las tuplas que recorre el análisis.
+
+        Args:
+            tokens: Tokens a analizar
+        """
+        if isinstance(tokens, TokenBuffer):
+            self._tuplas = _TuplasDeBuffer(tokens)
+            self._armar_tupla = self._tuplas.armar
+        else:
+            # Solo un flujo (VentanaTokens) devuelve None: pasado su final
+            self._tuplas = tokens
+            self._armar_tupla = _sin_tupla
+
+    def _token(self, posicion):
+        """
+        Obtiene un token como tupla (tipo, valor, linea).
+
+        Args:
+            posicion (int): Índice del token
 
         Returns:
-            bool: True si el token actual es del tipo esperado, False en caso contrario
+            tuple: Token de esa posición
         """
-        if self.token_actual is None:
-            return False
-        return self.token_actual[0] == tipo_esperado
+        return self._tuplas[posicion] or self._armar_tupla(posicion)
 
-    def _valor_actual_es(self, valor_esperado):
+    def _token_actual_es(self, tipo_esperado):
         """
-        Verifica si el valor del token actual coincide con el esperado.
+        Verifica si el token actual es del tipo esperado.
 
         Args:
-            valor_esperado (str): Valor esperado del token
+            tipo_esperado (int): Código de tipo de token esperado (TipoToken)
 
         Returns:
-            bool: True si el valor coincide, False en caso contrario
+            bool: True si el token actual es del tipo esperado, False en caso contrario
         """
-        if self.token_actual is None:
-            return False
-        return self.token_actual[1] == valor_esperado
+        return self.tipo_actual == tipo_esperado
 
     def _consumir(self, tipo_esperado, mensaje_error=None):
         """
         Consume un token del tipo esperado o genera un error.
 
         Args:
-            tipo_esperado (str): Tipo de token que se espera consumir
+            tipo_esperado (int): Código de tipo de token que se espera consumir
             mensaje_error (str): Mensaje personalizado de error (opcional)
 
         Returns:
@@ -147,7 +1054,7 @@ class AnalizadorSintactico:
                 self._agregar_error(mensaje_error, self._linea_actual())
             else:
                 self._agregar_error(
-                    f"Se esperaba '{tipo_esperado}' pero se llegó al final del archivo",
+                    f"Se esperaba '{TipoToken.VISIBLES[tipo_esperado]}' pero se llegó al final del archivo",
                     self._linea_actual(),
                 )
             return None
@@ -161,7 +1068,7 @@ class AnalizadorSintactico:
                 self._agregar_error(mensaje_error, self._linea_actual())
             else:
                 self._agregar_error(
-                    f"Se esperaba '{tipo_esperado}' pero se encontró '{self.token_actual[0]}'",
+                    f"Se esperaba '{TipoToken.VISIBLES[tipo_esperado]}' pero se encontró '{self.token_actual[0]}'",
                     self._linea_actual(),
                     f"Token encontrado: '{self.token_actual[1]}'",
                 )
@@ -187,6 +1094,8 @@ class AnalizadorSintactico:
             linea (int): Número de línea donde ocurrió el error
             detalle (str): Información adicional sobre el error (opcional)
         """
+        if self._panico:
+            return
         self.errores.append(
             {
                 "tipo": "SINTÁCTICO",
@@ -195,6 +1104,75 @@ class AnalizadorSintactico:
                 "detalle": detalle,
             }
         )
+        if self.recuperar_errores:
+            self._panico = True
+
+    def _sincronizar(self):
+        """
+        Modo pánico: descarta tokens hasta un punto desde el que se puede
+        seguir analizando. Se detiene después de un ';', antes de un '}' o
+        antes del inicio de una declaración (ver _inicio_declaracion()). Los
+        bloques '{ ... }' que encuentra se
+        descartan completos para no desparejar las llaves.
+        """
+        profundidad = 0
+        while self.token_actual is not None:
+            tipo = self.tipo_actual
+            if tipo == TipoToken.LLAVE_IZQ:
+                profundidad += 1
+            elif tipo == TipoToken.LLAVE_DER:
+                if profundidad == 0:
+                    break
+                profundidad -= 1
+            elif profundidad == 0:
+                if tipo == TipoToken.PUNTOYCOMA:
+                    self._avanzar()
+                    break
+                if self._inicio_declaracion():
+                    break
+            self._avanzar()
+        self._panico = False
+
+    def _inicio_declaracion(self):
+        """
+        Indica si el token actual inicia una declaración, mirando hasta dos
+        tokens por delante para no confundir el tipo de un parámetro (ej:
+        'entero a,') con una declaración nueva.
+
+        Returns:
+            bool: True ante una estructura de control, IDENTIFICADOR '=' o
+                TIPO IDENTIFICADOR seguido de '=' o '('
+        """
+        tipo = self.tipo_actual
+        if tipo in self._CODIGOS_ESTRUCTURAS_CONTROL:
+            return True
+        tipos = self.tipos
+        siguiente = self.posicion + 1
+        if tipo == TipoToken.IDENTIFICADOR:
+            return siguiente < self._limite and tipos[siguiente] == TipoToken.ASIGNACION
+        if tipo in self._CODIGOS_TIPOS_VALIDOS:
+            return (
+                siguiente + 1 < self._limite
+                and tipos[siguiente] == TipoToken.IDENTIFICADOR
+                and tipos[siguiente + 1] in (TipoToken.ASIGNACION, TipoToken.PARENTESIS_IZQ)
+            )
+        return False
+
+    @staticmethod
+    def _desplazar_lineas(raiz, diferencia):
+        """
+        Suma una diferencia a la línea de todos los nodos de un subárbol.
+
+        Args:
+            raiz (NodoAST): Raíz del subárbol
+            diferencia (int): Líneas a sumar (negativa si se borraron líneas)
+        """
+        pendientes = [raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.linea is not None:
+                nodo.linea += diferencia
+            pendientes.extend(nodo.hijos)
 
     # ========================================================================
     # MÉTODOS PARA CADA REGLA DE LA GRAMÁTICA
@@ -209,15 +1187,43 @@ class AnalizadorSintactico:
         Returns:
             NodoAST: Nodo raíz del programa
         """
-        nodo_programa = NodoAST("PROGRAMA", linea=1)
+        nodo_programa = self._nodo("PROGRAMA", linea=1)
+        rangos = self.rangos_declaraciones = []
+        reutilizables = self._reutilizables
 
         while self.token_actual is not None:
+            inicio = self.posicion
+
+            # Reanálisis: una declaración sin cambios se toma del AST anterior
+            if reutilizables and inicio in reutilizables:
+                declaracion, fin, linea_anterior = reutilizables[inicio]
+                linea = self.token_actual[2]
+                if linea != linea_anterior:
+                    self._desplazar_lineas(declaracion, linea - linea_anterior)
+                nodo_programa.agregar_hijo(declaracion)
+                rangos.append((inicio, fin, linea))
+                self._mover(fin)
+                continue
+
+            linea = self.token_actual[2]
+            cantidad_errores = len(self.errores)
             declaracion = self._declaracion()
+            if type(declaracion) is GeneratorType:
+                declaracion = yield declaracion
             if declaracion:
                 nodo_programa.agregar_hijo(declaracion)
+                rangos.append(
+                    (inicio, self.posicion, linea)
+                    if len(self.errores) == cantidad_errores
+                    else None
+                )
 
-            # Si hay errores, detener el análisis
-            if self.errores:
+            # Si hay errores, detener el análisis (en modo recuperación,
+            # resincronizar y seguir)
+            if self.recuperar_errores:
+                if self._panico:
+                    self._sincronizar()
+            elif self.errores:
                 break
 
         return nodo_programa
@@ -232,33 +1238,28 @@ class AnalizadorSintactico:
         Determina el tipo de declaración y delega al método apropiado.
 
         Returns:
-            NodoAST: Nodo de la declaración o None si hay error
+            NodoAST: Nodo de la declaración o None si hay error; para una
+                función o una estructura de control, el generador de la regla
+                que la analiza (quien llama lo entrega con yield)
         """
         if self.token_actual is None:
             return None
 
         # Verificar si es una palabra reservada de tipo
-        if (
-            self._token_actual_es("PALABRA_RESERVADA")
-            and self.token_actual[1] in self.TIPOS_VALIDOS
-        ):
+        if self.tipo_actual in self._CODIGOS_TIPOS_VALIDOS:
             # Puede ser declaración de variable o función
             return self._declaracion_variable_o_funcion()
 
         # Verificar si es una estructura de control
-        elif (
-            self._token_actual_es("PALABRA_RESERVADA")
-            and self.token_actual[1] in self.ESTRUCTURAS_CONTROL
-        ):
+        elif self.tipo_actual in self._CODIGOS_ESTRUCTURAS_CONTROL:
             return self._estructura_control()
 
         # Verificar si es una asignación (IDENTIFICADOR = EXPRESION;)
-        elif self._token_actual_es("IDENTIFICADOR"):
+        elif self._token_actual_es(TipoToken.IDENTIFICADOR):
             # Verificar si parece un tipo de dato inválido
             # Patrón: IDENTIFICADOR IDENTIFICADOR = ...
-            if self.posicion + 1 < len(self.tokens):
-                siguiente_token = self.tokens[self.posicion + 1]
-                if siguiente_token[0] == "IDENTIFICADOR":
+            if self.posicion + 1 < self._limite:
+                if self.tipos[self.posicion + 1] == TipoToken.IDENTIFICADOR:
                     # Probablemente un tipo de dato inválido
                     tipo_invalido = self.token_actual[1]
                     linea = self.token_actual[2]
@@ -287,7 +1288,8 @@ class AnalizadorSintactico:
         Ambas comienzan con TIPO IDENTIFICADOR, pero la función tiene paréntesis.
 
         Returns:
-            NodoAST: Nodo de declaración de variable o función
+            NodoAST: Nodo de declaración de variable (o None si hay error), o
+                el generador de la regla de la función
         """
         # Guardar posición para poder retroceder si es necesario
         tipo_token = self.token_actual
@@ -296,7 +1298,7 @@ class AnalizadorSintactico:
         self._avanzar()
 
         # Debe seguir un identificador
-        if not self._token_actual_es("IDENTIFICADOR"):
+        if not self._token_actual_es(TipoToken.IDENTIFICADOR):
             self._agregar_error(
                 f"Se esperaba un identificador después del tipo '{tipo}'",
                 self._linea_actual(),
@@ -305,15 +1307,16 @@ class AnalizadorSintactico:
 
         nombre_token = self.token_actual
         nombre = nombre_token[1]
+        id_nombre = self.ids_nombres[self.posicion]
         self._avanzar()
 
         # Verificar si es función (tiene paréntesis) o variable (tiene asignación)
-        if self._token_actual_es("PARENTESIS_IZQ"):
+        if self._token_actual_es(TipoToken.PARENTESIS_IZQ):
             # Es una función
-            return self._declaracion_funcion_continuar(tipo, nombre, linea)
-        elif self._token_actual_es("ASIGNACION"):
+            return self._declaracion_funcion_continuar(tipo, nombre, linea, id_nombre)
+        elif self._token_actual_es(TipoToken.ASIGNACION):
             # Es una variable
-            return self._declaracion_variable_continuar(tipo, nombre, linea)
+            return self._declaracion_variable_continuar(tipo, nombre, linea, id_nombre)
         else:
             self._agregar_error(
                 f"Se esperaba '=' o '(' después del identificador '{nombre}'",
@@ -322,7 +1325,7 @@ class AnalizadorSintactico:
             )
             return None
 
-    def _declaracion_variable_continuar(self, tipo, nombre, linea):
+    def _declaracion_variable_continuar(self, tipo, nombre, linea, id_nombre=None):
         """
         Continúa el análisis de una declaración de variable.
         Regla: TIPO IDENTIFICADOR '=' EXPRESION ';'
@@ -331,20 +1334,23 @@ class AnalizadorSintactico:
             tipo (str): Tipo de la variable
             nombre (str): Nombre de la variable
             linea (int): Número de línea
+            id_nombre (int): Id del nombre de la variable
 
         Returns:
             NodoAST: Nodo de declaración de variable
         """
-        nodo = NodoAST("DECLARACION_VARIABLE", linea=linea)
+        nodo = self._nodo("DECLARACION_VARIABLE", linea=linea)
 
         # Agregar tipo como hijo
-        nodo.agregar_hijo(NodoAST("TIPO", valor=tipo, linea=linea))
+        nodo.agregar_hijo(self._nodo("TIPO", valor=tipo, linea=linea))
 
         # Agregar identificador como hijo
-        nodo.agregar_hijo(NodoAST("IDENTIFICADOR", valor=nombre, linea=linea))
+        nodo.agregar_hijo(
+            self._nodo("IDENTIFICADOR", valor=nombre, linea=linea, id_nombre=id_nombre)
+        )
 
         # Consumir '='
-        self._consumir("ASIGNACION", f"Se esperaba '=' en la declaración de '{nombre}'")
+        self._consumir(TipoToken.ASIGNACION, f"Se esperaba '=' en la declaración de '{nombre}'")
 
         # Parsear expresión
         expresion = self._expresion()
@@ -352,11 +1358,11 @@ class AnalizadorSintactico:
             nodo.agregar_hijo(expresion)
 
         # Verificar si hay tokens inesperados después de la expresión (probablemente falta operador)
-        if not self._token_actual_es("PUNTOYCOMA") and self.token_actual is not None:
+        if not self._token_actual_es(TipoToken.PUNTOYCOMA) and self.token_actual is not None:
             if (
-                self._token_actual_es("NUMERO_ENTERO")
-                or self._token_actual_es("NUMERO_DECIMAL")
-                or self._token_actual_es("IDENTIFICADOR")
+                self._token_actual_es(TipoToken.NUMERO_ENTERO)
+                or self._token_actual_es(TipoToken.NUMERO_DECIMAL)
+                or self._token_actual_es(TipoToken.IDENTIFICADOR)
             ):
                 self._agregar_error(
                     f"Error en la expresión de la variable '{nombre}': falta operador",
@@ -368,14 +1374,14 @@ class AnalizadorSintactico:
         # Guardar línea del último token procesado (para reportar error correctamente)
         linea_ultimo_token = self._linea_actual()
         # Si el token actual no es un punto y coma, significa que el error está en la línea anterior
-        if not self._token_actual_es("PUNTOYCOMA"):
+        if not self._token_actual_es(TipoToken.PUNTOYCOMA):
             # Usar la línea del token anterior (donde debería estar el punto y coma)
             if self.posicion > 0:
-                linea_ultimo_token = self.tokens[self.posicion - 1][2]
+                linea_ultimo_token = self._token(self.posicion - 1)[2]
 
         # Consumir ';'
         if not self._consumir(
-            "PUNTOYCOMA",
+            TipoToken.PUNTOYCOMA,
             f"Se esperaba ';' al final de la declaración de la variable '{nombre}'",
         ):
             # Si falla, reportar en la línea correcta
@@ -392,18 +1398,19 @@ class AnalizadorSintactico:
         Returns:
             NodoAST: Nodo de asignación o None si hay error
         """
-        if not self._token_actual_es("IDENTIFICADOR"):
+        if not self._token_actual_es(TipoToken.IDENTIFICADOR):
             return None
 
         nombre = self.token_actual[1]
         linea = self.token_actual[2]
+        id_nombre = self.ids_nombres[self.posicion]
         self._avanzar()
 
         # Crear nodo de asignación
-        nodo = NodoAST("ASIGNACION", valor=nombre, linea=linea)
+        nodo = self._nodo("ASIGNACION", valor=nombre, linea=linea, id_nombre=id_nombre)
 
         # Consumir '='
-        if not self._consumir("ASIGNACION", f"Se esperaba '=' después de '{nombre}'"):
+        if not self._consumir(TipoToken.ASIGNACION, f"Se esperaba '=' después de '{nombre}'"):
             return None
 
         # Parsear expresión
@@ -414,14 +1421,14 @@ class AnalizadorSintactico:
         # Guardar línea del último token procesado (para reportar error correctamente)
         linea_ultimo_token = self._linea_actual()
         # Si el token actual no es un punto y coma, significa que el error está en la línea anterior
-        if not self._token_actual_es("PUNTOYCOMA"):
+        if not self._token_actual_es(TipoToken.PUNTOYCOMA):
             # Usar la línea del token anterior (donde debería estar el punto y coma)
             if self.posicion > 0:
-                linea_ultimo_token = self.tokens[self.posicion - 1][2]
+                linea_ultimo_token = self._token(self.posicion - 1)[2]
 
         # Consumir ';'
         if not self._consumir(
-            "PUNTOYCOMA",
+            TipoToken.PUNTOYCOMA,
             f"Se esperaba ';' al final de la asignación a '{nombre}'",
         ):
             # Si falla, reportar en la línea correcta
@@ -430,7 +1437,7 @@ class AnalizadorSintactico:
 
         return nodo
 
-    def _declaracion_funcion_continuar(self, tipo_retorno, nombre, linea):
+    def _declaracion_funcion_continuar(self, tipo_retorno, nombre, linea, id_nombre=None):
         """
         Continúa el análisis de una declaración de función.
         Regla: TIPO IDENTIFICADOR '(' PARAMETROS ')' BLOQUE
@@ -439,17 +1446,18 @@ class AnalizadorSintactico:
             tipo_retorno (str): Tipo de retorno de la función
             nombre (str): Nombre de la función
             linea (int): Número de línea
+            id_nombre (int): Id del nombre de la función
 
         Returns:
             NodoAST: Nodo de declaración de función
         """
-        nodo = NodoAST("DECLARACION_FUNCION", valor=nombre, linea=linea)
+        nodo = self._nodo("DECLARACION_FUNCION", valor=nombre, linea=linea, id_nombre=id_nombre)
 
         # Agregar tipo de retorno
-        nodo.agregar_hijo(NodoAST("TIPO_RETORNO", valor=tipo_retorno, linea=linea))
+        nodo.agregar_hijo(self._nodo("TIPO_RETORNO", valor=tipo_retorno, linea=linea))
 
         # Consumir '('
-        self._consumir("PARENTESIS_IZQ", f"Se esperaba '(' en la función '{nombre}'")
+        self._consumir(TipoToken.PARENTESIS_IZQ, f"Se esperaba '(' en la función '{nombre}'")
 
         # Parsear parámetros
         parametros = self._parametros()
@@ -460,10 +1468,10 @@ class AnalizadorSintactico:
         # no en sintáctico, ya que es una regla de significado, no de estructura.
 
         # Consumir ')'
-        self._consumir("PARENTESIS_DER", f"Se esperaba ')' en la función '{nombre}'")
+        self._consumir(TipoToken.PARENTESIS_DER, f"Se esperaba ')' en la función '{nombre}'")
 
         # Parsear bloque
-        bloque = self._bloque()
+        bloque = yield self._bloque()
         if bloque:
             nodo.agregar_hijo(bloque)
 
@@ -478,10 +1486,10 @@ class AnalizadorSintactico:
         Returns:
             NodoAST: Nodo con la lista de parámetros
         """
-        nodo_parametros = NodoAST("PARAMETROS", linea=self._linea_actual())
+        nodo_parametros = self._nodo("PARAMETROS", linea=self._linea_actual())
 
         # Si el siguiente token es ')', no hay parámetros
-        if self._token_actual_es("PARENTESIS_DER"):
+        if self._token_actual_es(TipoToken.PARENTESIS_DER):
             return nodo_parametros
 
         # Parsear primer parámetro
@@ -490,8 +1498,8 @@ class AnalizadorSintactico:
             nodo_parametros.agregar_hijo(parametro)
 
         # Parsear parámetros adicionales
-        while self._token_actual_es("COMA"):
-            self._consumir("COMA")
+        while self._token_actual_es(TipoToken.COMA):
+            self._consumir(TipoToken.COMA)
             parametro = self._parametro()
             if parametro:
                 nodo_parametros.agregar_hijo(parametro)
@@ -510,14 +1518,14 @@ class AnalizadorSintactico:
         linea = self._linea_actual()
 
         # Verificar tipo
-        if not self._token_actual_es("PALABRA_RESERVADA"):
+        if self.tipo_actual not in TipoToken.RESERVADAS:
             self._agregar_error(
                 "Se esperaba un tipo de dato en el parámetro", self._linea_actual()
             )
             return None
 
         tipo = self.token_actual[1]
-        if tipo not in self.TIPOS_VALIDOS:
+        if self.tipo_actual not in self._CODIGOS_TIPOS_VALIDOS:
             self._agregar_error(
                 f"Tipo de dato inválido en parámetro: '{tipo}'", self._linea_actual()
             )
@@ -526,18 +1534,21 @@ class AnalizadorSintactico:
         self._avanzar()
 
         # Verificar identificador
-        if not self._token_actual_es("IDENTIFICADOR"):
+        if not self._token_actual_es(TipoToken.IDENTIFICADOR):
             self._agregar_error(
                 "Se esperaba un identificador para el parámetro", self._linea_actual()
             )
             return None
 
         nombre = self.token_actual[1]
+        id_nombre = self.ids_nombres[self.posicion]
         self._avanzar()
 
-        nodo_parametro = NodoAST("PARAMETRO", linea=linea)
-        nodo_parametro.agregar_hijo(NodoAST("TIPO", valor=tipo, linea=linea))
-        nodo_parametro.agregar_hijo(NodoAST("IDENTIFICADOR", valor=nombre, linea=linea))
+        nodo_parametro = self._nodo("PARAMETRO", linea=linea)
+        nodo_parametro.agregar_hijo(self._nodo("TIPO", valor=tipo, linea=linea))
+        nodo_parametro.agregar_hijo(
+            self._nodo("IDENTIFICADOR", valor=nombre, linea=linea, id_nombre=id_nombre)
+        )
 
         return nodo_parametro
 
@@ -550,13 +1561,13 @@ class AnalizadorSintactico:
         Determina el tipo de estructura de control y delega.
 
         Returns:
-            NodoAST: Nodo de la estructura de control
+            Generador de la regla de la estructura de control, o None si hay error
         """
-        if self._valor_actual_es("si"):
+        if self._token_actual_es(TipoToken.SI):
             return self._estructura_si()
-        elif self._valor_actual_es("mientras"):
+        elif self._token_actual_es(TipoToken.MIENTRAS):
             return self._estructura_mientras()
-        elif self._valor_actual_es("hacer"):
+        elif self._token_actual_es(TipoToken.HACER):
             return self._estructura_hacer()
         else:
             self._agregar_error(
@@ -574,37 +1585,38 @@ class AnalizadorSintactico:
             NodoAST: Nodo de la estructura si
         """
         linea = self._linea_actual()
-        nodo = NodoAST("ESTRUCTURA_SI", linea=linea)
+        nodo = self._nodo("ESTRUCTURA_SI", linea=linea)
 
         # Consumir 'si'
-        self._consumir("PALABRA_RESERVADA")
+        self._consumir(TipoToken.SI)
 
         # Consumir '('
-        self._consumir("PARENTESIS_IZQ", "Se esperaba '(' después de 'si'")
+        self._consumir(TipoToken.PARENTESIS_IZQ, "Se esperaba '(' después de 'si'")
 
         # Parsear condición
         condicion = self._condicion()
         if condicion:
             nodo.agregar_hijo(condicion)
 
-        # Si hay errores en la condición, detener aquí para evitar errores en cascada
-        if self.errores:
+        # Si hay errores en la condición, detener aquí para evitar errores en
+        # cascada (el modo recuperación los evita descartando los siguientes)
+        if self.errores and not self.recuperar_errores:
             return nodo
 
         # Consumir ')'
-        self._consumir("PARENTESIS_DER", "Se esperaba ')' después de la condición")
+        self._consumir(TipoToken.PARENTESIS_DER, "Se esperaba ')' después de la condición")
 
         # Parsear bloque 'si'
-        bloque_si = self._bloque()
+        bloque_si = yield self._bloque()
         if bloque_si:
             nodo.agregar_hijo(bloque_si)
 
         # Verificar si hay 'sino'
-        if self._token_actual_es("PALABRA_RESERVADA") and self._valor_actual_es("sino"):
-            self._consumir("PALABRA_RESERVADA")
+        if self._token_actual_es(TipoToken.SINO):
+            self._consumir(TipoToken.SINO)
 
             # Parsear bloque 'sino'
-            bloque_sino = self._bloque()
+            bloque_sino = yield self._bloque()
             if bloque_sino:
                 bloque_sino.tipo = "BLOQUE_SINO"  # Marcar como bloque sino
                 nodo.agregar_hijo(bloque_sino)
@@ -621,13 +1633,13 @@ class AnalizadorSintactico:
             NodoAST: Nodo de la estructura mientras
         """
         linea = self._linea_actual()
-        nodo = NodoAST("ESTRUCTURA_MIENTRAS", linea=linea)
+        nodo = self._nodo("ESTRUCTURA_MIENTRAS", linea=linea)
 
         # Consumir 'mientras'
-        self._consumir("PALABRA_RESERVADA")
+        self._consumir(TipoToken.MIENTRAS)
 
         # Consumir '('
-        self._consumir("PARENTESIS_IZQ", "Se esperaba '(' después de 'mientras'")
+        self._consumir(TipoToken.PARENTESIS_IZQ, "Se esperaba '(' después de 'mientras'")
 
         # Parsear condición
         condicion = self._condicion()
@@ -635,10 +1647,10 @@ class AnalizadorSintactico:
             nodo.agregar_hijo(condicion)
 
         # Consumir ')'
-        self._consumir("PARENTESIS_DER", "Se esperaba ')' después de la condición")
+        self._consumir(TipoToken.PARENTESIS_DER, "Se esperaba ')' después de la condición")
 
         # Parsear bloque
-        bloque = self._bloque()
+        bloque = yield self._bloque()
         if bloque:
             nodo.agregar_hijo(bloque)
 
@@ -654,25 +1666,23 @@ class AnalizadorSintactico:
             NodoAST: Nodo de la estructura hacer
         """
         linea = self._linea_actual()
-        nodo = NodoAST("ESTRUCTURA_HACER", linea=linea)
+        nodo = self._nodo("ESTRUCTURA_HACER", linea=linea)
 
         # Consumir 'hacer'
-        self._consumir("PALABRA_RESERVADA")
+        self._consumir(TipoToken.HACER)
 
         # Parsear bloque
-        bloque = self._bloque()
+        bloque = yield self._bloque()
         if bloque:
             nodo.agregar_hijo(bloque)
 
         # Capturar línea de la llave de cierre del bloque (último token procesado)
         linea_cierre_bloque = (
-            self.tokens[self.posicion - 1][2] if self.posicion > 0 else linea
+            self._token(self.posicion - 1)[2] if self.posicion > 0 else linea
         )
 
         # Verificar y consumir 'mientras'
-        if not self._token_actual_es("PALABRA_RESERVADA") or not self._valor_actual_es(
-            "mientras"
-        ):
+        if not self._token_actual_es(TipoToken.MIENTRAS):
             self._agregar_error(
                 "Se esperaba 'mientras' después del bloque de la estructura hacer",
                 linea_cierre_bloque,
@@ -680,10 +1690,10 @@ class AnalizadorSintactico:
             )
             return nodo
 
-        self._consumir("PALABRA_RESERVADA")  # Consumir 'mientras'
+        self._consumir(TipoToken.MIENTRAS)  # Consumir 'mientras'
 
         # Consumir '('
-        self._consumir("PARENTESIS_IZQ", "Se esperaba '(' después de 'mientras'")
+        self._consumir(TipoToken.PARENTESIS_IZQ, "Se esperaba '(' después de 'mientras'")
 
         # Parsear condición
         condicion = self._condicion()
@@ -691,7 +1701,7 @@ class AnalizadorSintactico:
             nodo.agregar_hijo(condicion)
 
         # Consumir ')'
-        self._consumir("PARENTESIS_DER", "Se esperaba ')' después de la condición")
+        self._consumir(TipoToken.PARENTESIS_DER, "Se esperaba ')' después de la condición")
 
         return nodo
 
@@ -705,26 +1715,40 @@ class AnalizadorSintactico:
             NodoAST: Nodo del bloque
         """
         linea_inicio = self._linea_actual()
-        nodo = NodoAST("BLOQUE", linea=linea_inicio)
+        nodo = self._nodo("BLOQUE", linea=linea_inicio)
 
         # Consumir '{'
-        self._consumir("LLAVE_IZQ", "Se esperaba '{' al inicio del bloque")
+        abierto = self._consumir(TipoToken.LLAVE_IZQ, "Se esperaba '{' al inicio del bloque")
+        if self.recuperar_errores:
+            # Sin '{' no hay un bloque que recorrer; con él, las declaraciones
+            # del bloque vuelven a informar sus errores
+            if abierto is None:
+                return nodo
+            self._panico = False
 
         # Parsear declaraciones hasta encontrar '}'
-        while not self._token_actual_es("LLAVE_DER") and self.token_actual is not None:
+        while not self._token_actual_es(TipoToken.LLAVE_DER) and self.token_actual is not None:
             declaracion = self._declaracion()
+            if type(declaracion) is GeneratorType:
+                declaracion = yield declaracion
             if declaracion:
                 nodo.agregar_hijo(declaracion)
 
-            # Si hay errores, detener
-            if self.errores:
+            # Si hay errores, detener (en modo recuperación, resincronizar y seguir)
+            if self.recuperar_errores:
+                if self._panico:
+                    self._sincronizar()
+            elif self.errores:
                 break
 
         # SIEMPRE verificar la llave de cierre (incluso si hay errores previos)
         # Si falta la llave, es probable que sea la causa raíz del problema
-        if not self._token_actual_es("LLAVE_DER"):
-            # Limpiar errores anteriores si falta la llave (es la causa raíz)
-            if self.errores:
+        if not self._token_actual_es(TipoToken.LLAVE_DER):
+            # Limpiar errores anteriores si falta la llave (es la causa raíz).
+            # En modo recuperación se conservan y la llave se informa siempre.
+            if self.recuperar_errores:
+                self._panico = False
+            elif self.errores:
                 # Si ya hay errores y falta la llave, el problema es la llave faltante
                 self.errores = []
 
@@ -735,7 +1759,7 @@ class AnalizadorSintactico:
                 f"El bloque se abrió en la línea {linea_inicio} pero no se cerró correctamente",
             )
         else:
-            self._consumir("LLAVE_DER", "Se esperaba '}' al final del bloque")
+            self._consumir(TipoToken.LLAVE_DER, "Se esperaba '}' al final del bloque")
 
         return nodo
 
@@ -743,13 +1767,15 @@ class AnalizadorSintactico:
         """
         Regla: CONDICION → EXPRESION COMPARADOR EXPRESION
 
-        Parsea una condición (comparación entre dos expresiones).
+        Parsea una condición (comparación entre dos expresiones). Los
+        comparadores son los operadores de OPERADORES_BINARIOS con
+        PRECEDENCIA_COMPARACION.
 
         Returns:
             NodoAST: Nodo de la condición
         """
         linea = self._linea_actual()
-        nodo = NodoAST("CONDICION", linea=linea)
+        nodo = self._nodo("CONDICION", linea=linea)
 
         # Parsear expresión izquierda
         expr_izq = self._expresion()
@@ -757,24 +1783,19 @@ class AnalizadorSintactico:
             nodo.agregar_hijo(expr_izq)
 
         # Verificar comparador
-        comparador = None
-        if self._token_actual_es("COMPARACION"):
-            comparador = self.token_actual[1]
-            self._consumir("COMPARACION")
-        elif self._token_actual_es("MENORQUE"):
-            comparador = self.token_actual[1]
-            self._consumir("MENORQUE")
-        elif self._token_actual_es("MAYORQUE"):
-            comparador = self.token_actual[1]
-            self._consumir("MAYORQUE")
-        else:
+        entrada = None
+        if self.tipo_actual in self._CODIGOS_OPERADORES:
+            entrada = self.OPERADORES_BINARIOS.get(self.token_actual[1])
+        if entrada is None or entrada[0] != self.PRECEDENCIA_COMPARACION:
             self._agregar_error(
                 "Se esperaba un comparador (==, !=, <, >, <=, >=)", self._linea_actual()
             )
             return nodo
+        comparador = self.token_actual[1]
+        self._avanzar()
 
         # Verificar si hay un '=' adicional después del comparador (ej: ===)
-        if self._token_actual_es("ASIGNACION"):
+        if self._token_actual_es(TipoToken.ASIGNACION):
             self._agregar_error(
                 f"Comparador inválido: '{comparador}=' no es válido",
                 self._linea_actual(),
@@ -783,7 +1804,7 @@ class AnalizadorSintactico:
             return nodo
 
         # Agregar comparador como hijo
-        nodo.agregar_hijo(NodoAST("COMPARADOR", valor=comparador, linea=linea))
+        nodo.agregar_hijo(self._nodo("COMPARADOR", valor=comparador, linea=linea))
 
         # Parsear expresión derecha
         expr_der = self._expresion()
@@ -794,134 +1815,157 @@ class AnalizadorSintactico:
 
     def _expresion(self):
         """
-        Regla: EXPRESION → TERMINO (('+' | '-') TERMINO)*
+        Regla: EXPRESION → OPERANDO (OPERADOR_BINARIO OPERANDO)*
+               OPERANDO  → NUMERO_ENTERO | NUMERO_DECIMAL | IDENTIFICADOR | CADENA
+                           | 'verdadero' | 'falso' | '(' EXPRESION ')'
 
-        Parsea una expresión aritmética con suma y resta.
+        Parsea una expresión por precedencia de operadores en un único ciclo
+        dirigido por OPERADORES_BINARIOS (precedence climbing sobre una pila
+        explícita). Antes de apilar un operador se reducen los operadores
+        pendientes que ligan más fuerte (o igual, si es asociativo por la
+        izquierda); cada '(' apila una marca que detiene las reducciones
+        hasta el ')' correspondiente.
+
+        Cada OPERACION_BINARIA lleva la línea donde empieza su operando
+        izquierdo. Si un operando tiene un error (None), la operación cuyo
+        operando derecho falta no se crea y se conserva el izquierdo.
 
         Returns:
             NodoAST: Nodo de la expresión
         """
-        linea = self._linea_actual()
-
-        # Parsear primer término
-        nodo = self._termino()
-
-        # Parsear operadores + o - y términos adicionales
-        while self._token_actual_es("OPERADOR") and self.token_actual[1] in ["+", "-"]:
-            operador = self.token_actual[1]
-            self._consumir("OPERADOR")
-
-            termino_der = self._termino()
-            if termino_der:
-                # Crear nodo de operación binaria
-                nodo_operacion = NodoAST(
-                    "OPERACION_BINARIA", valor=operador, linea=linea
+        tokens = self._tuplas
+        armar_tupla = self._armar_tupla
+        tipos = self.tipos
+        ids_nombres = self.ids_nombres
+        total = self._limite
+        nodos_literales = self._NODOS_LITERALES
+        nuevo_nodo = self._nodo
+        operadores_expresion = self._operadores_expresion
+        codigos_operadores = self._CODIGOS_OPERADORES
+        parentesis_izq = TipoToken.PARENTESIS_IZQ
+        identificador = TipoToken.IDENTIFICADOR
+
+        # Operadores pendientes con su operando izquierdo: (precedencia,
+        # operador, izquierdo, línea del izquierdo). Un '(' es (0, None,
+        # None, línea del '('): como todas las precedencias son mayores que
+        # cero, detiene las reducciones. El operando en curso y la línea
+        # donde empieza se llevan en nodo y linea.
+        pila = []
+
+        posicion = self.posicion
+        tipo = self.tipo_actual
+
+        while True:
+            # OPERANDO
+            if tipo == parentesis_izq:
+                pila.append((0, None, None, (tokens[posicion] or armar_tupla(posicion))[2]))
+                posicion += 1
+                tipo = tipos[posicion] if posicion < total else None
+                continue
+            if tipo == identificador:
+                token = tokens[posicion] or armar_tupla(posicion)
+                linea = token[2]
+                nodo = nuevo_nodo("IDENTIFICADOR", token[1], None, linea, ids_nombres[posicion])
+                posicion += 1
+            elif tipo in nodos_literales:
+                token = tokens[posicion] or armar_tupla(posicion)
+                linea = token[2]
+                nodo = nuevo_nodo(nodos_literales[tipo], token[1], None, linea)
+                posicion += 1
+            else:
+                self._mover(posicion)
+                token = self.token_actual
+                linea = self._linea_actual()
+                self._agregar_error(
+                    "Factor inesperado en expresión",
+                    linea,
+                    f"Token: '{token[1] if token else 'EOF'}'",
                 )
-                nodo_operacion.agregar_hijo(nodo)
-                nodo_operacion.agregar_hijo(termino_der)
-                nodo = nodo_operacion
-
-        return nodo
-
-    def _termino(self):
-        """
-        Regla: TERMINO → FACTOR (('*' | '/' | '%') FACTOR)*
-
-        Parsea un término aritmético con multiplicación, división y módulo.
-
-        Returns:
-            NodoAST: Nodo del término
-        """
-        linea = self._linea_actual()
-
-        # Parsear primer factor
-        nodo = self._factor()
-
-        # Parsear operadores *, / o % y factores adicionales
-        while self._token_actual_es("OPERADOR") and self.token_actual[1] in [
-            "*",
-            "/",
-            "%",
-        ]:
-            operador = self.token_actual[1]
-            self._consumir("OPERADOR")
-
-            factor_der = self._factor()
-            if factor_der:
-                # Crear nodo de operación binaria
-                nodo_operacion = NodoAST(
-                    "OPERACION_BINARIA", valor=operador, linea=linea
+                nodo = None
+            tipo = tipos[posicion] if posicion < total else None
+
+            # OPERADOR: reducir lo pendiente y apilar el operador, o cerrar
+            # paréntesis mientras no siga un operador
+            while True:
+                entrada = None
+                if tipo in codigos_operadores:
+                    operador = (tokens[posicion] or armar_tupla(posicion))[1]
+                    entrada = operadores_expresion.get(operador)
+
+                # Se reducen los pendientes de mayor precedencia (o igual, si
+                # el operador reduce los iguales). Sin operador, precedencia 0:
+                # se reduce hasta el '(' o el inicio de la expresión.
+                if entrada is None:
+                    precedencia = 0
+                    reduce_iguales = False
+                else:
+                    precedencia, reduce_iguales = entrada
+                while pila:
+                    anterior = pila[-1]
+                    previa = anterior[0]
+                    if previa < precedencia or (previa == precedencia and not reduce_iguales):
+                        break
+                    pila.pop()
+                    izquierdo = anterior[2]
+                    linea = anterior[3]
+                    if nodo is None:
+                        nodo = izquierdo
+                    else:
+                        nodo = nuevo_nodo(
+                            "OPERACION_BINARIA",
+                            anterior[1],
+                            [izquierdo, nodo] if izquierdo is not None else [nodo],
+                            linea,
+                        )
+
+                if entrada is not None:
+                    pila.append((precedencia, operador, nodo, linea))
+                    posicion += 1
+                    tipo = tipos[posicion] if posicion < total else None
+                    break
+
+                self._mover(posicion)
+                if not pila:
+                    return nodo
+                # El operando entre paréntesis empieza en el '('
+                linea = pila.pop()[3]
+                self._consumir(
+                    TipoToken.PARENTESIS_DER, "Se esperaba ')' después de la expresión"
                 )
-                nodo_operacion.agregar_hijo(nodo)
-                nodo_operacion.agregar_hijo(factor_der)
-                nodo = nodo_operacion
-
-        return nodo
+                posicion = self.posicion
+                tipo = self.tipo_actual
 
-    def _factor(self):
-        """
-        Regla: FACTOR → NUMERO_ENTERO
-                      | NUMERO_DECIMAL
-                      | IDENTIFICADOR
-                      | CADENA
-                      | 'verdadero'
-                      | 'falso'
-                      | '(' EXPRESION ')'
-
-        Parsea un factor (elemento básico de una expresión).
-
-        Returns:
-            NodoAST: Nodo del factor
-        """
-        linea = self._linea_actual()
-
-        # Número entero
-        if self._token_actual_es("NUMERO_ENTERO"):
-            valor = self.token_actual[1]
-            self._consumir("NUMERO_ENTERO")
-            return NodoAST("NUMERO_ENTERO", valor=valor, linea=linea)
-
-        # Número decimal
-        elif self._token_actual_es("NUMERO_DECIMAL"):
-            valor = self.token_actual[1]
-            self._consumir("NUMERO_DECIMAL")
-            return NodoAST("NUMERO_DECIMAL", valor=valor, linea=linea)
-
-        # Identificador (variable)
-        elif self._token_actual_es("IDENTIFICADOR"):
-            valor = self.token_actual[1]
-            self._consumir("IDENTIFICADOR")
-            return NodoAST("IDENTIFICADOR", valor=valor, linea=linea)
-
-        # Cadena
-        elif self._token_actual_es("CADENA_SIMPLE") or self._token_actual_es(
-            "CADENA_DOBLE"
-        ):
-            tipo_cadena = self.token_actual[0]
-            valor = self.token_actual[1]
-            self._consumir(tipo_cadena)
-            return NodoAST("CADENA", valor=valor, linea=linea)
-
-        # Booleanos: verdadero o falso
-        elif self._token_actual_es("PALABRA_RESERVADA") and self.token_actual[1] in [
-            "verdadero",
-            "falso",
-        ]:
-            valor = self.token_actual[1]
-            self._consumir("PALABRA_RESERVADA")
-            return NodoAST("BOOLEANO", valor=valor, linea=linea)
-
-        # Expresión entre paréntesis
-        elif self._token_actual_es("PARENTESIS_IZQ"):
-            self._consumir("PARENTESIS_IZQ")
-            expresion = self._expresion()
-            self._consumir("PARENTESIS_DER", "Se esperaba ')' después de la expresión")
-            return expresion
-
-        else:
-            self._agregar_error(
-                "Factor inesperado en expresión",
-                self._linea_actual(),
-                f"Token: '{self.token_actual[1] if self.token_actual else 'EOF'}'",
-            )
-            return None
+def _analizar_fragmento(tokens, tabla_nombres, ids_nombres, recuperar_errores):
+    """
+    Analiza un fragmento de los tokens en un proceso del análisis paralelo.
+
+    El AST se construye en una ArenaAST: sus arreglos se envían al proceso
+    principal mucho más rápido que un objeto por nodo.
+
+    Args:
+        tokens (list): Tokens del fragmento
+        tabla_nombres (TablaNombres): Tabla de nombres del programa completo
+        ids_nombres: Id de nombre de cada token del fragmento
+        recuperar_errores (bool): Modo de errores del analizador
+
+    Returns:
+        tuple: (arena, declaraciones), donde declaraciones tiene el
+            (indice, inicio, fin, linea) de cada declaración analizada sin
+            errores: su nodo en la arena y su rango de tokens relativo al
+            fragmento
+    """
+    analizador = AnalizadorSintactico(
+        tokens,
+        tabla_nombres,
+        ids_nombres,
+        usar_arena=True,
+        recuperar_errores=recuperar_errores,
+    )
+    ast, _ = analizador.analizar()
+    if ast is None:
+        return analizador.arena, []
+    return analizador.arena, [
+        (nodo.indice, rango[0], rango[1], rango[2])
+        for nodo, rango in zip(ast.hijos, analizador.rangos_declaraciones)
+        if rango is not None
+    ]
@@ -0,0 +1,521 @@
+"""
+Autómata finito determinista (AFD) generado a partir de TOKEN_ESPECIFICACION.
+Compila las expresiones regulares de la especificación a una tabla de
+transiciones y la recorre con un controlador de coincidencia máxima.
+"""
+
+import re
+
+# Estado muerto del AFD: su fila de transiciones apunta siempre a sí mismo
+ESTADO_MUERTO = 0
+
+
+class _ConstructorNFA:
+    """
+    Traduce las expresiones de la especificación a un autómata finito no
+    determinista (construcción de Thompson).
+
+    Solo admite el subconjunto de la sintaxis de `re` que usa la
+    especificación: literales, escapes, clases de caracteres, '.', grupos
+    (capturadores o no), alternativas '|' y los cuantificadores '*', '+' y
+    '?' (voraces o perezosos).
+    """
+
+    def __init__(self):
+        self.transiciones = []  # estado -> [(id_atomo, destino), ...]
+        self.epsilon = []  # estado -> [destino, ...]
+        self.alternativa = []  # estado -> índice del token al que pertenece
+        self.atomos = []  # id_atomo -> texto de la expresión de un carácter
+        self._ids_atomos = {}
+        self._alternativa_actual = 0
+
+    def agregar(self, patron, alternativa):
+        """
+        Agrega la expresión de un token al autómata.
+
+        Args:
+            patron (str): Expresión regular del token
+            alternativa (int): Índice del token en la especificación
+
+        Returns:
+            tuple: (estado_inicial, estado_final, es_perezosa)
+        """
+        self._alternativa_actual = alternativa
+        self._patron = patron
+        self._pos = 0
+        self._perezosa = False
+        inicio, fin = self._alternativas()
+        if self._pos != len(patron):
+            raise ValueError(
+                f"Expresión no admitida por el autómata: {patron!r} (posición {self._pos})"
+            )
+        return inicio, fin, self._perezosa
+
+    def _nuevo_estado(self):
+        self.transiciones.append([])
+        self.epsilon.append([])
+        self.alternativa.append(self._alternativa_actual)
+        return len(self.transiciones) - 1
+
+    def _siguiente(self):
+        if self._pos < len(self._patron):
+            return self._patron[self._pos]
+        return None
+
+    def _alternativas(self):
+        inicio, fin = self._concatenacion()
+        if self._siguiente() != "|":
+            return inicio, fin
+
+        nuevo_inicio = self._nuevo_estado()
+        nuevo_fin = self._nuevo_estado()
+        self.epsilon[nuevo_inicio].append(inicio)
+        self.epsilon[fin].append(nuevo_fin)
+        while self._siguiente() == "|":
+            self._pos += 1
+            inicio, fin = self._concatenacion()
+            self.epsilon[nuevo_inicio].append(inicio)
+            self.epsilon[fin].append(nuevo_fin)
+        return nuevo_inicio, nuevo_fin
+
+    def _concatenacion(self):
+        inicio = fin = self._nuevo_estado()
+        while self._siguiente() not in (None, "|", ")"):
+            sub_inicio, sub_fin = self._repeticion()
+            self.epsilon[fin].append(sub_inicio)
+            fin = sub_fin
+        return inicio, fin
+
+    def _repeticion(self):
+        inicio, fin = self._atomo()
+        cuantificador = self._siguiente()
+        if cuantificador not in ("*", "+", "?"):
+            return inicio, fin
+        self._pos += 1
+        if self._siguiente() == "?":
+            # Cuantificador perezoso: el token termina en su primera aceptación
+            self._pos += 1
+            self._perezosa = True
+
+        nuevo_inicio = self._nuevo_estado()
+        nuevo_fin = self._nuevo_estado()
+        self.epsilon[nuevo_inicio].append(inicio)
+        self.epsilon[fin].append(nuevo_fin)
+        if cuantificador in ("*", "?"):
+            self.epsilon[nuevo_inicio].append(nuevo_fin)
+        if cuantificador in ("*", "+"):
+            self.epsilon[fin].append(inicio)
+        return nuevo_inicio, nuevo_fin
+
+    def _atomo(self):
+        caracter = self._siguiente()
+        if caracter is None or caracter in "*+?":
+            raise ValueError(f"Expresión no admitida por el autómata: {self._patron!r}")
+
+        if caracter == "(":
+            self._pos += 1
+            if self._patron.startswith("?:", self._pos):
+                self._pos += 2
+            elif self._siguiente() == "?":
+                raise ValueError(
+                    f"Grupo no admitido por el autómata: {self._patron!r}"
+                )
+            inicio, fin = self._alternativas()
+            if self._siguiente() != ")":
+                raise ValueError(f"Falta ')' en la expresión: {self._patron!r}")
+            self._pos += 1
+            return inicio, fin
+
+        inicio_texto = self._pos
+        if caracter == "\\":
+            self._pos += 2
+        elif caracter == "[":
+            self._pos += 1
+            if self._siguiente() == "^":
+                self._pos += 1
+            if self._siguiente() == "]":
+                self._pos += 1
+            while self._siguiente() not in (None, "]"):
+                self._pos += 2 if self._siguiente() == "\\" else 1
+            if self._siguiente() is None:
+                raise ValueError(f"Falta ']' en la expresión: {self._patron!r}")
+            self._pos += 1
+        else:
+            self._pos += 1
+
+        texto = self._patron[inicio_texto : self._pos]
+        id_atomo = self._ids_atomos.get(texto)
+        if id_atomo is None:
+            id_atomo = len(self.atomos)
+            self.atomos.append(texto)
+            self._ids_atomos[texto] = id_atomo
+
+        inicio = self._nuevo_estado()
+        fin = self._nuevo_estado()
+        self.transiciones[inicio].append((id_atomo, fin))
+        return inicio, fin
+
+
+class _MapaClases(dict):
+    """
+    Tabla para str.translate() que convierte cada carácter en el código de su
+    clase de equivalencia. Las clases de los caracteres no ASCII se calculan
+    la primera vez que aparecen.
+    """
+
+    def __init__(self, automata):
+        super().__init__()
+        self._automata = automata
+
+    def __missing__(self, ordinal):
+        clase = chr(self._automata._clase_de(chr(ordinal)))
+        self[ordinal] = clase
+        return clase
+
+
+class AutomataLexico:
+    """
+    Analizador léxico dirigido por una tabla de transiciones.
+
+    Cada token de la especificación se compila a un AFN y todos se combinan
+    en un único AFD mediante la construcción de subconjuntos. El alfabeto se
+    reduce a clases de caracteres equivalentes (caracteres que ninguna
+    expresión distingue), y el texto se traduce a esas clases de una sola vez
+    antes de recorrerlo.
+
+    La elección del token respeta la semántica de la alternativa de `re`:
+    gana el primer token de la especificación que coincide, con la
+    coincidencia más larga de su propia expresión (o la más corta si usa un
+    cuantificador perezoso). Para ello, cuando un estado acepta el token k se
+    descartan los hilos de los tokens posteriores a k.
+    """
+
+    def __init__(self, especificacion, ignorados=()):
+        """
+        Compila la especificación de tokens.
+
+        Args:
+            especificacion (list): Pares (nombre, expresión) en orden de prioridad
+            ignorados: Nombres de los tokens que se reconocen pero no se entregan
+        """
+        self.nombres = [nombre for nombre, _ in especificacion]
+        ignorados = set(ignorados)
+        self._ignorados = [nombre in ignorados for nombre in self.nombres]
+
+        nfa = _ConstructorNFA()
+        self._nfa = nfa
+        iniciales = []
+        self._aceptacion = {}  # estado final del AFN -> índice del token
+        self._perezosas = set()
+        for indice, (_, patron) in enumerate(especificacion):
+            inicio, fin, perezosa = nfa.agregar(patron, indice)
+            iniciales.append(inicio)
+            self._aceptacion[fin] = indice
+            if perezosa:
+                self._perezosas.add(indice)
+
+        # Expresiones de un carácter que deciden la clase de cada carácter
+        self._atomos = [re.compile(texto) for texto in nfa.atomos]
+        self._clases = {}  # firma -> código de clase
+        self._atomos_de_clase = []  # código de clase -> ids de átomo que la incluyen
+        self.mapa_clases = _MapaClases(self)
+
+        # Estados del AFD (el 0 es el estado muerto)
+        self._estados = {frozenset(): ESTADO_MUERTO}
+        self._conjuntos = [frozenset()]
+        self.tabla = [[]]
+        self.acepta = [-1]
+        self._pendientes = []
+
+        for ordinal in range(128):
+            self.mapa_clases[ordinal] = chr(self._clase_de(chr(ordinal)))
+        # Tabla de bytes.translate(): clase de cada carácter ASCII
+        self._tabla_ascii = bytes(ord(self.mapa_clases[o]) for o in range(128))
+        self._tabla_ascii += bytes(128)
+        self.inicial = self._estado(self._cerradura(iniciales))
+        self._completar()
+        self._saltos_validos = -1
+        self.saltos = []
+
+    def _cerradura(self, estados):
+        """
+        Calcula la cerradura épsilon de un conjunto de estados del AFN y
+        descarta los hilos que ya no pueden ganar.
+
+        Args:
+            estados: Estados del AFN
+
+        Returns:
+            frozenset: Conjunto de estados resultante
+        """
+        epsilon = self._nfa.epsilon
+        visitados = set(estados)
+        pila = list(estados)
+        while pila:
+            for destino in epsilon[pila.pop()]:
+                if destino not in visitados:
+                    visitados.add(destino)
+                    pila.append(destino)
+
+        aceptadas = [self._aceptacion[e] for e in visitados if e in self._aceptacion]
+        if not aceptadas:
+            return frozenset(visitados)
+
+        # El token k ya coincide: los posteriores nunca se elegirán
+        ganadora = min(aceptadas)
+        alternativa = self._nfa.alternativa
+        visitados = {e for e in visitados if alternativa[e] <= ganadora}
+        if ganadora in self._perezosas:
+            # Un token perezoso termina en su primera aceptación
+            visitados = {
+                e
+                for e in visitados
+                if alternativa[e] != ganadora or e in self._aceptacion
+            }
+        return frozenset(visitados)
+
+    def _estado(self, conjunto):
+        """
+        Devuelve el número de estado del AFD para un conjunto de estados del
+        AFN, creándolo si es nuevo.
+        """
+        numero = self._estados.get(conjunto)
+        if numero is None:
+            numero = len(self._conjuntos)
+            self._estados[conjunto] = numero
+            self._conjuntos.append(conjunto)
+            self.tabla.append([])
+            aceptadas = [self._aceptacion[e] for e in conjunto if e in self._aceptacion]
+            self.acepta.append(min(aceptadas) if aceptadas else -1)
+            self._pendientes.append(numero)
+        return numero
+
+    def _transicion(self, numero, clase):
+        """
+        Calcula el estado destino desde un estado del AFD con una clase de
+        caracteres.
+        """
+        atomos = self._atomos_de_clase[clase]
+        transiciones = self._nfa.transiciones
+        destinos = [
+            destino
+            for estado in self._conjuntos[numero]
+            for id_atomo, destino in transiciones[estado]
+            if id_atomo in atomos
+        ]
+        if not destinos:
+            return ESTADO_MUERTO
+        return self._estado(self._cerradura(destinos))
+
+    def _completar(self):
+        """
+        Llena las filas de la tabla de transiciones que falten, incluidos los
+        estados que aparezcan mientras tanto.
+        """
+        numero_clases = len(self._atomos_de_clase)
+        self.tabla[ESTADO_MUERTO].extend(
+            [ESTADO_MUERTO] * (numero_clases - len(self.tabla[ESTADO_MUERTO]))
+        )
+        pendientes = list(range(1, len(self._conjuntos)))
+        self._pendientes = []
+        while pendientes:
+            for numero in pendientes:
+                fila = self.tabla[numero]
+                for clase in range(len(fila), numero_clases):
+                    fila.append(self._transicion(numero, clase))
+            pendientes = self._pendientes
+            self._pendientes = []
+
+    def _clase_de(self, caracter):
+        """
+        Obtiene la clase de equivalencia de un carácter. Si es una clase nueva
+        se agrega su columna a la tabla de transiciones.
+
+        Args:
+            caracter (str): Carácter a clasificar
+
+        Returns:
+            int: Código de la clase
+        """
+        firma = tuple(
+            id_atomo
+            for id_atomo, atomo in enumerate(self._atomos)
+            if atomo.fullmatch(caracter)
+        )
+        clase = self._clases.get(firma)
+        if clase is None:
+            clase = len(self._atomos_de_clase)
+            if clase > 255:
+                raise ValueError("Demasiadas clases de caracteres para el autómata")
+            self._clases[firma] = clase
+            self._atomos_de_clase.append(frozenset(firma))
+            if len(self.tabla) > 1:
+                self._completar()
+        return clase
+
+    def _actualizar_saltos(self):
+        """
+        Prepara, para cada estado con un ciclo sobre sí mismo, una expresión
+        que avanza de una vez sobre todas las clases del ciclo (el cuerpo de un
+        comentario, de una cadena o de un identificador).
+        """
+        self.saltos = [None]
+        for numero in range(1, len(self.tabla)):
+            clases = bytes(
+                clase
+                for clase, destino in enumerate(self.tabla[numero])
+                if destino == numero
+            )
+            self.saltos.append(self._avance(clases) if clases else None)
+
+        blancos = self._clases_ignorables()
+        self.es_blanco = [clase in blancos for clase in range(256)]
+        self.salto_blancos = self._avance(bytes(sorted(blancos))) if blancos else None
+        self._saltos_validos = len(self._atomos_de_clase)
+
+    @staticmethod
+    def _avance(clases):
+        """
+        Compila una expresión que avanza sobre una secuencia de clases.
+
+        Args:
+            clases (bytes): Códigos de clase admitidos
+
+        Returns:
+            callable: Método match() de la expresión compilada
+        """
+        return re.compile(b"[" + re.escape(clases) + b"]*").match
+
+    def _clases_ignorables(self):
+        """
+        Calcula las clases con las que cualquier secuencia formada solo por
+        ellas se divide por completo en tokens ignorados (ej: espacios,
+        tabuladores y saltos de línea). Esas secuencias se pueden saltar de
+        una vez sin recorrer el autómata.
+
+        Returns:
+            set: Códigos de clase
+        """
+        tabla = self.tabla
+        fila_inicial = tabla[self.inicial]
+
+        def ignora(estado):
+            return self.acepta[estado] >= 0 and self._ignorados[self.acepta[estado]]
+
+        candidatas = {
+            clase
+            for clase, destino in enumerate(fila_inicial)
+            if destino and ignora(destino)
+        }
+        cambio = True
+        while cambio:
+            cambio = False
+            for clase in list(candidatas):
+                # Todos los estados alcanzables deben aceptar un token ignorado
+                # y avanzar solo con clases candidatas
+                visitados = set()
+                pila = [fila_inicial[clase]]
+                valida = True
+                while pila and valida:
+                    estado = pila.pop()
+                    if estado in visitados:
+                        continue
+                    visitados.add(estado)
+                    if not ignora(estado):
+                        valida = False
+                    for siguiente, destino in enumerate(tabla[estado]):
+                        if destino:
+                            if siguiente not in candidatas:
+                                valida = False
+                            pila.append(destino)
+                if not valida:
+                    candidatas.discard(clase)
+                    cambio = True
+        return candidatas
+
+    def clasificar(self, codigo, inicio=0):
+        """
+        Traduce el código a la secuencia de clases de sus caracteres.
+
+        Args:
+            codigo (str): Código fuente
+            inicio (int): Posición desde la que se clasifica; los caracteres
+                anteriores no se recorren
+
+        Returns:
+            bytearray: Un byte con el código de clase por cada carácter desde
+                inicio (el byte i corresponde a codigo[inicio + i])
+        """
+        if inicio:
+            codigo = codigo[inicio:]
+        # Los caracteres ASCII se traducen en bloque sobre bytes; cada carácter
+        # no ASCII queda como '?' y luego se corrige con su propia clase
+        ascii_ = codigo.encode("ascii", "replace")
+        clases = bytearray(ascii_.translate(self._tabla_ascii))
+        mapa = self.mapa_clases
+        pos = ascii_.find(b"?")
+        while pos >= 0:
+            clases[pos] = ord(mapa[ord(codigo[pos])])
+            pos = ascii_.find(b"?", pos + 1)
+        if self._saltos_validos != len(self._atomos_de_clase):
+            self._actualizar_saltos()
+        return clases
+
+    def recorrer(self, codigo, inicio=0):
+        """
+        Reconoce los tokens del código con coincidencia máxima sobre el AFD.
+        Los tokens ignorados no se entregan.
+
+        Args:
+            codigo (str): Código fuente
+            inicio (int): Posición desde la que se reconocen tokens; solo se
+                clasifica el código a partir de ella
+
+        Yields:
+            tuple: (nombre_token, inicio, fin), con posiciones sobre el código
+                completo
+        """
+        # Las posiciones del recorrido son relativas a inicio
+        clases = self.clasificar(codigo, inicio)
+        tabla = self.tabla
+        acepta = self.acepta
+        saltos = self.saltos
+        nombres = self.nombres
+        ignorados = self._ignorados
+        fila_inicial = tabla[self.inicial]
+        es_blanco = self.es_blanco
+        salto_blancos = self.salto_blancos
+        n = len(clases)
+
+        pos = 0
+        while pos < n:
+            if es_blanco[clases[pos]]:
+                pos = salto_blancos(clases, pos).end()
+                if pos == n:
+                    break
+
+            # Avanzar mientras el autómata siga vivo, recordando la última
+            # aceptación (coincidencia máxima)
+            estado = fila_inicial[clases[pos]]
+            i = pos + 1
+            fin = -1
+            while estado:
+                salto = saltos[estado]
+                if salto is not None:
+                    i = salto(clases, i).end()
+                aceptado = acepta[estado]
+                if aceptado >= 0:
+                    fin = i
+                    token = aceptado
+                if i == n:
+                    break
+                estado = tabla[estado][clases[i]]
+                i += 1
+
+            if fin < 0:
+                # Ningún token coincide: se omite el carácter, igual que finditer()
+                pos += 1
+                continue
+            if not ignorados[token]:
+                yield (nombres[token], inicio + pos, inicio + fin)
+            pos = fin
@@ -0,0 +1,158 @@
+"""
+Caché en disco de resultados del análisis léxico.
+Guarda cada resultado como un archivo binario identificado por una clave
+(el hash del código y de la especificación de tokens) y limita el tamaño
+total del directorio descartando los archivos usados hace más tiempo (LRU).
+"""
+
+import os
+import tempfile
+
+# Extensión de los archivos de la caché
+EXTENSION = ".tok"
+
+
+class CacheTokens:
+    """
+    Directorio de caché con tamaño máximo y descarte LRU.
+
+    El último uso de cada entrada es la fecha de modificación de su archivo:
+    se actualiza al leerla, de modo que al superar el tamaño máximo se
+    eliminan primero las entradas que llevan más tiempo sin consultarse.
+    Las escrituras son atómicas (archivo temporal + os.replace), por lo que
+    varios procesos pueden compartir el mismo directorio.
+    """
+
+    def __init__(self, directorio, tamano_maximo=256 * 1024 * 1024):
+        """
+        Inicializa la caché, creando el directorio si no existe.
+
+        Args:
+            directorio (str): Directorio donde se guardan las entradas
+            tamano_maximo (int): Tamaño total máximo de las entradas, en bytes
+        """
+        if tamano_maximo <= 0:
+            raise ValueError(f"Tamaño máximo de caché inválido: {tamano_maximo}")
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        os.makedirs(directorio, exist_ok=True)
+
+        # Tamaño total estimado de las entradas (se calcula al primer guardado)
+        self._tamano_total = None
+
+        # Estadísticas de uso
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def obtener(self, clave):
+        """
+        Lee una entrada de la caché y la marca como usada recientemente.
+
+        Args:
+            clave (str): Clave de la entrada (hexadecimal)
+
+        Returns:
+            bytes: Contenido de la entrada, o None si no existe
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+            os.utime(ruta)
+        except OSError:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return datos
+
+    def guardar(self, clave, datos):
+        """
+        Guarda una entrada y descarta las menos usadas si se supera el tamaño
+        máximo. Una entrada mayor que el tamaño máximo no se guarda.
+
+        Args:
+            clave (str): Clave de la entrada (hexadecimal)
+            datos (bytes): Contenido de la entrada
+        """
+        if len(datos) > self.tamano_maximo:
+            return
+
+        ruta = self._ruta(clave)
+        try:
+            anterior = os.path.getsize(ruta)
+        except OSError:
+            anterior = 0
+
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                archivo.write(datos)
+            os.replace(temporal, ruta)
+        except OSError:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            return
+
+        if self._tamano_total is None:
+            self._tamano_total = sum(tamano for _, tamano, _ in self._entradas())
+        else:
+            self._tamano_total += len(datos) - anterior
+
+        if self._tamano_total > self.tamano_maximo:
+            self._descartar()
+
+    def _entradas(self):
+        """
+        Lista las entradas del directorio.
+
+        Returns:
+            list: Tuplas (ultimo_uso, tamano, ruta)
+        """
+        entradas = []
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(EXTENSION):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime, estado.st_size, ruta))
+        return entradas
+
+    def _descartar(self):
+        """
+        Elimina las entradas usadas hace más tiempo hasta que el tamaño total
+        no supere el tamaño máximo. Se vuelve a recorrer el directorio porque
+        otros procesos pueden haber agregado o eliminado entradas.
+        """
+        entradas = sorted(self._entradas())
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in entradas:
+            if total <= self.tamano_maximo:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                continue
+            total -= tamano
+        self._tamano_total = total
+
+    def limpiar(self):
+        """
+        Elimina todas las entradas de la caché.
+        """
+        for _, _, ruta in self._entradas():
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+        self._tamano_total = 0
+
+    def __len__(self):
+        return len(self._entradas())
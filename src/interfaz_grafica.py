@@ -1,6 +1,7 @@
+import io
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-from analizador_lexico import AnalizadorLexico
+from analizador_lexico import AnalizadorLexico, ResumenTokens
 
 
 class InterfazGrafica:
@@ -486,13 +487,20 @@ class InterfazGrafica:
             return
 
         try:
-            # Intentar UTF-8 primero, luego latin-1 como fallback
+            # Leer el archivo una sola vez; decodificar como UTF-8 y, si no
+            # lo es, como latin-1 a partir de los mismos bytes. TextIOWrapper
+            # con newline=None normaliza los saltos de línea (igual que la
+            # lectura en modo texto) mientras decodifica, en una sola pasada
+            with open(filepath, "rb") as file:
+                datos = file.read()
             try:
-                with open(filepath, "r", encoding="utf-8") as file:
-                    contenido = file.read()
+                contenido = io.TextIOWrapper(
+                    io.BytesIO(datos), encoding="utf-8", newline=None
+                ).read()
             except UnicodeDecodeError:
-                with open(filepath, "r", encoding="latin-1") as file:
-                    contenido = file.read()
+                contenido = io.TextIOWrapper(
+                    io.BytesIO(datos), encoding="latin-1", newline=None
+                ).read()
 
             self.texto_entrada.delete("1.0", tk.END)
             self.texto_entrada.insert("1.0", contenido)
@@ -550,7 +558,9 @@ class InterfazGrafica:
         # ============================================
         # FASE 1: ANÁLISIS LÉXICO
         # ============================================
-        tokens = self.analizador.analizar(codigo)
+        # El resumen de tokens se cuenta durante el mismo análisis
+        resumen = ResumenTokens()
+        tokens = self.analizador.analizar(codigo, compacto=True, resumen=resumen)
         errores_lexicos = self.analizador.obtener_errores(tokens)
 
         if errores_lexicos:
@@ -585,7 +595,9 @@ class InterfazGrafica:
         try:
             from analizador_semantico import AnalizadorSemantico
 
-            analizador_semantico = AnalizadorSemantico(ast)
+            analizador_semantico = AnalizadorSemantico(
+                ast, analizador_sintactico.tabla_nombres
+            )
             errores_semanticos = analizador_semantico.analizar()
 
             if errores_semanticos:
@@ -604,7 +616,7 @@ class InterfazGrafica:
         # ANÁLISIS EXITOSO - MOSTRAR RESULTADOS
         # ============================================
         self._mostrar_lista_completa_tokens(tokens)
-        self._mostrar_resumen_tokens(tokens)
+        self._mostrar_resumen_tokens(resumen)
         self._mostrar_tabla_simbolos(analizador_semantico.tabla_simbolos)
 
         messagebox.showinfo(
@@ -683,14 +695,14 @@ class InterfazGrafica:
         for tipo, valor, linea in tokens:
             self.tree_resultados.insert("", tk.END, values=(tipo, valor, linea))
 
-    def _mostrar_resumen_tokens(self, tokens):
+    def _mostrar_resumen_tokens(self, resumen):
         """
         Muestra un resumen de los tokens en la tabla de resumen.
 
         Args:
-            tokens (list): Lista de tokens
+            resumen (ResumenTokens): Resumen calculado durante el análisis léxico
         """
-        conteo_tokens = self.analizador.generar_resumen_tokens(tokens)
+        conteo_tokens = resumen.como_diccionario()
 
         # Llenar la tabla de resumen
         for (valor, tipo), cantidad in sorted(conteo_tokens.items()):
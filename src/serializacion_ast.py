@@ -0,0 +1,382 @@
+"""
+Serialización binaria del AST.
+
+Codifica un árbol de NodoAST en un formato compacto y versionado que se
+puede guardar en disco o enviar entre procesos sin pickle (que es lento con
+millones de objetos y recursivo con árboles profundos). La codificación y la
+decodificación no usan recursión y trabajan por bloques, de modo que un AST
+se puede escribir y leer de un archivo sin tener todos sus bytes en memoria.
+
+Formato (versión 1). Los enteros son varints sin signo (LEB128: 7 bits por
+byte, el bit alto indica que sigue otro byte).
+
+    archivo:     MARCA (b"ASTB"), versión, nodo raíz
+    nodo:        encabezado, tipo, [valor], [línea], [id_nombre], hijos
+    encabezado:  cantidad_de_hijos << 3 | banderas
+                 (1: tiene valor, 2: tiene línea, 4: tiene id_nombre)
+
+- Los nodos van en preorden: cada nodo va seguido de sus hijos, en orden.
+- tipo y valor son referencias a la tabla de cadenas: 0 introduce una cadena
+  nueva (su largo en bytes y su texto en UTF-8), que ocupa el siguiente índice
+  de la tabla; n > 0 es la cadena de índice n - 1. La tabla se arma a medida
+  que se escribe y se lee, sin conocer el árbol completo de antemano.
+- línea es la diferencia con la línea del último nodo anterior que tenía
+  línea, en zigzag (0, -1, 1, -2, ... se codifican 0, 1, 2, 3, ...): en un
+  AST casi siempre ocupa un byte.
+- Los valores deben ser cadenas (como los que produce el parser).
+"""
+
+import gc
+
+from analizador_sintactico import NodoAST
+
+# Marca inicial y versión del formato
+MARCA = b"ASTB"
+VERSION = 1
+
+# Banderas del encabezado de cada nodo
+_CON_VALOR = 1
+_CON_LINEA = 2
+_CON_ID_NOMBRE = 4
+
+# Tamaño de los bloques que se escriben o leen de una vez
+TAMANO_BLOQUE = 1 << 16
+
+# Bytes que se garantizan disponibles antes de decodificar un nodo: alcanzan
+# para todos sus varints (las cadenas nuevas se aseguran aparte)
+_MARGEN = 64
+
+
+def _escribir_varint(salida, valor):
+    """
+    Agrega un entero no negativo como varint.
+
+    Args:
+        salida (bytearray): Bytes codificados
+        valor (int): Entero a agregar
+    """
+    if valor < 0:
+        raise ValueError(f"No se puede codificar un entero negativo: {valor}")
+    while valor >= 0x80:
+        salida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    salida.append(valor)
+
+
+def _leer_varint(datos, posicion):
+    """
+    Lee un varint.
+
+    Args:
+        datos (bytes): Bytes codificados
+        posicion (int): Posición del varint
+
+    Returns:
+        tuple: (valor, posición siguiente)
+    """
+    valor = 0
+    desplazamiento = 0
+    while True:
+        byte = datos[posicion]
+        posicion += 1
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return valor, posicion
+        desplazamiento += 7
+
+
+def codificar_por_bloques(raiz, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Codifica un AST entregando sus bytes por bloques, sin recursión.
+
+    Args:
+        raiz (NodoAST): Raíz del AST (sirve cualquier nodo con los atributos
+            tipo, valor, hijos, linea e id_nombre)
+        tamano_bloque (int): Tamaño aproximado de cada bloque
+
+    Yields:
+        bytes: Bloques consecutivos de la codificación
+    """
+    salida = bytearray(MARCA)
+    _escribir_varint(salida, VERSION)
+    cadenas = {}
+    linea_anterior = 0
+
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        hijos = nodo.hijos
+        valor = nodo.valor
+        linea = nodo.linea
+        id_nombre = nodo.id_nombre
+
+        banderas = 0
+        if valor is not None:
+            banderas = _CON_VALOR
+        if linea is not None:
+            banderas |= _CON_LINEA
+        if id_nombre is not None:
+            banderas |= _CON_ID_NOMBRE
+        encabezado = len(hijos) << 3 | banderas
+        if encabezado < 0x80:
+            salida.append(encabezado)
+        else:
+            _escribir_varint(salida, encabezado)
+
+        for cadena in (nodo.tipo, valor) if valor is not None else (nodo.tipo,):
+            referencia = cadenas.get(cadena)
+            if referencia is None:
+                cadenas[cadena] = len(cadenas) + 1
+                texto = cadena.encode("utf-8", "surrogatepass")
+                salida.append(0)
+                _escribir_varint(salida, len(texto))
+                salida += texto
+            elif referencia < 0x80:
+                salida.append(referencia)
+            else:
+                _escribir_varint(salida, referencia)
+
+        if linea is not None:
+            diferencia = linea - linea_anterior
+            linea_anterior = linea
+            zigzag = diferencia << 1 if diferencia >= 0 else (-diferencia << 1) - 1
+            if zigzag < 0x80:
+                salida.append(zigzag)
+            else:
+                _escribir_varint(salida, zigzag)
+
+        if id_nombre is not None:
+            if 0 <= id_nombre < 0x80:
+                salida.append(id_nombre)
+            else:
+                _escribir_varint(salida, id_nombre)
+
+        if hijos:
+            pendientes.extend(reversed(hijos))
+
+        if len(salida) >= tamano_bloque:
+            yield bytes(salida)
+            salida.clear()
+
+    if salida:
+        yield bytes(salida)
+
+
+def codificar_ast(raiz):
+    """
+    Codifica un AST completo.
+
+    Args:
+        raiz (NodoAST): Raíz del AST
+
+    Returns:
+        bytes: AST codificado
+    """
+    return b"".join(codificar_por_bloques(raiz))
+
+
+def escribir_ast(raiz, archivo, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Escribe un AST codificado en un archivo binario, bloque por bloque.
+
+    Args:
+        raiz (NodoAST): Raíz del AST
+        archivo: Objeto con método write(bytes)
+        tamano_bloque (int): Tamaño aproximado de cada escritura
+    """
+    for bloque in codificar_por_bloques(raiz, tamano_bloque):
+        archivo.write(bloque)
+
+
+class _Entrada:
+    """
+    Bytes pendientes de decodificar, que se completan con los bloques
+    siguientes a medida que hacen falta.
+    """
+
+    def __init__(self, bloques):
+        self.bloques = iter(bloques)
+        self.terminada = False
+
+    def recargar(self, datos, posicion, minimo):
+        """
+        Agrega bloques a los bytes pendientes hasta tener al menos `minimo`
+        bytes desde la posición dada (o hasta que no queden bloques).
+
+        Args:
+            datos (bytes): Bytes actuales
+            posicion (int): Posición de lectura
+            minimo (int): Bytes que se quieren disponibles
+
+        Returns:
+            tuple: (datos, posicion) con la posición dentro de los datos nuevos
+        """
+        partes = [datos[posicion:]]
+        disponibles = len(partes[0])
+        while disponibles < minimo and not self.terminada:
+            bloque = next(self.bloques, None)
+            if bloque is None:
+                self.terminada = True
+                break
+            partes.append(bloque)
+            disponibles += len(bloque)
+        return b"".join(partes), 0
+
+
+def _leer_cadena(entrada, datos, posicion, cadenas):
+    """
+    Lee una cadena nueva (su largo y su texto) y la agrega a la tabla.
+
+    Args:
+        entrada (_Entrada): Bloques pendientes
+        datos (bytes): Bytes actuales
+        posicion (int): Posición del largo de la cadena
+        cadenas (list): Tabla de cadenas
+
+    Returns:
+        tuple: (cadena, datos, posición siguiente)
+    """
+    largo, posicion = _leer_varint(datos, posicion)
+    if len(datos) - posicion < largo + _MARGEN:
+        datos, posicion = entrada.recargar(datos, posicion, largo + _MARGEN)
+        if len(datos) < largo:
+            raise IndexError
+    cadena = datos[posicion : posicion + largo].decode("utf-8", "surrogatepass")
+    cadenas.append(cadena)
+    return cadena, datos, posicion + largo
+
+
+def decodificar_por_bloques(bloques):
+    """
+    Decodifica un AST a partir de sus bytes entregados por bloques, sin
+    recursión.
+
+    Args:
+        bloques: Iterable de bloques de bytes (de cualquier tamaño)
+
+    Returns:
+        NodoAST: Raíz del AST
+
+    Raises:
+        ValueError: Si los datos no son un AST codificado de una versión
+            conocida, están incompletos o sobran bytes después del AST
+    """
+    entrada = _Entrada(bloques)
+    datos, posicion = entrada.recargar(b"", 0, len(MARCA) + _MARGEN)
+    if datos[: len(MARCA)] != MARCA:
+        raise ValueError("Los datos no son un AST codificado")
+    try:
+        version, posicion = _leer_varint(datos, len(MARCA))
+    except IndexError:
+        raise ValueError("Los datos del AST están incompletos") from None
+    if version != VERSION:
+        raise ValueError(f"Versión de formato de AST no soportada: {version}")
+
+    cadenas = []
+    linea = 0
+    raiz = None
+    # Listas de hijos que se están completando: (lista, cantidad de hijos)
+    pila = []
+    # Sin recolector de basura mientras se crean los nodos: todos siguen
+    # vivos al terminar, y con él activo la decodificación tarda el doble
+    recolector_activo = gc.isenabled()
+    gc.disable()
+    try:
+        while True:
+            if len(datos) - posicion < _MARGEN and not entrada.terminada:
+                datos, posicion = entrada.recargar(datos, posicion, _MARGEN)
+
+            encabezado = datos[posicion]
+            posicion += 1
+            if encabezado >= 0x80:
+                encabezado, posicion = _leer_varint(datos, posicion - 1)
+
+            # Tipo y valor: referencias a la tabla de cadenas (0 introduce
+            # una cadena nueva)
+            referencia = datos[posicion]
+            posicion += 1
+            if referencia >= 0x80:
+                referencia, posicion = _leer_varint(datos, posicion - 1)
+            if referencia:
+                tipo = cadenas[referencia - 1]
+            else:
+                tipo, datos, posicion = _leer_cadena(entrada, datos, posicion, cadenas)
+
+            valor = None
+            if encabezado & _CON_VALOR:
+                referencia = datos[posicion]
+                posicion += 1
+                if referencia >= 0x80:
+                    referencia, posicion = _leer_varint(datos, posicion - 1)
+                if referencia:
+                    valor = cadenas[referencia - 1]
+                else:
+                    valor, datos, posicion = _leer_cadena(entrada, datos, posicion, cadenas)
+
+            linea_nodo = None
+            if encabezado & _CON_LINEA:
+                zigzag = datos[posicion]
+                posicion += 1
+                if zigzag >= 0x80:
+                    zigzag, posicion = _leer_varint(datos, posicion - 1)
+                linea += (zigzag >> 1) ^ -(zigzag & 1)
+                linea_nodo = linea
+
+            id_nombre = None
+            if encabezado & _CON_ID_NOMBRE:
+                id_nombre = datos[posicion]
+                posicion += 1
+                if id_nombre >= 0x80:
+                    id_nombre, posicion = _leer_varint(datos, posicion - 1)
+
+            cantidad_hijos = encabezado >> 3
+            hijos = [] if cantidad_hijos else None
+            nodo = NodoAST(tipo, valor, hijos, linea_nodo, id_nombre)
+
+            if pila:
+                lista, cantidad = pila[-1]
+                lista.append(nodo)
+                if len(lista) == cantidad:
+                    pila.pop()
+            else:
+                raiz = nodo
+            if hijos is not None:
+                pila.append((hijos, cantidad_hijos))
+            if not pila:
+                break
+    except IndexError:
+        raise ValueError("Los datos del AST están incompletos") from None
+    finally:
+        if recolector_activo:
+            gc.enable()
+
+    if posicion < len(datos) or next(entrada.bloques, b""):
+        raise ValueError("Sobran datos después del AST")
+    return raiz
+
+
+def decodificar_ast(datos):
+    """
+    Decodifica un AST completo.
+
+    Args:
+        datos (bytes): AST codificado
+
+    Returns:
+        NodoAST: Raíz del AST
+    """
+    return decodificar_por_bloques((datos,))
+
+
+def leer_ast(archivo, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Lee un AST codificado de un archivo binario, bloque por bloque.
+
+    Args:
+        archivo: Objeto con método read(n) que devuelve bytes
+        tamano_bloque (int): Cantidad de bytes de cada lectura
+
+    Returns:
+        NodoAST: Raíz del AST
+    """
+    return decodificar_por_bloques(iter(lambda: archivo.read(tamano_bloque), b""))